@@ -5,6 +5,8 @@ Azure Key Vault Backend for Acct
 :depends:
     * `azure-identity <https://pypi.python.org/pypi/azure-identity>`_ == 1.3.0
     * `azure-keyvault-secrets <https://pypi.python.org/pypi/azure-keyvault-secrets>`_ == 4.1.0
+    * `aiohttp <https://pypi.python.org/pypi/aiohttp>`_
+    * `cryptography <https://pypi.python.org/pypi/cryptography>`_
 
 :configuration: Get secrets from Azure Key Vault.
 
@@ -51,10 +53,48 @@ Azure Key Vault Backend for Acct
     will be converted to underscores. This is due to limitations in secret
     naming and the fact that Python parameters shouldn't have dashes.
 
+    The matching secrets are retrieved concurrently. The retrieval can be
+    narrowed down to specific providers and profiles, and the number of
+    simultaneous requests to the vault can be limited:
+
+    .. code-block:: yaml
+
+        acct-backend:
+            azurerm_keyvault:
+                designator: "acct-provider-"
+                vault_url: "https://myvault.vault.azure.net"
+                providers:
+                  - azurerm
+                profiles:
+                  - default
+                  - production
+                max_concurrency: 16
+
+    An encrypted cache of the retrieved secrets can be kept on disk by setting
+    a ``cache_key`` passphrase. The cache is keyed by the vault URL and the
+    designator. When the cache is enabled, the secret properties are still
+    listed from the vault on every run, but only the secrets whose version has
+    changed since they were cached will have their values fetched again:
+
+    .. code-block:: yaml
+
+        acct-backend:
+            azurerm_keyvault:
+                designator: "acct-provider-"
+                vault_url: "https://myvault.vault.azure.net"
+                cache_key: "my-cache-passphrase"
+                cache_dir: "/var/cache/idem-azurerm"
+
 """
 
 # Python libs
 from typing import Dict
+import asyncio
+import base64
+import concurrent.futures
+import functools
+import hashlib
+import json
 import logging
 import os
 
@@ -68,11 +108,17 @@ try:
         HttpResponseError,
         ResourceExistsError,
     )
-    from azure.identity import (
+    from azure.identity import KnownAuthorities, UsernamePasswordCredential
+    from azure.identity.aio import (
+        AzureCliCredential,
+        CertificateCredential,
+        ChainedTokenCredential,
+        ClientSecretCredential,
         DefaultAzureCredential,
-        KnownAuthorities,
+        ManagedIdentityCredential,
     )
-    from azure.keyvault.secrets import SecretClient
+    from azure.keyvault.secrets.aio import SecretClient
+    from cryptography.fernet import Fernet, InvalidToken
 
     HAS_LIBS = True
 except ImportError:
@@ -81,6 +127,12 @@ except ImportError:
 
 log = logging.getLogger(__name__)
 
+# Default number of secrets which are retrieved from the vault at the same time
+DEFAULT_CONCURRENCY = 16
+
+# Public client ID of the Azure CLI, used for username/password authentication when no client_id is provided
+AZURE_CLI_CLIENT_ID = "04b07795-8ddb-461a-bbee-02f9e1bf7b46"
+
 
 def __virtual__(hub):
     """
@@ -89,28 +141,40 @@ def __virtual__(hub):
     return HAS_LIBS
 
 
+class _AsyncCredential:
+    """
+    Expose a synchronous credential through the asynchronous credential protocol, for credential types which have no
+    asynchronous implementation.
+    """
+
+    def __init__(self, credential):
+        self._credential = credential
+
+    async def get_token(self, *scopes, **kwargs):
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            None, functools.partial(self._credential.get_token, *scopes, **kwargs)
+        )
+
+    async def close(self):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+
 def _get_identity_credentials(**kwargs):
     """
     Acquire Azure RM Credentials from the identity provider
 
-    We basically set environment variables based upon incoming parameters and then pass off to
-    the DefaultAzureCredential object to correctly parse those environment variables. See the
-    `Microsoft Docs on EnvironmentCredential <https://aka.ms/azsdk-python-identity-default-cred-ref>`_
-    for more information.
+    The credential type is chosen from the incoming parameters and constructed directly, in the same order of
+    precedence as the `EnvironmentCredential <https://aka.ms/azsdk-python-identity-default-cred-ref>`_. Without
+    explicit credentials, the ``DefaultAzureCredential`` chain is used, so managed identities, the shared token cache
+    and Azure CLI logins keep working. No process environment variables are modified.
     """
-    kwarg_map = {
-        "tenant": "AZURE_TENANT_ID",
-        "client_id": "AZURE_CLIENT_ID",
-        "secret": "AZURE_CLIENT_SECRET",
-        "client_certificate_path": "AZURE_CLIENT_CERTIFICATE_PATH",
-        "username": "AZURE_USERNAME",
-        "password": "AZURE_PASSWORD",
-    }
-
-    for kw in kwarg_map:
-        if kwargs.get(kw):
-            os.environ[kwarg_map[kw]] = kwargs[kw]
-
     try:
         if kwargs.get("cloud_environment") and kwargs.get(
             "cloud_environment"
@@ -125,79 +189,312 @@ def _get_identity_credentials(**kwargs):
         log.error('Unknown authority presented for "cloud_environment": %s', exc)
         authority = KnownAuthorities.AZURE_PUBLIC_CLOUD
 
-    credential = DefaultAzureCredential(authority=authority)
+    if kwargs.get("tenant") and kwargs.get("client_id") and kwargs.get("secret"):
+        credential = ClientSecretCredential(
+            kwargs["tenant"], kwargs["client_id"], kwargs["secret"], authority=authority
+        )
+    elif (
+        kwargs.get("tenant")
+        and kwargs.get("client_id")
+        and kwargs.get("client_certificate_path")
+    ):
+        credential = CertificateCredential(
+            kwargs["tenant"],
+            kwargs["client_id"],
+            kwargs["client_certificate_path"],
+            authority=authority,
+        )
+    elif kwargs.get("username") and kwargs.get("password"):
+        user_kwargs = {"authority": authority}
+        if kwargs.get("tenant"):
+            user_kwargs["tenant_id"] = kwargs["tenant"]
+        credential = _AsyncCredential(
+            UsernamePasswordCredential(
+                kwargs.get("client_id") or AZURE_CLI_CLIENT_ID,
+                kwargs["username"],
+                kwargs["password"],
+                **user_kwargs,
+            )
+        )
+    elif kwargs.get("client_id"):
+        # A user assigned managed identity, falling back to the Azure CLI login of a workstation
+        credential = ChainedTokenCredential(
+            ManagedIdentityCredential(client_id=kwargs["client_id"]),
+            AzureCliCredential(),
+        )
+    else:
+        credential = DefaultAzureCredential(authority=authority)
 
     return credential
 
 
-def _get_secret_client(vault_url: str, **kwargs):
+def _parse_secret_name(name: str, designator: str):
+    """
+    Split the name of a secret into its provider, profile, and parameter parts. None is returned if the secret name
+    does not match the expected format.
+    """
+    if not name.startswith(designator):
+        return None
+
+    key = name[len(designator) :]
+
+    # We expect a dash-delimited string here:
+    #     {PROVIDER}-{PROFILE}-{parameter}
+    if key.count("-") < 2:
+        log.error(
+            "A dash-delimited string is expected after '%s'"
+            "with the format 'PROVIDER-PROFILE-parametername', but got"
+            "'%s' instead.",
+            designator,
+            name,
+        )
+        return None
+
+    log.debug("acct found azurerm_keyvault secret: %s", key)
+    parts = key.split("-")
+
+    provider = parts[0]
+    log.debug("acct found azurerm_keyvault provider: %s", provider)
+
+    profile = parts[1]
+    log.debug("acct found azurerm_keyvault profile: %s", profile)
+
+    # Any dashes that are left in will get converted to underscores.
+    param = "_".join(parts[2:])
+    log.debug("acct found azurerm_keyvault parameter: %s", param)
+
+    return provider, profile, param
+
+
+async def _get_secrets(
+    vault_url: str,
+    designator: str,
+    providers=None,
+    profiles=None,
+    max_concurrency: int = DEFAULT_CONCURRENCY,
+    cached: Dict[str, Dict[str, str]] = None,
+    **kwargs,
+) -> Dict[str, Dict[str, str]]:
+    """
+    List the secrets in the vault, then concurrently retrieve the values of the secrets whose names match the
+    designator, providers, and profiles. Values found in ``cached`` are reused if the version of the secret has not
+    changed since they were cached. A dictionary of the matching secrets, keyed by secret name, is returned. None is
+    returned if the secrets could not be listed.
+    """
+    if isinstance(providers, str):
+        providers = [providers]
+    if isinstance(profiles, str):
+        profiles = [profiles]
+    if cached is None:
+        cached = {}
+
+    secrets = {}
+    semaphore = asyncio.Semaphore(max(int(max_concurrency or 1), 1))
+    credential = _get_identity_credentials(**kwargs)
+
+    async def _get_secret(sconn, name):
+        async with semaphore:
+            sec = await sconn.get_secret(name=name)
+            return sec.value
+
+    try:
+        async with SecretClient(vault_url=vault_url, credential=credential) as sconn:
+            async for secret in sconn.list_properties_of_secrets():
+                if secret.enabled is False:
+                    continue
+
+                parsed = _parse_secret_name(secret.name, designator)
+                if not parsed:
+                    continue
+
+                provider, profile, param = parsed
+                if providers and provider not in providers:
+                    continue
+                if profiles and profile not in profiles:
+                    continue
+
+                secrets[secret.name] = {
+                    "provider": provider,
+                    "profile": profile,
+                    "param": param,
+                    "version": secret.version,
+                    "updated_on": secret.updated_on.isoformat()
+                    if secret.updated_on
+                    else None,
+                }
+
+            stale = []
+            for name, secret in secrets.items():
+                entry = cached.get(name, {})
+                if (
+                    "value" in entry
+                    and entry.get("version") == secret["version"]
+                    and entry.get("updated_on") == secret["updated_on"]
+                ):
+                    secret["value"] = entry["value"]
+                else:
+                    stale.append(name)
+
+            log.debug(
+                "acct azurerm_keyvault reusing %s cached secrets and fetching %s",
+                len(secrets) - len(stale),
+                len(stale),
+            )
+
+            values = await asyncio.gather(
+                *[_get_secret(sconn, name) for name in stale], return_exceptions=True,
+            )
+    except (HttpResponseError, ResourceExistsError, ResourceNotFoundError) as exc:
+        log.error("Unable to unlock Azure Key Vault: %s", exc)
+        return None
+    finally:
+        await credential.close()
+
+    for name, value in zip(stale, values):
+        if isinstance(value, Exception):
+            log.error("Unable to retrieve secret %s: %s", name, value)
+            secrets.pop(name)
+            continue
+
+        secrets[name]["value"] = value
+
+    return secrets
+
+
+def _get_cache_file(cache_dir: str, vault_url: str, designator: str) -> str:
     """
-    Load the secret client and return a SecretClient object.
+    Return the path of the cache file for a vault URL and designator.
+    """
+    if not cache_dir:
+        cache_dir = os.path.join(os.path.expanduser("~"), ".cache", "idem-azurerm")
+
+    digest = hashlib.sha256(
+        "{0}|{1}".format(vault_url.rstrip("/").lower(), designator).encode("utf-8")
+    ).hexdigest()
+
+    return os.path.join(cache_dir, f"acct-keyvault-{digest}.cache")
 
-    :param vault_url: The URL of the vault that the client will access.
 
+def _get_fernet(cache_key: str, vault_url: str, designator: str):
     """
-    credential = _get_identity_credentials(**kwargs)
+    Derive the Fernet object used to encrypt a cache file from the configured cache key.
+    """
+    key = hashlib.pbkdf2_hmac(
+        "sha256",
+        cache_key.encode("utf-8"),
+        "{0}|{1}".format(vault_url.rstrip("/").lower(), designator).encode("utf-8"),
+        100000,
+    )
+    return Fernet(base64.urlsafe_b64encode(key))
 
-    secret_client = SecretClient(vault_url=vault_url, credential=credential)
 
-    return secret_client
+def _read_cache(cache_file: str, fernet) -> Dict[str, Dict[str, str]]:
+    """
+    Read and decrypt a cache file. An empty cache is returned if the file is missing or can't be decrypted.
+    """
+    try:
+        with open(cache_file, "rb") as fh:
+            return json.loads(fernet.decrypt(fh.read()).decode("utf-8"))
+    except FileNotFoundError:
+        return {}
+    except (InvalidToken, OSError, ValueError) as exc:
+        log.warning(
+            "Ignoring unreadable azurerm_keyvault cache %s: %s", cache_file, exc
+        )
+        return {}
+
+
+def _write_cache(cache_file: str, fernet, secrets: Dict[str, Dict[str, str]]):
+    """
+    Encrypt and atomically write a cache file which is only readable by the current user.
+    """
+    try:
+        os.makedirs(os.path.dirname(cache_file), mode=0o700, exist_ok=True)
+        tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+        fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(fernet.encrypt(json.dumps(secrets).encode("utf-8")))
+        os.replace(tmp_file, cache_file)
+    except OSError as exc:
+        log.warning("Unable to write azurerm_keyvault cache %s: %s", cache_file, exc)
+
+
+def _run_coroutine(coro):
+    """
+    Run a coroutine to completion on a private event loop in a worker thread. This works whether or not an event loop
+    is already running in the calling thread.
+    """
+
+    def _run():
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(coro)
+        finally:
+            loop.close()
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(_run).result()
 
 
 def unlock(
-    hub, vault_url: str, designator: str = "acct-provider-", **kwargs
+    hub,
+    vault_url: str,
+    designator: str = "acct-provider-",
+    providers=None,
+    profiles=None,
+    max_concurrency: int = DEFAULT_CONCURRENCY,
+    cache_key: str = None,
+    cache_dir: str = None,
+    **kwargs,
 ) -> Dict[str, Dict[str, Dict[str, str]]]:
     """
     Get secrets from the Azure Key Vault.
-    """
-    ret = {}
 
-    try:
-        sconn = _get_secret_client(vault_url, **kwargs)
-        secrets = sconn.list_properties_of_secrets()
-    except (HttpResponseError, ResourceExistsError, ResourceNotFoundError) as exc:
-        log.error("Unable to unlock Azure Key Vault: %s", exc)
-        return ret
+    :param vault_url: The URL of the vault containing the secrets.
 
-    for secret in secrets:
-        if secret.name.startswith(designator):
-            try:
-                key = secret.name[len(designator) :]
-
-                # We expect a dash-delimited string here:
-                #     {PROVIDER}-{PROFILE}-{parameter}
-                if key.count("-") < 2:
-                    log.error(
-                        "A dash-delimited string is expected after '%s'"
-                        "with the format 'PROVIDER-PROFILE-parametername', but got"
-                        "'%s' instead.",
-                        designator,
-                        secret.name,
-                    )
-                    continue
+    :param designator: The prefix of the names of the secrets used for acct. Defaults to "acct-provider-".
+
+    :param providers: An optional list of providers. Only secrets for these providers are retrieved.
+
+    :param profiles: An optional list of profiles. Only secrets for these profiles are retrieved.
 
-                log.debug("acct found azurerm_keyvault secret: %s", key)
-                parts = key.split("-")
+    :param max_concurrency: The maximum number of secrets to retrieve at the same time. Defaults to 16.
 
-                provider = parts[0]
-                log.debug("acct found azurerm_keyvault provider: %s", provider)
+    :param cache_key: A passphrase used to encrypt a local cache of the retrieved secrets. The cache is only used when
+        this parameter is set.
 
-                profile = parts[1]
-                log.debug("acct found azurerm_keyvault profile: %s", profile)
+    :param cache_dir: The directory in which the cache is stored. Defaults to ``~/.cache/idem-azurerm``.
 
-                # Any dashes that are left in will get converted to underscores.
-                param = "_".join(parts[2:])
-                log.debug("acct found azurerm_keyvault parameter: %s", param)
+    """
+    ret = {}
+    cached = {}
+
+    if cache_key:
+        cache_file = _get_cache_file(cache_dir, vault_url, designator)
+        fernet = _get_fernet(cache_key, vault_url, designator)
+        cached = _read_cache(cache_file, fernet)
+
+    secrets = _run_coroutine(
+        _get_secrets(
+            vault_url,
+            designator,
+            providers=providers,
+            profiles=profiles,
+            max_concurrency=max_concurrency,
+            cached=cached,
+            **kwargs,
+        )
+    )
+
+    if secrets is None:
+        return ret
 
-                if provider not in ret:
-                    ret[provider] = {}
-                if profile not in ret[provider]:
-                    ret[provider][profile] = {}
+    if cache_key and secrets != cached:
+        _write_cache(cache_file, fernet, secrets)
 
-                sec = sconn.get_secret(name=secret.name)
-                ret[provider][profile][param] = sec.value
-            except (AttributeError, IndexError, TypeError) as exc:
-                log.error("Unable to handle secret processing: %s", exc)
-                continue
+    for secret in secrets.values():
+        ret.setdefault(secret["provider"], {}).setdefault(secret["profile"], {})[
+            secret["param"]
+        ] = secret["value"]
 
     return ret
@@ -4,6 +4,8 @@ Azure Resource Manager (ARM) Authorization Permissions Execution Module
 
 .. versionadded:: 1.0.0
 
+.. versionchanged:: 4.1.0
+
 :maintainer: <devops@eitr.tech>
 :configuration: This module requires Azure Resource Manager credentials to be passed as keyword arguments
     to every function or via acct in order to work properly.
@@ -34,6 +36,8 @@ Azure Resource Manager (ARM) Authorization Permissions Execution Module
 # Python libs
 from __future__ import absolute_import
 import logging
+import re
+import time
 
 # Azure libs
 HAS_LIBS = False
@@ -48,6 +52,141 @@ except ImportError:
 
 log = logging.getLogger(__name__)
 
+# The number of seconds cached role definitions are used for
+ROLE_DEFINITION_TTL = 300
+
+PERMISSION_KEYS = ("actions", "not_actions", "data_actions", "not_data_actions")
+
+
+def _compile_patterns(patterns):
+    """
+    Compile a list of wildcard action patterns into one regular expression per resource provider namespace. Patterns
+    which start with a wildcard apply to every namespace and are kept under the "*" key.
+
+    """
+    by_namespace = {}
+    for pattern in patterns or []:
+        namespace = pattern.split("/", 1)[0].lower()
+        if "*" in namespace:
+            namespace = "*"
+        by_namespace.setdefault(namespace, []).append(
+            re.escape(pattern).replace("\\*", ".*")
+        )
+
+    return {
+        namespace: re.compile("^(?:{0})$".format("|".join(regexes)), re.IGNORECASE)
+        for namespace, regexes in by_namespace.items()
+    }
+
+
+def _compile_permission(permission):
+    """
+    Compile the actions, not actions, data actions and not data actions of a permission.
+
+    """
+    return {key: _compile_patterns(permission.get(key)) for key in PERMISSION_KEYS}
+
+
+def _matches(compiled, action, namespace):
+    regex = compiled.get(namespace)
+    if regex and regex.match(action):
+        return True
+    regex = compiled.get("*")
+    return bool(regex and regex.match(action))
+
+
+def _is_allowed(compiled_permissions, action, data_action=False):
+    """
+    Check whether any of the compiled permissions allows an action. Within a permission, the not actions are
+    subtracted from the actions. The permissions of different roles are combined.
+
+    """
+    allow, deny = (
+        ("data_actions", "not_data_actions")
+        if data_action
+        else ("actions", "not_actions")
+    )
+    namespace = action.split("/", 1)[0].lower()
+
+    for compiled in compiled_permissions:
+        if _matches(compiled[allow], action, namespace) and not _matches(
+            compiled[deny], action, namespace
+        ):
+            return True
+
+    return False
+
+
+def _parse_scope(scope):
+    """
+    Split a resource group or resource scope into the arguments of the permission listing functions.
+
+    """
+    match = re.match(
+        r"^/subscriptions/[^/]+/resourcegroups/(?P<resource_group>[^/]+)"
+        r"(?:/providers/(?P<namespace>[^/]+)/(?P<path>.+))?$",
+        "/" + scope.strip("/"),
+        re.IGNORECASE,
+    )
+    if not match:
+        return None
+
+    result = {"resource_group": match.group("resource_group")}
+    if match.group("namespace"):
+        parts = match.group("path").split("/")
+        if len(parts) < 2 or len(parts) % 2:
+            return None
+        result.update(
+            {
+                "resource_provider_namespace": match.group("namespace"),
+                "parent_resource_path": "/".join(parts[:-2]),
+                "resource_type": parts[-2],
+                "name": parts[-1],
+            }
+        )
+
+    return result
+
+
+async def _get_role_permissions(hub, ctx, scope, roles, refresh=False, **kwargs):
+    """
+    Return the compiled permissions of the given roles, looked up by role definition name (GUID), ID or role name in
+    the role definitions cached for the scope. The role definitions are listed once and cached for a few minutes.
+
+    """
+    key = "/" + scope.strip("/").lower()
+    cached = hub.exec.azurerm.ROLE_DEFINITIONS.get(key)
+
+    if refresh or not cached or time.time() - cached["loaded"] > ROLE_DEFINITION_TTL:
+        defns = await hub.exec.azurerm.authorization.role.definitions_list(
+            ctx, scope, **kwargs
+        )
+        if "error" in defns:
+            return defns
+
+        lookup = {}
+        for defn in defns.values():
+            compiled = [
+                _compile_permission(perm) for perm in defn.get("permissions", [])
+            ]
+            for name in (defn.get("name"), defn.get("id"), defn.get("role_name")):
+                if name:
+                    lookup[name.lower()] = compiled
+
+        cached = {"loaded": time.time(), "roles": lookup}
+        hub.exec.azurerm.ROLE_DEFINITIONS[key] = cached
+
+    result = []
+    for role in roles:
+        compiled = cached["roles"].get(role.lower())
+        if compiled is None:
+            compiled = cached["roles"].get(role.lower().split("/")[-1])
+        if compiled is None:
+            return {"error": "The role definition {0} was not found.".format(role)}
+        result.extend(compiled)
+
+    return result
+
 
 async def permissions_list_for_resource(
     hub,
@@ -142,3 +281,85 @@ async def permissions_list_for_resource_group(hub, ctx, name, **kwargs):
         result = {"error": str(exc)}
 
     return result
+
+
+async def check_permission(
+    hub,
+    ctx,
+    actions,
+    scope,
+    roles=None,
+    permissions=None,
+    data_action=False,
+    refresh=False,
+    **kwargs,
+):
+    """
+    .. versionadded:: 4.1.0
+
+    Check whether one or more actions are allowed at a scope. The wildcard patterns of the permissions are compiled
+    once and indexed by resource provider namespace, so checking many actions is done locally.
+
+    By default, the permissions the caller has at the scope are listed and checked. If ``roles`` are specified, the
+    permissions of those roles are checked instead, using the role definitions applicable at the scope. The role
+    definitions are cached for a few minutes, so repeated checks against the same roles don't make any requests.
+
+    :param actions: An action, or a list of actions, to check, such as "Microsoft.Compute/virtualMachines/write".
+
+    :param scope: The scope to check the actions at. Without ``roles`` or ``permissions``, this must be a resource
+        group or a resource scope.
+
+    :param roles: (Optional) A list of role definition names, IDs or role names, such as "Contributor", whose
+        combined permissions are checked.
+
+    :param permissions: (Optional) A list of permissions, as returned by ``permissions_list_for_resource``, to check
+        instead of listing them.
+
+    :param data_action: Check the actions as data actions. Defaults to False.
+
+    :param refresh: List the role definitions again, even if they are cached. Defaults to False.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        azurerm.authorization.permission.check_permission Microsoft.Compute/virtualMachines/write
+            /subscriptions/xxx/resourceGroups/testgroup roles='["Reader"]'
+
+    """
+    if isinstance(actions, str):
+        actions = [actions]
+
+    if permissions is None and roles:
+        compiled = await _get_role_permissions(
+            hub, ctx, scope, roles, refresh=refresh, **kwargs
+        )
+        if isinstance(compiled, dict):
+            return compiled
+    else:
+        if permissions is None:
+            scope_kwargs = _parse_scope(scope)
+            if not scope_kwargs:
+                return {
+                    "error": "The scope {0} is not a resource group or resource scope.".format(
+                        scope
+                    )
+                }
+
+            if "name" in scope_kwargs:
+                permissions = await hub.exec.azurerm.authorization.permission.permissions_list_for_resource(
+                    ctx, **scope_kwargs, **kwargs
+                )
+            else:
+                permissions = await hub.exec.azurerm.authorization.permission.permissions_list_for_resource_group(
+                    ctx, scope_kwargs["resource_group"], **kwargs
+                )
+            if isinstance(permissions, dict) and "error" in permissions:
+                return permissions
+
+        compiled = [_compile_permission(perm) for perm in permissions]
+
+    return {
+        action: _is_allowed(compiled, action, data_action=data_action)
+        for action in actions
+    }
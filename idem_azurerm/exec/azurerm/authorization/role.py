@@ -4,7 +4,7 @@ Azure Resource Manager (ARM) Authorization Roles Execution Module
 
 .. versionadded:: 1.0.0
 
-.. versionchanged:: 4.0.0
+.. versionchanged:: 4.0.0, 4.1.0
 
 :maintainer: <devops@eitr.tech>
 :configuration: This module requires Azure Resource Manager credentials to be passed as keyword arguments
@@ -36,6 +36,7 @@ Azure Resource Manager (ARM) Authorization Roles Execution Module
 # Python libs
 from __future__ import absolute_import
 import logging
+import time
 
 # Azure libs
 HAS_LIBS = False
@@ -50,6 +51,94 @@ except ImportError:
 
 log = logging.getLogger(__name__)
 
+# The number of seconds a role assignment index is used for before it is built again
+ASSIGNMENT_INDEX_TTL = 300
+
+# The key under which the role assignments at a scope are kept in the scope trie
+TRIE_ASSIGNMENTS = ""
+
+
+def _scope_parts(scope):
+    return [part for part in scope.lower().split("/") if part]
+
+
+def _build_assignment_index(assignments):
+    """
+    Index a list of role assignments by principal ID, by role definition name and by scope. The scopes are kept in a
+    trie of their path segments, so that the assignments inherited by a scope or made below it can be found without
+    scanning every assignment.
+
+    """
+    index = {"assignments": {}, "principals": {}, "roles": {}, "trie": {}}
+
+    for assign in assignments:
+        assign_id = assign["id"]
+        index["assignments"][assign_id] = assign
+
+        principal_id = (assign.get("principal_id") or "").lower()
+        index["principals"].setdefault(principal_id, set()).add(assign_id)
+
+        role = (assign.get("role_definition_id") or "").lower().split("/")[-1]
+        index["roles"].setdefault(role, set()).add(assign_id)
+
+        node = index["trie"]
+        for part in _scope_parts(assign.get("scope", "")):
+            node = node.setdefault(part, {})
+        node.setdefault(TRIE_ASSIGNMENTS, set()).add(assign_id)
+
+    return index
+
+
+def _scope_query(trie, scope, inherited=True, descendants=False):
+    """
+    Return the IDs of the role assignments at a scope, optionally along with those inherited from its ancestors and
+    those made at scopes below it.
+
+    """
+    result = set()
+    node = trie
+    for part in _scope_parts(scope):
+        if inherited:
+            result.update(node.get(TRIE_ASSIGNMENTS, ()))
+        node = node.get(part)
+        if node is None:
+            return result
+
+    result.update(node.get(TRIE_ASSIGNMENTS, ()))
+
+    if descendants:
+        stack = [child for key, child in node.items() if key != TRIE_ASSIGNMENTS]
+        while stack:
+            child = stack.pop()
+            for key, val in child.items():
+                if key == TRIE_ASSIGNMENTS:
+                    result.update(val)
+                else:
+                    stack.append(val)
+
+    return result
+
+
+async def _get_assignment_index(hub, ctx, refresh=False, **kwargs):
+    """
+    Return the role assignment index of the subscription, building it from one paged listing of the role assignments
+    if it is missing or stale.
+
+    """
+    authconn = await hub.exec.azurerm.utils.get_client(ctx, "authorization", **kwargs)
+    key = authconn.config.subscription_id.lower()
+    cached = hub.exec.azurerm.ROLE_ASSIGNMENT_INDEX.get(key)
+
+    if refresh or not cached or time.time() - cached["built"] > ASSIGNMENT_INDEX_TTL:
+        assigns = await hub.exec.azurerm.utils.run_in_executor(
+            lambda: [assign.as_dict() for assign in authconn.role_assignments.list()]
+        )
+        cached = _build_assignment_index(assigns)
+        cached["built"] = time.time()
+        hub.exec.azurerm.ROLE_ASSIGNMENT_INDEX[key] = cached
+
+    return cached
+
 
 async def definitions_get(hub, ctx, role_id, scope, **kwargs):
     """
@@ -250,7 +339,9 @@ async def assignments_list(hub, ctx, resource_group=None, **kwargs):
         if resource_group:
             assigns = await hub.exec.azurerm.utils.paged_object_to_list(
                 authconn.role_assignments.list_for_resource_group(
-                    resource_group_name=name, filter=kwargs.get("filter"), **kwargs
+                    resource_group_name=resource_group,
+                    filter=kwargs.get("filter"),
+                    **kwargs,
                 )
             )
         else:
@@ -363,3 +454,75 @@ async def assignments_list_for_scope(hub, ctx, scope, **kwargs):
         result = {"error": str(exc)}
 
     return result
+
+
+async def assignments_query(
+    hub,
+    ctx,
+    principal_id=None,
+    role_definition=None,
+    scope=None,
+    inherited=True,
+    descendants=False,
+    refresh=False,
+    **kwargs,
+):
+    """
+    .. versionadded:: 4.1.0
+
+    Query the role assignments of the subscription by principal, role definition and scope. All of the role
+    assignments are listed once and indexed in memory for a few minutes, so repeated queries, such as those of an
+    access review, don't make any requests. When more than one criterion is given, the assignments must match all of
+    them.
+
+    Assignments made at management group scopes are indexed under their own scopes, so they are only found as
+    inherited by a subscription scope if they are queried by principal or role definition.
+
+    :param principal_id: (Optional) The object ID of the principal whose role assignments to return.
+
+    :param role_definition: (Optional) The name (GUID) or ID of the role definition whose role assignments to return.
+
+    :param scope: (Optional) The scope whose role assignments to return.
+
+    :param inherited: Include the role assignments at the ancestors of the scope, which the scope inherits. Defaults
+        to True.
+
+    :param descendants: Include the role assignments at scopes below the scope. Defaults to False.
+
+    :param refresh: Build the index again, even if it is not stale. Defaults to False.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        azurerm.authorization.role.assignments_query principal_id=xxx scope=/subscriptions/xxx/resourceGroups/testgroup
+
+    """
+    result = {}
+
+    try:
+        index = await _get_assignment_index(hub, ctx, refresh=refresh, **kwargs)
+    except CloudError as exc:
+        await hub.exec.azurerm.utils.log_cloud_error(
+            "authorization", str(exc), **kwargs
+        )
+        result = {"error": str(exc)}
+        return result
+
+    matches = None
+    if principal_id:
+        matches = set(index["principals"].get(principal_id.lower(), ()))
+    if role_definition:
+        found = index["roles"].get(role_definition.lower().split("/")[-1], set())
+        matches = found if matches is None else matches & found
+    if scope:
+        found = _scope_query(index["trie"], scope, inherited, descendants)
+        matches = found if matches is None else matches & found
+    if matches is None:
+        matches = index["assignments"].keys()
+
+    for assign_id in matches:
+        assign = index["assignments"][assign_id]
+        result[assign["name"]] = assign
+
+    return result
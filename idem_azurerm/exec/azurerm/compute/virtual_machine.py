@@ -4,7 +4,7 @@ Azure Resource Manager (ARM) Compute Virtual Machine Execution Module
 
 .. versionadded:: 1.0.0
 
-.. versionchanged:: 2.0.0, 4.0.0
+.. versionchanged:: 2.0.0, 4.0.0, 4.1.0
 
 :maintainer: <devops@eitr.tech>
 :configuration: This module requires Azure Resource Manager credentials to be passed as keyword arguments
@@ -1136,23 +1136,44 @@ async def generalize(hub, ctx, name, resource_group, **kwargs):
     return result
 
 
-async def list_(hub, ctx, resource_group=None, **kwargs):
+async def list_(
+    hub, ctx, resource_group=None, subscriptions=None, max_concurrency=8, **kwargs
+):
     """
     .. versionadded:: 1.0.0
 
-    .. versionchanged:: 4.0.0
+    .. versionchanged:: 4.0.0, 4.1.0
 
     List all virtual machines within a subscription.
 
     :param resource_group: The name of the resource group to limit the results.
 
+    :param subscriptions: A list of subscription IDs to query concurrently, or "all" to query every enabled
+        subscription visible to the provided credentials. When specified, the results from all subscriptions are
+        merged and keyed by resource ID instead of by name.
+
+    :param max_concurrency: The maximum number of subscriptions to query at once when ``subscriptions`` is specified.
+        Defaults to 8.
+
     CLI Example:
 
     .. code-block:: bash
 
         azurerm.compute.virtual_machine.list
 
+        azurerm.compute.virtual_machine.list subscriptions=all
+
     """
+    if subscriptions:
+        return await hub.exec.azurerm.utils.fan_out(
+            ctx,
+            hub.exec.azurerm.compute.virtual_machine.list,
+            subscriptions,
+            max_concurrency=max_concurrency,
+            resource_group=resource_group,
+            **kwargs,
+        )
+
     result = {}
     compconn = await hub.exec.azurerm.utils.get_client(ctx, "compute", **kwargs)
 
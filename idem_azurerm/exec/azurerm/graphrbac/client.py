@@ -4,6 +4,8 @@ Azure Resource Manager (ARM) Graph RBAC Client Utility
 
 .. versionadded:: 2.4.0
 
+.. versionchanged:: 4.1.0
+
 :maintainer: <devops@eitr.tech>
 :configuration: This module requires Azure Resource Manager credentials to be passed as keyword arguments
     to every function or via acct in order to work properly.
@@ -72,3 +74,71 @@ async def get(hub, ctx, **kwargs):
     )
 
     return graph_client
+
+
+def _odata_string(value):
+    return "'{0}'".format(str(value).replace("'", "''"))
+
+
+async def build_filter(hub, base_filter=None, equals=None, startswith=None):
+    """
+    .. versionadded:: 4.1.0
+
+    Build an OData filter expression for the Graph API, which is evaluated server side. All of the conditions must
+    match.
+
+    :param base_filter: An OData filter expression to combine with the other conditions.
+
+    :param equals: A dictionary of property names and the values they must be equal to, such as
+        ``{"appId": "..."}``.
+
+    :param startswith: A dictionary of property names and the prefixes they must start with, such as
+        ``{"userPrincipalName": "test"}``.
+
+    """
+    clauses = []
+    if base_filter:
+        clauses.append("({0})".format(base_filter))
+    for prop, value in (equals or {}).items():
+        clauses.append("{0} eq {1}".format(prop, _odata_string(value)))
+    for prop, value in (startswith or {}).items():
+        clauses.append("startswith({0},{1})".format(prop, _odata_string(value)))
+
+    return " and ".join(clauses) or None
+
+
+async def list_objects(hub, operations, odata_filter=None, top=None, fields=None):
+    """
+    .. versionadded:: 4.1.0
+
+    List directory objects, keyed by object ID, consuming the pages of the listing lazily. The listing stops as soon as
+    ``top`` objects have been found, so no further pages are requested, and only the ``fields`` requested are kept
+    from each object.
+
+    :param operations: The operations group of the Graph RBAC client to list from, such as ``users``.
+
+    :param odata_filter: An OData filter expression to apply server side.
+
+    :param top: The maximum number of objects to return.
+
+    :param fields: A list of the fields to keep from each object. The object ID is always kept.
+
+    """
+
+    def _consume():
+        result = {}
+        for obj in operations.list(filter=odata_filter):
+            obj = obj.as_dict()
+            if fields:
+                obj = {
+                    key: val
+                    for key, val in obj.items()
+                    if key in fields or key == "object_id"
+                }
+            result[obj["object_id"]] = obj
+            if top and len(result) >= int(top):
+                break
+
+        return result
+
+    return await hub.exec.azurerm.utils.run_in_executor(_consume)
@@ -4,7 +4,7 @@ Azure Resource Manager (ARM) Graph RBAC Service Principal Execution Module
 
 .. versionadded:: 2.4.0
 
-.. versionchanged:: 4.0.0
+.. versionchanged:: 4.0.0, 4.1.0
 
 :maintainer: <devops@eitr.tech>
 :configuration: This module requires Azure Resource Manager credentials to be passed as keyword arguments
@@ -87,34 +87,70 @@ async def get(hub, ctx, object_id, **kwargs):
     return result
 
 
-async def list_(hub, ctx, sp_filter=None, **kwargs):
+async def list_(
+    hub,
+    ctx,
+    sp_filter=None,
+    app_id=None,
+    display_name=None,
+    display_name_prefix=None,
+    top=None,
+    fields=None,
+    **kwargs,
+):
     """
     .. versionadded:: 2.4.0
 
-    .. versionchanged:: 4.0.0
+    .. versionchanged:: 4.0.0, 4.1.0
 
     Gets list of service principals from the current tenant.
 
     :param sp_filter: The filter to apply to the operation.
 
+    :param app_id: (Optional) Only list the service principal of the application with this application ID.
+
+    :param display_name: (Optional) Only list the service principals with this display name.
+
+    :param display_name_prefix: (Optional) Only list the service principals whose display name starts with this
+        prefix.
+
+    :param top: (Optional) Stop listing once this many objects have been found.
+
+    :param fields: (Optional) A list of the fields to return for each object. The object ID is always returned.
+
     CLI Example:
 
     .. code-block:: bash
 
         azurerm.graphrbc.service_principal.list sp_filter="displayName eq 'Test Buddy'"
 
+        azurerm.graphrbc.service_principal.list display_name_prefix=test top=100
+
     """
     result = {}
     graphconn = await hub.exec.azurerm.graphrbac.client.get(
         ctx, resource="https://graph.windows.net", **kwargs
     )
 
+    odata_filter = await hub.exec.azurerm.graphrbac.client.build_filter(
+        sp_filter,
+        equals={
+            key: val
+            for key, val in (("appId", app_id), ("displayName", display_name))
+            if val
+        },
+        startswith={"displayName": display_name_prefix}
+        if display_name_prefix
+        else None,
+    )
+
     try:
-        principals = await hub.exec.azurerm.utils.paged_object_to_list(
-            graphconn.service_principals.list(filter=sp_filter)
+        result = await hub.exec.azurerm.graphrbac.client.list_objects(
+            graphconn.service_principals,
+            odata_filter=odata_filter,
+            top=top,
+            fields=fields,
         )
-        for principal in principals:
-            result[principal["object_id"]] = principal
     except GraphErrorException as exc:
         result = {"error": str(exc)}
 
@@ -4,7 +4,7 @@ Azure Resource Manager (ARM) Graph RBAC User Execution Module
 
 .. versionadded:: 2.4.0
 
-.. versionchanged:: 4.0.0
+.. versionchanged:: 4.0.0, 4.1.0
 
 :maintainer: <devops@eitr.tech>
 :configuration: This module requires Azure Resource Manager credentials to be passed as keyword arguments
@@ -87,34 +87,67 @@ async def get(hub, ctx, upn_or_object_id, **kwargs):
     return result
 
 
-async def list_(hub, ctx, user_filter=None, **kwargs):
+async def list_(
+    hub,
+    ctx,
+    user_filter=None,
+    upn_prefix=None,
+    display_name=None,
+    display_name_prefix=None,
+    top=None,
+    fields=None,
+    **kwargs,
+):
     """
     .. versionadded:: 2.4.0
 
-    .. versionchanged:: 4.0.0
+    .. versionchanged:: 4.0.0, 4.1.0
 
     Gets list of users for the current tenant.
 
     :param user_filter: The filter to apply to the operation.
 
+    :param upn_prefix: (Optional) Only list the users whose user principal name starts with this prefix.
+
+    :param display_name: (Optional) Only list the users with this display name.
+
+    :param display_name_prefix: (Optional) Only list the users whose display name starts with this prefix.
+
+    :param top: (Optional) Stop listing once this many objects have been found.
+
+    :param fields: (Optional) A list of the fields to return for each object. The object ID is always returned.
+
     CLI Example:
 
     .. code-block:: bash
 
         azurerm.graphrbc.user.list user_filter="displayName eq 'Test Buddy'"
 
+        azurerm.graphrbc.user.list upn_prefix=test top=10 fields='["user_principal_name"]'
+
     """
     result = {}
     graphconn = await hub.exec.azurerm.graphrbac.client.get(
         ctx, resource="https://graph.windows.net", **kwargs
     )
 
+    odata_filter = await hub.exec.azurerm.graphrbac.client.build_filter(
+        user_filter,
+        equals={"displayName": display_name} if display_name else None,
+        startswith={
+            key: val
+            for key, val in (
+                ("userPrincipalName", upn_prefix),
+                ("displayName", display_name_prefix),
+            )
+            if val
+        },
+    )
+
     try:
-        users = await hub.exec.azurerm.utils.paged_object_to_list(
-            graphconn.users.list(filter=user_filter)
+        result = await hub.exec.azurerm.graphrbac.client.list_objects(
+            graphconn.users, odata_filter=odata_filter, top=top, fields=fields,
         )
-        for user in users:
-            result[user["object_id"]] = user
     except GraphErrorException as exc:
         result = {"error": str(exc)}
 
@@ -0,0 +1,25 @@
+def __init__(hub):
+    # Identity credentials for the data plane clients, keyed by identity
+    hub.exec.azurerm.CREDENTIALS = {}
+    # Key Vault data plane clients, keyed by client type, vault URL and identity
+    hub.exec.azurerm.KEYVAULT_CLIENTS = {}
+    hub.exec.azurerm.KEYVAULT_CLIENT_STATS = {"hits": 0, "misses": 0}
+    # Transport shared by all of the Key Vault data plane clients
+    hub.exec.azurerm.KEYVAULT_TRANSPORT = None
+    # Public key material of Key Vault keys, keyed by vault URL, key name and version
+    hub.exec.azurerm.KEYVAULT_PUBLIC_KEYS = {}
+    # Parsed local deployment template and parameters files, keyed by path
+    hub.exec.azurerm.DEPLOYMENT_FILES = {}
+    # Management locks of each subscription, keyed by subscription ID and normalized scope
+    hub.exec.azurerm.LOCK_INDEX = {}
+    # Built-in policy definitions, keyed by the path of their on-disk cache
+    hub.exec.azurerm.POLICY_BUILTINS = {}
+    # Compiled permissions of the role definitions applicable at a scope, keyed by scope
+    hub.exec.azurerm.ROLE_DEFINITIONS = {}
+    # Role assignments of each subscription, indexed by principal, role definition and scope
+    hub.exec.azurerm.ROLE_ASSIGNMENT_INDEX = {}
+    # Crawled management group hierarchies, keyed by the name of their root management group, and by tenant when the
+    # tenant root group was crawled by default
+    hub.exec.azurerm.MANAGEMENT_GROUP_HIERARCHY = {}
+    # Registration states of the resource providers of each subscription, keyed by subscription ID
+    hub.exec.azurerm.PROVIDER_STATES = {}
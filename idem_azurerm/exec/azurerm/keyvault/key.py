@@ -4,7 +4,7 @@ Azure Resource Manager (ARM) Key Execution Module
 
 .. versionadded:: 2.0.0
 
-.. versionchanged:: 4.0.0
+.. versionchanged:: 4.0.0, 4.1.0
 
 :maintainer: <devops@eitr.tech>
 :configuration: This module requires Azure Resource Manager credentials to be passed as keyword arguments
@@ -35,8 +35,10 @@ Azure Resource Manager (ARM) Key Execution Module
 """
 # Python libs
 from __future__ import absolute_import
+import base64
 import datetime
 import logging
+import time
 
 # Azure libs
 HAS_LIBS = False
@@ -47,29 +49,56 @@ try:
         HttpResponseError,
         ResourceExistsError,
     )
+    from azure.keyvault.keys.crypto import (
+        EncryptionAlgorithm,
+        KeyWrapAlgorithm,
+        SignatureAlgorithm,
+    )
     from msrest.exceptions import ValidationError, SerializationError
 
     HAS_LIBS = True
 except ImportError:
     pass
 
+try:
+    from cryptography.exceptions import InvalidSignature
+    from cryptography.hazmat.backends import default_backend
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.asymmetric import ec, padding, rsa
+    from cryptography.hazmat.primitives.asymmetric.utils import (
+        Prehashed,
+        encode_dss_signature,
+    )
+
+    HAS_CRYPTOGRAPHY = True
+except ImportError:
+    HAS_CRYPTOGRAPHY = False
+
 __func_alias__ = {"list_": "list"}
 
 log = logging.getLogger(__name__)
 
+# Number of seconds the latest version of a key is used for before the current version is checked again
+LATEST_KEY_MAX_AGE = 60
+
+CRYPTOGRAPHY_MISSING = "The cryptography library is required for local key operations."
+
 
 async def get_key_client(hub, ctx, vault_url, **kwargs):
     """
     .. versionadded:: 2.0.0
 
-    Load the key client and return a KeyClient object.
+    .. versionchanged:: 4.1.0
+
+    Load the key client and return a KeyClient object. Clients are pooled per vault URL and identity, so repeated calls
+    reuse the same client and connections.
 
     :param vault_url: The URL of the vault that the client will access.
 
     """
-    credential = await hub.exec.azurerm.utils.get_identity_credentials(ctx, **kwargs)
-
-    key_client = KeyClient(vault_url=vault_url, credential=credential)
+    key_client = await hub.exec.azurerm.utils.get_keyvault_client(
+        ctx, "key", vault_url, **kwargs
+    )
 
     return key_client
 
@@ -109,6 +138,145 @@ def _key_properties_as_dict(key_properties):
     return result
 
 
+def _to_bytes(data):
+    """
+    Helper function to accept binary data either as bytes or as a base64 encoded string.
+    """
+    if isinstance(data, (bytes, bytearray)):
+        return bytes(data)
+    return base64.b64decode(data)
+
+
+def _to_base64(data):
+    """
+    Helper function to return binary data as a base64 encoded string.
+    """
+    return base64.b64encode(data).decode("utf-8")
+
+
+def _hash_algorithm(algorithm):
+    """
+    Return the hash algorithm used by a signature algorithm.
+    """
+    bits = algorithm[2:5]
+    return {"256": hashes.SHA256(), "384": hashes.SHA384(), "512": hashes.SHA512()}[
+        bits
+    ]
+
+
+def _rsa_encryption_padding(algorithm):
+    """
+    Return the padding used by an RSA encryption or key wrap algorithm.
+    """
+    if algorithm == "RSA1_5":
+        return padding.PKCS1v15()
+    if algorithm == "RSA-OAEP":
+        return padding.OAEP(
+            mgf=padding.MGF1(algorithm=hashes.SHA1()),
+            algorithm=hashes.SHA1(),
+            label=None,
+        )
+    if algorithm == "RSA-OAEP-256":
+        return padding.OAEP(
+            mgf=padding.MGF1(algorithm=hashes.SHA256()),
+            algorithm=hashes.SHA256(),
+            label=None,
+        )
+    raise ValueError(f"Unsupported RSA encryption algorithm: {algorithm}")
+
+
+def _public_key_from_jwk(jwk):
+    """
+    Build a public key object from the public material of a JsonWebKey.
+    """
+    kty = str(getattr(jwk.kty, "value", jwk.kty))
+
+    if kty.startswith("RSA"):
+        numbers = rsa.RSAPublicNumbers(
+            int.from_bytes(jwk.e, "big"), int.from_bytes(jwk.n, "big")
+        )
+        return numbers.public_key(default_backend())
+
+    if kty.startswith("EC"):
+        curves = {
+            "P-256": ec.SECP256R1,
+            "P-384": ec.SECP384R1,
+            "P-521": ec.SECP521R1,
+            "P-256K": ec.SECP256K1,
+        }
+        crv = str(getattr(jwk.crv, "value", jwk.crv))
+        numbers = ec.EllipticCurvePublicNumbers(
+            int.from_bytes(jwk.x, "big"), int.from_bytes(jwk.y, "big"), curves[crv]()
+        )
+        return numbers.public_key(default_backend())
+
+    raise ValueError(f"Local operations are not supported for {kty} keys.")
+
+
+async def _get_cached_key(
+    hub, ctx, name, vault_url, version=None, refresh=False, **kwargs
+):
+    """
+    Return the cache entry holding the identifier and public material of a key, fetching the key from the vault only if
+    it is not already cached. Keys are cached by vault URL, name and version, and a specific version is kept
+    indefinitely since it never changes. When no version is specified, the latest version is only reused for
+    ``LATEST_KEY_MAX_AGE`` seconds before it is resolved again, so that key rotations are picked up.
+    """
+    vault = vault_url.rstrip("/").lower()
+    cache_key = (vault, name, version)
+    cached = hub.exec.azurerm.KEYVAULT_PUBLIC_KEYS.get(cache_key)
+
+    if (
+        cached is not None
+        and not refresh
+        and (version or time.time() - cached["resolved"] <= LATEST_KEY_MAX_AGE)
+    ):
+        return cached
+
+    kconn = await hub.exec.azurerm.keyvault.key.get_key_client(ctx, vault_url, **kwargs)
+    key = await hub.exec.azurerm.utils.run_in_executor(
+        kconn.get_key, name=name, version=version
+    )
+
+    version_key = (vault, name, key.properties.version)
+    cached = hub.exec.azurerm.KEYVAULT_PUBLIC_KEYS.get(version_key)
+    if cached is None:
+        cached = {"key_id": key.id, "jwk": key.key, "public_key": None}
+        hub.exec.azurerm.KEYVAULT_PUBLIC_KEYS[version_key] = cached
+
+    cached["resolved"] = time.time()
+    hub.exec.azurerm.KEYVAULT_PUBLIC_KEYS[cache_key] = cached
+
+    return cached
+
+
+async def _get_public_key(
+    hub, ctx, name, vault_url, version=None, refresh=False, **kwargs
+):
+    """
+    Return the identifier and public key object of a key. The public key object is only built once per cached key.
+    """
+    cached = await _get_cached_key(
+        hub, ctx, name, vault_url, version, refresh, **kwargs
+    )
+
+    if cached["public_key"] is None:
+        cached["public_key"] = _public_key_from_jwk(cached["jwk"])
+
+    return cached["key_id"], cached["public_key"]
+
+
+async def _get_key_id(hub, ctx, name, vault_url, version=None, **kwargs):
+    """
+    Return the full identifier of a key, which is needed to build a CryptographyClient.
+    """
+    if version:
+        return "{0}/keys/{1}/{2}".format(vault_url.rstrip("/"), name, version)
+
+    cached = await _get_cached_key(hub, ctx, name, vault_url, **kwargs)
+    return cached["key_id"]
+
+
 async def backup_key(hub, ctx, name, vault_url, **kwargs):
     """
     .. versionadded:: 2.0.0
@@ -432,6 +600,124 @@ async def create_rsa_key(
     return result
 
 
+async def decrypt(
+    hub, ctx, name, vault_url, algorithm, ciphertext, version=None, **kwargs
+):
+    """
+    .. versionadded:: 4.1.0
+
+    Decrypt a single block of encrypted data using the private material of a key stored in the vault. Requires the
+    keys/decrypt permission.
+
+    :param name: The name of the key.
+
+    :param vault_url: The URL of the vault that the client will access.
+
+    :param algorithm: The encryption algorithm to use. Possible values include: "RSA1_5", "RSA-OAEP", and
+        "RSA-OAEP-256".
+
+    :param ciphertext: The encrypted data, as bytes or a base64 encoded string.
+
+    :param version: The version of the key to use. If not specified, the latest version of the key is used.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        azurerm.keyvault.key.decrypt test_name test_vault RSA-OAEP-256 test_ciphertext
+
+    """
+    result = {}
+
+    try:
+        key_id = await _get_key_id(hub, ctx, name, vault_url, version, **kwargs)
+        cconn = await hub.exec.azurerm.utils.get_keyvault_client(
+            ctx, "crypto", vault_url, key_id=key_id, **kwargs
+        )
+        decrypted = await hub.exec.azurerm.utils.run_in_executor(
+            cconn.decrypt, EncryptionAlgorithm(algorithm), _to_bytes(ciphertext)
+        )
+
+        result = {
+            "key_id": decrypted.key_id,
+            "algorithm": algorithm,
+            "plaintext": _to_base64(decrypted.plaintext),
+        }
+    except (HttpResponseError, ResourceNotFoundError, ValueError) as exc:
+        result = {"error": str(exc)}
+
+    return result
+
+
+async def encrypt(
+    hub,
+    ctx,
+    name,
+    vault_url,
+    algorithm,
+    plaintext,
+    version=None,
+    refresh=False,
+    **kwargs,
+):
+    """
+    .. versionadded:: 4.1.0
+
+    Encrypt a single block of data locally with the public material of an RSA key. The public key is fetched from the
+    vault on first use and then cached, so repeated calls do not make any requests to the vault. When no version is
+    specified, the latest version of the key is checked again once the cached one is a minute old. Requires the keys/get
+    permission.
+
+    :param name: The name of the key.
+
+    :param vault_url: The URL of the vault that the client will access.
+
+    :param algorithm: The encryption algorithm to use. Possible values include: "RSA1_5", "RSA-OAEP", and
+        "RSA-OAEP-256".
+
+    :param plaintext: The data to encrypt, as bytes or a base64 encoded string.
+
+    :param version: The version of the key to use. If not specified, the latest version of the key is used.
+
+    :param refresh: Fetch the public key from the vault even if it has already been cached. Defaults to False.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        azurerm.keyvault.key.encrypt test_name test_vault RSA-OAEP-256 test_plaintext
+
+    """
+    if not HAS_CRYPTOGRAPHY:
+        return {"error": CRYPTOGRAPHY_MISSING}
+
+    result = {}
+
+    try:
+        key_id, public_key = await _get_public_key(
+            hub, ctx, name, vault_url, version, refresh, **kwargs
+        )
+        ciphertext = public_key.encrypt(
+            _to_bytes(plaintext), _rsa_encryption_padding(algorithm)
+        )
+
+        result = {
+            "key_id": key_id,
+            "algorithm": algorithm,
+            "ciphertext": _to_base64(ciphertext),
+        }
+    except (
+        HttpResponseError,
+        ResourceNotFoundError,
+        ValueError,
+        KeyError,
+        AttributeError,
+    ) as exc:
+        result = {"error": str(exc)}
+
+    return result
+
+
 async def get_deleted_key(hub, ctx, name, vault_url, **kwargs):
     """
     .. versionadded:: 2.0.0
@@ -640,58 +926,98 @@ async def list_(hub, ctx, vault_url, **kwargs):
     return result
 
 
-async def list_properties_of_key_versions(hub, ctx, name, vault_url, **kwargs):
+async def list_properties_of_key_versions(
+    hub, ctx, name, vault_url, top=None, updated_after=None, enabled=None, **kwargs
+):
     """
     .. versionadded:: 2.0.0
 
+    .. versionchanged:: 4.1.0
+
     List the identifiers and properties of a key's versions. Requires keys/list permission.
 
+    The versions are keyed by version and returned newest first. The listing is consumed lazily, so when ``top`` is
+    specified only the newest ``top`` versions are held in memory, no matter how many versions the key has.
+
     :param name: The name of the key.
 
     :param vault_url: The URL of the vault that the client will access.
 
+    :param top: The maximum number of versions to return.
+
+    :param updated_after: Only return versions which were last updated after this time. This parameter should be a
+        string representation of a Datetime object in ISO-8601 format.
+
+    :param enabled: If specified, only return versions whose enabled property matches this value.
+
     CLI Example:
 
     .. code-block:: bash
 
-        azurerm.keyvault.key.list_properties_of_key_versions test_name test_vault
+        azurerm.keyvault.key.list_properties_of_key_versions test_name test_vault top=5
 
     """
     result = {}
     kconn = await hub.exec.azurerm.keyvault.key.get_key_client(ctx, vault_url, **kwargs)
 
     try:
-        keys = kconn.list_properties_of_key_versions(name=name)
+        keys = await hub.exec.azurerm.utils.filter_newest(
+            kconn.list_properties_of_key_versions(name=name),
+            top=top,
+            updated_after=updated_after,
+            enabled=enabled,
+        )
 
         for key in keys:
-            result[key.name] = _key_properties_as_dict(key)
+            result[key.version] = _key_properties_as_dict(key)
     except ResourceNotFoundError as exc:
         result = {"error": str(exc)}
 
     return result
 
 
-async def list_deleted_keys(hub, ctx, vault_url, **kwargs):
+async def list_deleted_keys(
+    hub, ctx, vault_url, top=None, updated_after=None, enabled=None, **kwargs
+):
     """
     .. versionadded:: 2.0.0
 
+    .. versionchanged:: 4.1.0
+
     List all deleted keys, including the public part of each. Possible only in a vault with soft-delete enabled.
     Requires keys/list permission.
 
+    The deleted keys are returned with the most recently deleted first. The listing is consumed lazily, so when ``top``
+    is specified only that many deleted keys are held in memory at once.
+
     :param vault_url: The URL of the vault that the client will access.
 
+    :param top: The maximum number of deleted keys to return.
+
+    :param updated_after: Only return deleted keys which were last updated after this time. This parameter should be a
+        string representation of a Datetime object in ISO-8601 format.
+
+    :param enabled: If specified, only return deleted keys whose enabled property matches this value.
+
     CLI Example:
 
     .. code-block:: bash
 
-        azurerm.keyvault.key.list_deleted_keys test_vault
+        azurerm.keyvault.key.list_deleted_keys test_vault top=10
 
     """
     result = {}
     kconn = await hub.exec.azurerm.keyvault.key.get_key_client(ctx, vault_url, **kwargs)
 
     try:
-        keys = kconn.list_deleted_keys()
+        keys = await hub.exec.azurerm.utils.filter_newest(
+            kconn.list_deleted_keys(),
+            top=top,
+            updated_after=updated_after,
+            enabled=enabled,
+            sort_attr="deleted_date",
+            properties_attr="properties",
+        )
 
         for key in keys:
             result[key.name] = _key_as_dict(key)
@@ -766,6 +1092,102 @@ async def restore_key_backup(hub, ctx, backup, vault_url, **kwargs):
     return result
 
 
+async def sign(hub, ctx, name, vault_url, algorithm, digest, version=None, **kwargs):
+    """
+    .. versionadded:: 4.1.0
+
+    Create a signature from a digest using the private material of a key stored in the vault. Requires the keys/sign
+    permission.
+
+    :param name: The name of the key.
+
+    :param vault_url: The URL of the vault that the client will access.
+
+    :param algorithm: The signing algorithm to use. Possible values include: "PS256", "PS384", "PS512", "RS256",
+        "RS384", "RS512", "ES256", "ES256K", "ES384", and "ES512".
+
+    :param digest: The hashed data to sign, as bytes or a base64 encoded string.
+
+    :param version: The version of the key to use. If not specified, the latest version of the key is used.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        azurerm.keyvault.key.sign test_name test_vault RS256 test_digest
+
+    """
+    result = {}
+
+    try:
+        key_id = await _get_key_id(hub, ctx, name, vault_url, version, **kwargs)
+        cconn = await hub.exec.azurerm.utils.get_keyvault_client(
+            ctx, "crypto", vault_url, key_id=key_id, **kwargs
+        )
+        signed = await hub.exec.azurerm.utils.run_in_executor(
+            cconn.sign, SignatureAlgorithm(algorithm), _to_bytes(digest)
+        )
+
+        result = {
+            "key_id": signed.key_id,
+            "algorithm": algorithm,
+            "signature": _to_base64(signed.signature),
+        }
+    except (HttpResponseError, ResourceNotFoundError, ValueError) as exc:
+        result = {"error": str(exc)}
+
+    return result
+
+
+async def unwrap_key(
+    hub, ctx, name, vault_url, algorithm, encrypted_key, version=None, **kwargs
+):
+    """
+    .. versionadded:: 4.1.0
+
+    Unwrap a key previously wrapped with another key stored in the vault, using the private material of that key.
+    Requires the keys/unwrapKey permission.
+
+    :param name: The name of the wrapping key.
+
+    :param vault_url: The URL of the vault that the client will access.
+
+    :param algorithm: The wrapping algorithm to use. Possible values include: "RSA1_5", "RSA-OAEP", and
+        "RSA-OAEP-256".
+
+    :param encrypted_key: The wrapped key, as bytes or a base64 encoded string.
+
+    :param version: The version of the key to use. If not specified, the latest version of the key is used.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        azurerm.keyvault.key.unwrap_key test_name test_vault RSA-OAEP-256 test_encrypted_key
+
+    """
+    result = {}
+
+    try:
+        key_id = await _get_key_id(hub, ctx, name, vault_url, version, **kwargs)
+        cconn = await hub.exec.azurerm.utils.get_keyvault_client(
+            ctx, "crypto", vault_url, key_id=key_id, **kwargs
+        )
+        unwrapped = await hub.exec.azurerm.utils.run_in_executor(
+            cconn.unwrap_key, KeyWrapAlgorithm(algorithm), _to_bytes(encrypted_key)
+        )
+
+        result = {
+            "key_id": unwrapped.key_id,
+            "algorithm": algorithm,
+            "key": _to_base64(unwrapped.key),
+        }
+    except (HttpResponseError, ResourceNotFoundError, ValueError) as exc:
+        result = {"error": str(exc)}
+
+    return result
+
+
 async def update_key_properties(
     hub,
     ctx,
@@ -833,3 +1255,171 @@ async def update_key_properties(
         result = {"error": str(exc)}
 
     return result
+
+
+async def verify(
+    hub,
+    ctx,
+    name,
+    vault_url,
+    algorithm,
+    digest,
+    signature,
+    version=None,
+    refresh=False,
+    **kwargs,
+):
+    """
+    .. versionadded:: 4.1.0
+
+    Verify a signature locally with the public material of a key. The public key is fetched from the vault on first use
+    and then cached, so repeated verifications do not make any requests to the vault. When no version is specified, the
+    latest version of the key is checked again once the cached one is a minute old, and a signature which does not
+    match the cached key is checked once more against the current version before it is reported as invalid. Requires
+    the keys/get permission.
+
+    :param name: The name of the key.
+
+    :param vault_url: The URL of the vault that the client will access.
+
+    :param algorithm: The signing algorithm which was used to create the signature. Possible values include: "PS256",
+        "PS384", "PS512", "RS256", "RS384", "RS512", "ES256", "ES256K", "ES384", and "ES512".
+
+    :param digest: The hashed data which was signed, as bytes or a base64 encoded string.
+
+    :param signature: The signature to verify, as bytes or a base64 encoded string.
+
+    :param version: The version of the key to use. If not specified, the latest version of the key is used.
+
+    :param refresh: Fetch the public key from the vault even if it has already been cached. Defaults to False.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        azurerm.keyvault.key.verify test_name test_vault RS256 test_digest test_signature
+
+    """
+    if not HAS_CRYPTOGRAPHY:
+        return {"error": CRYPTOGRAPHY_MISSING}
+
+    result = {}
+
+    try:
+        key_id, public_key = await _get_public_key(
+            hub, ctx, name, vault_url, version, refresh, **kwargs
+        )
+        digest = _to_bytes(digest)
+        signature = _to_bytes(signature)
+        hash_algorithm = _hash_algorithm(algorithm)
+
+        if algorithm.startswith("ES"):
+            # Key Vault returns EC signatures as the concatenation of the r and s values
+            half = len(signature) // 2
+            signature = encode_dss_signature(
+                int.from_bytes(signature[:half], "big"),
+                int.from_bytes(signature[half:], "big"),
+            )
+            args = [ec.ECDSA(Prehashed(hash_algorithm))]
+        elif algorithm.startswith("PS"):
+            args = [
+                padding.PSS(
+                    mgf=padding.MGF1(hash_algorithm),
+                    salt_length=hash_algorithm.digest_size,
+                ),
+                Prehashed(hash_algorithm),
+            ]
+        else:
+            args = [padding.PKCS1v15(), Prehashed(hash_algorithm)]
+
+        def _is_valid(public_key):
+            try:
+                public_key.verify(signature, digest, *args)
+                return True
+            except InvalidSignature:
+                return False
+
+        is_valid = _is_valid(public_key)
+
+        if not is_valid and not version and not refresh:
+            # The signature may have been made by a version of the key which was created after it was cached
+            latest_id, latest_key = await _get_public_key(
+                hub, ctx, name, vault_url, refresh=True, **kwargs
+            )
+            if latest_id != key_id:
+                key_id = latest_id
+                is_valid = _is_valid(latest_key)
+
+        result = {"key_id": key_id, "algorithm": algorithm, "is_valid": is_valid}
+    except (
+        HttpResponseError,
+        ResourceNotFoundError,
+        ValueError,
+        KeyError,
+        TypeError,
+        AttributeError,
+    ) as exc:
+        result = {"error": str(exc)}
+
+    return result
+
+
+async def wrap_key(
+    hub, ctx, name, vault_url, algorithm, key, version=None, refresh=False, **kwargs
+):
+    """
+    .. versionadded:: 4.1.0
+
+    Wrap another key locally with the public material of an RSA key. The public key is fetched from the vault on first
+    use and then cached, so repeated calls do not make any requests to the vault. When no version is specified, the
+    latest version of the key is checked again once the cached one is a minute old. The wrapped key can be unwrapped
+    with ``unwrap_key``. Requires the keys/get permission.
+
+    :param name: The name of the wrapping key.
+
+    :param vault_url: The URL of the vault that the client will access.
+
+    :param algorithm: The wrapping algorithm to use. Possible values include: "RSA1_5", "RSA-OAEP", and
+        "RSA-OAEP-256".
+
+    :param key: The key to wrap, as bytes or a base64 encoded string.
+
+    :param version: The version of the key to use. If not specified, the latest version of the key is used.
+
+    :param refresh: Fetch the public key from the vault even if it has already been cached. Defaults to False.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        azurerm.keyvault.key.wrap_key test_name test_vault RSA-OAEP-256 test_key
+
+    """
+    if not HAS_CRYPTOGRAPHY:
+        return {"error": CRYPTOGRAPHY_MISSING}
+
+    result = {}
+
+    try:
+        key_id, public_key = await _get_public_key(
+            hub, ctx, name, vault_url, version, refresh, **kwargs
+        )
+        encrypted_key = public_key.encrypt(
+            _to_bytes(key), _rsa_encryption_padding(algorithm)
+        )
+
+        result = {
+            "key_id": key_id,
+            "algorithm": algorithm,
+            "encrypted_key": _to_base64(encrypted_key),
+        }
+    except (
+        HttpResponseError,
+        ResourceNotFoundError,
+        ValueError,
+        KeyError,
+        AttributeError,
+    ) as exc:
+        result = {"error": str(exc)}
+
+    return result
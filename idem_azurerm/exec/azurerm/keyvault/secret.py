@@ -4,7 +4,7 @@ Azure Resource Manager (ARM) Key Vault Secret Execution Module
 
 .. versionadded:: 2.4.0
 
-.. versionchanged:: 4.0.0
+.. versionchanged:: 4.0.0, 4.1.0
 
 :maintainer: <devops@eitr.tech>
 :configuration: This module requires Azure Resource Manager credentials to be passed as keyword arguments
@@ -67,14 +67,17 @@ async def get_secret_client(hub, ctx, vault_url, **kwargs):
     """
     .. versionadded:: 2.4.0
 
-    Load the secret client and return a SecretClient object.
+    .. versionchanged:: 4.1.0
+
+    Load the secret client and return a SecretClient object. Clients are pooled per vault URL and identity, so repeated
+    calls reuse the same client and connections.
 
     :param vault_url: The URL of the vault that the client will access.
 
     """
-    credential = await hub.exec.azurerm.utils.get_identity_credentials(ctx, **kwargs)
-
-    secret_client = SecretClient(vault_url=vault_url, credential=credential)
+    secret_client = await hub.exec.azurerm.utils.get_keyvault_client(
+        ctx, "secret", vault_url, **kwargs
+    )
 
     return secret_client
 
@@ -308,19 +311,72 @@ async def get_secret(hub, ctx, name, vault_url, version=None, **kwargs):
     return result
 
 
-async def list_deleted_secrets(hub, ctx, vault_url, **kwargs):
+async def get_secrets(hub, ctx, vault_url, names, max_concurrency=8, **kwargs):
+    """
+    .. versionadded:: 4.1.0
+
+    Get multiple secrets concurrently. Requires the secrets/get permission.
+
+    :param vault_url: The URL of the vault that the client will access.
+
+    :param names: A list of the names of the secrets to get. The latest version of each secret is returned.
+
+    :param max_concurrency: The maximum number of secrets to get at the same time. Defaults to 8.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        azurerm.keyvault.secret.get_secrets https://myvault.vault.azure.net/ '["secret1", "secret2"]'
+
+    """
+    sconn = await hub.exec.azurerm.keyvault.secret.get_secret_client(
+        ctx, vault_url, **kwargs
+    )
+
+    async def _get(name):
+        try:
+            secret = await hub.exec.azurerm.utils.run_in_executor(
+                sconn.get_secret, name=name
+            )
+            return _secret_as_dict(secret)
+        except (HttpResponseError, ResourceNotFoundError) as exc:
+            return {"error": str(exc)}
+
+    secrets = await hub.exec.azurerm.utils.gather_limited(
+        [_get(name) for name in names], max_concurrency=max_concurrency
+    )
+
+    return dict(zip(names, secrets))
+
+
+async def list_deleted_secrets(
+    hub, ctx, vault_url, top=None, updated_after=None, enabled=None, **kwargs
+):
     """
     .. versionadded:: 2.4.0
 
+    .. versionchanged:: 4.1.0
+
     Lists all deleted secrets. Possible only in vaults with soft-delete enabled. Requires secrets/list permission.
 
+    The deleted secrets are returned with the most recently deleted first. The listing is consumed lazily, so when
+    ``top`` is specified only that many deleted secrets are held in memory at once.
+
     :param vault_url: The URL of the vault that the client will access.
 
+    :param top: The maximum number of deleted secrets to return.
+
+    :param updated_after: Only return deleted secrets which were last updated after this time. This parameter should be
+        a string representation of a Datetime object in ISO-8601 format.
+
+    :param enabled: If specified, only return deleted secrets whose enabled property matches this value.
+
     CLI Example:
 
     .. code-block:: bash
 
-        azurerm.keyvault.secret.list_deleted_secrets https://myvault.vault.azure.net/
+        azurerm.keyvault.secret.list_deleted_secrets https://myvault.vault.azure.net/ top=10
 
     """
     result = {}
@@ -329,7 +385,14 @@ async def list_deleted_secrets(hub, ctx, vault_url, **kwargs):
     )
 
     try:
-        secrets = sconn.list_deleted_secrets()
+        secrets = await hub.exec.azurerm.utils.filter_newest(
+            sconn.list_deleted_secrets(),
+            top=top,
+            updated_after=updated_after,
+            enabled=enabled,
+            sort_attr="deleted_date",
+            properties_attr="properties",
+        )
 
         for secret in secrets:
             result[secret.name] = _secret_as_dict(secret)
@@ -339,23 +402,37 @@ async def list_deleted_secrets(hub, ctx, vault_url, **kwargs):
     return result
 
 
-async def list_properties_of_secret_versions(hub, ctx, name, vault_url, **kwargs):
+async def list_properties_of_secret_versions(
+    hub, ctx, name, vault_url, top=None, updated_after=None, enabled=None, **kwargs
+):
     """
     .. versionadded:: 2.4.0
 
+    .. versionchanged:: 4.1.0
+
     List properties of all versions of a secret, excluding their values. Requires secrets/list permission.
 
     List items don't include secret values. Use ``get_secret`` to get a secret's value.
 
+    The versions are keyed by version and returned newest first. The listing is consumed lazily, so when ``top`` is
+    specified only the newest ``top`` versions are held in memory, no matter how many versions the secret has.
+
     :param name: The name of the secret.
 
     :param vault_url: The URL of the vault that the client will access.
 
+    :param top: The maximum number of versions to return.
+
+    :param updated_after: Only return versions which were last updated after this time. This parameter should be a
+        string representation of a Datetime object in ISO-8601 format.
+
+    :param enabled: If specified, only return versions whose enabled property matches this value.
+
     CLI Example:
 
     .. code-block:: bash
 
-        azurerm.keyvault.secret.list_properties_of_secret_versions secretname https://myvault.vault.azure.net/
+        azurerm.keyvault.secret.list_properties_of_secret_versions secretname https://myvault.vault.azure.net/ top=5
 
     """
     result = {}
@@ -364,10 +441,15 @@ async def list_properties_of_secret_versions(hub, ctx, name, vault_url, **kwargs
     )
 
     try:
-        secrets = sconn.list_properties_of_secret_versions(name=name,)
+        secrets = await hub.exec.azurerm.utils.filter_newest(
+            sconn.list_properties_of_secret_versions(name=name,),
+            top=top,
+            updated_after=updated_after,
+            enabled=enabled,
+        )
 
         for secret in secrets:
-            result[secret.name] = _secret_properties_as_dict(secret)
+            result[secret.version] = _secret_properties_as_dict(secret)
     except ResourceNotFoundError as exc:
         result = {"error": str(exc)}
 
@@ -553,6 +635,65 @@ async def set_secret(
     return result
 
 
+async def set_secrets(hub, ctx, vault_url, secrets, max_concurrency=8, **kwargs):
+    """
+    .. versionadded:: 4.1.0
+
+    Set multiple secrets concurrently. Requires secrets/set permission.
+
+    :param vault_url: The URL of the vault that the client will access.
+
+    :param secrets: A dictionary of secrets keyed by secret name. Each value can either be the string value of the
+        secret or a dictionary containing the ``value`` key along with any of the ``content_type``, ``enabled``,
+        ``expires_on``, ``not_before``, and ``tags`` properties accepted by ``set_secret``. If the ``value`` key is
+        omitted from a dictionary, only the properties of the latest version of the secret are updated, as with
+        ``update_secret_properties``.
+
+    :param max_concurrency: The maximum number of secrets to set at the same time. Defaults to 8.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        azurerm.keyvault.secret.set_secrets https://myvault.vault.azure.net/ '{"secret1": "value1"}'
+
+    """
+    props = ["content_type", "enabled", "expires_on", "not_before", "tags"]
+    sconn = await hub.exec.azurerm.keyvault.secret.get_secret_client(
+        ctx, vault_url, **kwargs
+    )
+
+    async def _set(name, secret):
+        if not isinstance(secret, dict):
+            secret = {"value": secret}
+        secret_kwargs = {prop: secret.get(prop) for prop in props}
+
+        try:
+            if "value" in secret:
+                result = await hub.exec.azurerm.utils.run_in_executor(
+                    sconn.set_secret, name=name, value=secret["value"], **secret_kwargs
+                )
+            else:
+                result = await hub.exec.azurerm.utils.run_in_executor(
+                    sconn.update_secret_properties, name=name, **secret_kwargs
+                )
+            return _secret_as_dict(result)
+        except (
+            HttpResponseError,
+            ResourceNotFoundError,
+            ResourceExistsError,
+            SerializationError,
+        ) as exc:
+            return {"error": str(exc)}
+
+    names = list(secrets)
+    results = await hub.exec.azurerm.utils.gather_limited(
+        [_set(name, secrets[name]) for name in names], max_concurrency=max_concurrency
+    )
+
+    return dict(zip(names, results))
+
+
 async def update_secret_properties(
     hub,
     ctx,
@@ -4,7 +4,7 @@ Azure Resource Manager (ARM) Key Vault Execution Module
 
 .. versionadded:: 2.0.0
 
-.. versionchanged:: 4.0.0
+.. versionchanged:: 4.0.0, 4.1.0
 
 :maintainer: <devops@eitr.tech>
 :configuration: This module requires Azure Resource Manager credentials to be passed as keyword arguments
@@ -35,7 +35,13 @@ Azure Resource Manager (ARM) Key Vault Execution Module
 """
 # Python libs
 from __future__ import absolute_import
+import asyncio
+import datetime
+import hashlib
+import json
 import logging
+import os
+import zipfile
 
 # Azure libs
 HAS_LIBS = False
@@ -43,6 +49,11 @@ try:
     import azure.mgmt.keyvault.models  # pylint: disable=unused-import
     from msrest.exceptions import SerializationError
     from msrestazure.azure_exceptions import CloudError
+    from azure.core.exceptions import (
+        HttpResponseError,
+        ResourceExistsError,
+        ResourceNotFoundError,
+    )
 
     HAS_LIBS = True
 except ImportError:
@@ -52,6 +63,149 @@ __func_alias__ = {"list_": "list"}
 
 log = logging.getLogger(__name__)
 
+# Name of the member of a vault backup archive which indexes the backed up objects
+ARCHIVE_INDEX = "index.json"
+
+
+async def backup_vault(
+    hub,
+    ctx,
+    vault_url,
+    archive_path,
+    keys=True,
+    secrets=True,
+    max_concurrency=8,
+    **kwargs,
+):
+    """
+    .. versionadded:: 4.1.0
+
+    Back up all of the keys and secrets in a vault into a single archive file. The objects are backed up concurrently
+    and each backup is written to the archive as soon as it is received, so only a bounded number of backups are held
+    in memory at once. The archive is a ZIP file containing one member per object along with an index of its contents.
+    Requires the keys/list, keys/backup, secrets/list, and secrets/backup permissions.
+
+    Keys and secrets which are managed by Key Vault certificates can't be backed up individually and are skipped.
+
+    :param vault_url: The URL of the vault that the client will access.
+
+    :param archive_path: The path of the archive file to create. An existing file will be overwritten.
+
+    :param keys: Whether to back up the keys in the vault. Defaults to True.
+
+    :param secrets: Whether to back up the secrets in the vault. Defaults to True.
+
+    :param max_concurrency: The maximum number of objects to back up at the same time. Defaults to 8.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        azurerm.keyvault.vault.backup_vault https://myvault.vault.azure.net/ /backups/myvault.zip
+
+    """
+    clients = {}
+    if keys:
+        clients["keys"] = (
+            await hub.exec.azurerm.keyvault.key.get_key_client(
+                ctx, vault_url, **kwargs
+            ),
+            "list_properties_of_keys",
+            "backup_key",
+        )
+    if secrets:
+        clients["secrets"] = (
+            await hub.exec.azurerm.keyvault.secret.get_secret_client(
+                ctx, vault_url, **kwargs
+            ),
+            "list_properties_of_secrets",
+            "backup_secret",
+        )
+
+    items = []
+    try:
+        for object_type, (client, list_func, _) in clients.items():
+            listing = await hub.exec.azurerm.utils.run_in_executor(
+                lambda: [
+                    obj.name
+                    for obj in getattr(client, list_func)()
+                    if not getattr(obj, "managed", False)
+                ]
+            )
+            items.extend((object_type, name) for name in listing)
+    except (HttpResponseError, ResourceNotFoundError) as exc:
+        return {"error": str(exc)}
+
+    result = {
+        "archive": archive_path,
+        "total": 0,
+        "succeeded": 0,
+        "failed": 0,
+        "items": {},
+    }
+    index = {
+        "vault_url": vault_url,
+        "created_on": datetime.datetime.utcnow().isoformat(),
+        "items": [],
+    }
+    tmp_path = f"{archive_path}.tmp"
+
+    try:
+        with zipfile.ZipFile(
+            tmp_path, "w", compression=zipfile.ZIP_DEFLATED
+        ) as archive:
+
+            async def _backup(object_type, name):
+                client, _, backup_func = clients[object_type]
+                member = f"{object_type}/{name}"
+                try:
+                    blob = await hub.exec.azurerm.utils.run_in_executor(
+                        getattr(client, backup_func), name
+                    )
+                except (HttpResponseError, ResourceNotFoundError) as exc:
+                    return member, {"error": str(exc)}
+
+                # Each backup is written out as soon as it arrives and is not kept afterwards
+                archive.writestr(member, blob)
+                index["items"].append(
+                    {
+                        "type": object_type,
+                        "name": name,
+                        "member": member,
+                        "size": len(blob),
+                        "sha256": hashlib.sha256(blob).hexdigest(),
+                    }
+                )
+                return member, {"size": len(blob)}
+
+            backups = await hub.exec.azurerm.utils.gather_limited(
+                [_backup(object_type, name) for object_type, name in items],
+                max_concurrency=max_concurrency,
+            )
+
+            archive.writestr(ARCHIVE_INDEX, json.dumps(index, indent=2))
+
+        os.replace(tmp_path, archive_path)
+    except OSError as exc:
+        return {"error": str(exc)}
+    finally:
+        # A partial archive holds backup blobs, so it is never left behind
+        if os.path.exists(tmp_path):
+            try:
+                os.remove(tmp_path)
+            except OSError as exc:
+                log.error("Unable to remove the partial archive %s: %s", tmp_path, exc)
+
+    for member, backup in backups:
+        result["total"] += 1
+        if "error" in backup:
+            result["failed"] += 1
+        else:
+            result["succeeded"] += 1
+        result["items"][member] = backup
+
+    return result
+
 
 async def check_name_availability(hub, ctx, name, **kwargs):
     """
@@ -489,6 +643,104 @@ async def purge_deleted(hub, ctx, name, location, **kwargs):
     return result
 
 
+async def restore_vault(
+    hub, ctx, vault_url, archive_path, max_concurrency=8, retries=3, **kwargs
+):
+    """
+    .. versionadded:: 4.1.0
+
+    Restore the keys and secrets from an archive created by ``backup_vault`` into a vault. Objects are read from the
+    archive one at a time as they are restored, and are pushed to the vault concurrently. Failed restores are retried
+    with an exponential backoff. Objects whose names are already in use in the vault can't be restored and are reported
+    as failures. Requires the keys/restore and secrets/restore permissions.
+
+    The target vault must be owned by the same Azure subscription as the source vault, and backups can't be restored
+    across geopolitical boundaries.
+
+    :param vault_url: The URL of the vault that the client will access.
+
+    :param archive_path: The path of the archive file created by ``backup_vault``.
+
+    :param max_concurrency: The maximum number of objects to restore at the same time. Defaults to 8.
+
+    :param retries: The number of times a failed restore is retried. Defaults to 3.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        azurerm.keyvault.vault.restore_vault https://myvault.vault.azure.net/ /backups/myvault.zip
+
+    """
+    result = {
+        "archive": archive_path,
+        "total": 0,
+        "succeeded": 0,
+        "failed": 0,
+        "items": {},
+    }
+
+    try:
+        archive = zipfile.ZipFile(archive_path, "r")
+        index = json.loads(archive.read(ARCHIVE_INDEX).decode("utf-8"))
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile) as exc:
+        return {"error": f"Unable to read the vault backup archive: {exc}"}
+
+    clients = {
+        "keys": (
+            await hub.exec.azurerm.keyvault.key.get_key_client(
+                ctx, vault_url, **kwargs
+            ),
+            "restore_key_backup",
+        ),
+        "secrets": (
+            await hub.exec.azurerm.keyvault.secret.get_secret_client(
+                ctx, vault_url, **kwargs
+            ),
+            "restore_secret_backup",
+        ),
+    }
+
+    async def _restore(item):
+        client, restore_func = clients[item["type"]]
+        blob = archive.read(item["member"])
+
+        if hashlib.sha256(blob).hexdigest() != item.get("sha256"):
+            return {"error": "The backup does not match the checksum in the archive."}
+
+        for attempt in range(int(retries) + 1):
+            try:
+                await hub.exec.azurerm.utils.run_in_executor(
+                    getattr(client, restore_func), blob
+                )
+                return {"attempts": attempt + 1}
+            except ResourceExistsError as exc:
+                return {"error": str(exc)}
+            except HttpResponseError as exc:
+                if attempt >= int(retries):
+                    return {"error": str(exc)}
+                log.debug("Retrying the restore of %s: %s", item["member"], exc)
+                await asyncio.sleep(2 ** attempt)
+
+    try:
+        restores = await hub.exec.azurerm.utils.gather_limited(
+            [_restore(item) for item in index["items"]],
+            max_concurrency=max_concurrency,
+        )
+    finally:
+        archive.close()
+
+    for item, restore in zip(index["items"], restores):
+        result["total"] += 1
+        if "error" in restore:
+            result["failed"] += 1
+        else:
+            result["succeeded"] += 1
+        result["items"][item["member"]] = restore
+
+    return result
+
+
 async def update_access_policy(
     hub, ctx, name, resource_group, operation_kind, access_policies, **kwargs
 ):
@@ -4,7 +4,7 @@ Azure Resource Manager (ARM) Management Group Operations Execution Module
 
 .. versionadded:: 2.0.0
 
-.. versionchanged:: 4.0.0
+.. versionchanged:: 4.0.0, 4.1.0
 
 :maintainer: <devops@eitr.tech>
 :configuration: This module requires Azure Resource Manager credentials to be passed as keyword arguments
@@ -36,6 +36,7 @@ Azure Resource Manager (ARM) Management Group Operations Execution Module
 # Python libs
 from __future__ import absolute_import
 import logging
+import time
 
 # Azure libs
 HAS_LIBS = False
@@ -56,6 +57,9 @@ __func_alias__ = {"list_": "list"}
 
 log = logging.getLogger(__name__)
 
+# The number of seconds a crawled management group hierarchy is used for
+HIERARCHY_MAX_AGE = 300
+
 
 async def get_api_client(hub, ctx, **kwargs):
     """
@@ -248,3 +252,156 @@ async def list_(hub, ctx, skip_token=None, **kwargs):
         result = {"error": str(exc)}
 
     return result
+
+
+async def get_hierarchy(
+    hub, ctx, root=None, max_concurrency=8, refresh=False, **kwargs
+):
+    """
+    .. versionadded:: 4.1.0
+
+    Crawl the management group hierarchy below a management group and return it as a parent and child index. The
+    hierarchy is fetched level by level, with the management groups of each level fetched concurrently, and is cached
+    in memory for a few minutes. A cached hierarchy is returned without making any requests.
+
+    The returned dictionary contains the ``root`` management group, the ``management_groups`` keyed by name with their
+    ``display_name``, ``parent``, ``children`` and ``subscriptions``, and the ``subscriptions`` keyed by subscription ID
+    with their ``display_name``, the ``management_group`` containing them and their ``ancestry``, the list of
+    management groups from the root down to the one containing them.
+
+    :param root: The name of the management group to start crawling from. Defaults to the tenant root group.
+
+    :param max_concurrency: The maximum number of management groups to fetch at the same time. Defaults to 8.
+
+    :param refresh: Crawl the hierarchy again, even if it is cached. Defaults to False.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        azurerm.managementgroup.operations.get_hierarchy
+
+    """
+    if root:
+        cache_key = root.lower()
+    else:
+        # The tenant root group is resolved with a request, so its crawl is also cached under a key for the tenant
+        acct = ctx.get("acct") or {}
+        cache_key = "default:{0}".format(
+            str(kwargs.get("tenant") or acct.get("tenant") or "").lower()
+        )
+
+    cached = hub.exec.azurerm.MANAGEMENT_GROUP_HIERARCHY.get(cache_key)
+    if cached and not refresh and time.time() - cached["crawled"] <= HIERARCHY_MAX_AGE:
+        return cached["hierarchy"]
+
+    manconn = await hub.exec.azurerm.managementgroup.operations.get_api_client(
+        ctx, **kwargs
+    )
+
+    try:
+        if not root:
+            # The name of the tenant root group is the tenant ID
+            mgroup = await hub.exec.azurerm.utils.run_in_executor(
+                lambda: next(iter(manconn.management_groups.list()), None)
+            )
+            if mgroup is None:
+                return {"error": "No management groups were found."}
+            root = mgroup.tenant_id
+
+        hierarchy = {"root": root, "management_groups": {}, "subscriptions": {}}
+        ancestry = {root: []}
+        level = [root]
+
+        while level:
+            mgroups = await hub.exec.azurerm.utils.gather_limited(
+                [
+                    hub.exec.azurerm.utils.run_in_executor(
+                        manconn.management_groups.get, group_id=name, expand="children"
+                    )
+                    for name in level
+                ],
+                max_concurrency=max_concurrency,
+            )
+
+            next_level = []
+            for name, mgroup in zip(level, mgroups):
+                path = ancestry[name] + [name]
+                entry = hierarchy["management_groups"].setdefault(name, {})
+                entry.update(
+                    {
+                        "display_name": mgroup.display_name,
+                        "parent": ancestry[name][-1] if ancestry[name] else None,
+                        "children": [],
+                        "subscriptions": [],
+                    }
+                )
+
+                for child in mgroup.children or []:
+                    if str(child.type).lower().endswith("subscriptions"):
+                        entry["subscriptions"].append(child.name)
+                        hierarchy["subscriptions"][child.name] = {
+                            "display_name": child.display_name,
+                            "management_group": name,
+                            "ancestry": path,
+                        }
+                    else:
+                        entry["children"].append(child.name)
+                        ancestry[child.name] = path
+                        next_level.append(child.name)
+
+            level = next_level
+    except ErrorResponseException as exc:
+        return {"error": str(exc)}
+
+    cached = {"crawled": time.time(), "hierarchy": hierarchy}
+    hub.exec.azurerm.MANAGEMENT_GROUP_HIERARCHY[root.lower()] = cached
+    hub.exec.azurerm.MANAGEMENT_GROUP_HIERARCHY[cache_key] = cached
+
+    return hierarchy
+
+
+async def get_subscription_ancestry(
+    hub, ctx, subscription_id, root=None, refresh=False, **kwargs
+):
+    """
+    .. versionadded:: 4.1.0
+
+    Find the management group containing a subscription, and the management groups above it, using the cached
+    management group hierarchy. The hierarchy is only crawled if it is not cached yet.
+
+    :param subscription_id: The ID of the subscription to look up.
+
+    :param root: The name of the management group the hierarchy is crawled from. Defaults to the tenant root group.
+
+    :param refresh: Crawl the hierarchy again, even if it is cached. Defaults to False.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        azurerm.managementgroup.operations.get_subscription_ancestry 3287abc8-f98a-c678-3bde-326766fd3617
+
+    """
+    hierarchy = await hub.exec.azurerm.managementgroup.operations.get_hierarchy(
+        ctx, root=root, refresh=refresh, **kwargs
+    )
+    if "error" in hierarchy:
+        return hierarchy
+
+    subscription = hierarchy["subscriptions"].get(subscription_id)
+    if subscription is None:
+        for sub_id, sub in hierarchy["subscriptions"].items():
+            if sub_id.lower() == subscription_id.lower():
+                subscription = sub
+                break
+        else:
+            return {
+                "error": "The subscription {0} was not found in the management group hierarchy.".format(
+                    subscription_id
+                )
+            }
+
+    result = {"subscription_id": subscription_id}
+    result.update(subscription)
+    return result
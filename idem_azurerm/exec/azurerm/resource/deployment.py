@@ -4,6 +4,8 @@ Azure Resource Manager (ARM) Resource Deployment Execution Module
 
 .. versionadded:: 1.0.0
 
+.. versionchanged:: 4.1.0
+
 :maintainer: <devops@eitr.tech>
 :configuration: This module requires Azure Resource Manager credentials to be passed as keyword arguments
     to every function or via acct in order to work properly.
@@ -33,7 +35,13 @@ Azure Resource Manager (ARM) Resource Deployment Execution Module
 """
 # Python libs
 from __future__ import absolute_import
+import asyncio
+import datetime
+import hashlib
+import json
 import logging
+import os
+import re
 
 # Azure libs
 HAS_LIBS = False
@@ -50,6 +58,355 @@ __func_alias__ = {"list_": "list"}
 
 log = logging.getLogger(__name__)
 
+TERMINAL_STATES = ("Succeeded", "Failed", "Canceled")
+
+# Name of the file recording the files written by a split template export
+EXPORT_MANIFEST = ".export-manifest.json"
+
+INDEX_FILE = os.path.join(
+    os.path.expanduser("~"), ".cache", "idem-azurerm", "deployments.json"
+)
+
+
+async def _deployment_properties(
+    hub,
+    deploy_mode=None,
+    debug_setting=None,
+    deploy_params=None,
+    parameters_link=None,
+    deploy_template=None,
+    template_link=None,
+    **kwargs,
+):
+    """
+    Build the DeploymentProperties object model shared by validation and deployment. A TypeError is raised if the
+    object model cannot be built.
+
+    """
+    prop_kwargs = {"mode": deploy_mode}
+    prop_kwargs["debug_setting"] = {"detail_level": debug_setting}
+
+    if deploy_params:
+        prop_kwargs["parameters"] = deploy_params
+    else:
+        if isinstance(parameters_link, dict):
+            prop_kwargs["parameters_link"] = parameters_link
+        else:
+            prop_kwargs["parameters_link"] = {"uri": parameters_link}
+
+    if deploy_template:
+        prop_kwargs["template"] = deploy_template
+    else:
+        if isinstance(template_link, dict):
+            prop_kwargs["template_link"] = template_link
+        else:
+            prop_kwargs["template_link"] = {"uri": template_link}
+
+    deploy_kwargs = kwargs.copy()
+    deploy_kwargs.update(prop_kwargs)
+
+    return await hub.exec.azurerm.utils.create_object_model(
+        "resource.resources", "DeploymentProperties", **deploy_kwargs
+    )
+
+
+async def _load_file(hub, path, parameters=False):
+    """
+    Load a JSON template or parameters file. Parsed files are cached by path, and a file is only parsed again if its
+    modification time or size has changed and its content no longer has the same hash. The ``parameters`` property of
+    an ARM parameters file is returned when ``parameters`` is True.
+
+    """
+    path = os.path.realpath(os.path.expanduser(path))
+    stat = os.stat(path)
+    file_stat = (stat.st_mtime_ns, stat.st_size)
+    cached = hub.exec.azurerm.DEPLOYMENT_FILES.get(path)
+
+    if cached and cached["stat"] == file_stat:
+        return cached["content"]
+
+    def _read():
+        with open(path, "rb") as fhr:
+            return fhr.read()
+
+    data = await hub.exec.azurerm.utils.run_in_executor(_read)
+    digest = hashlib.sha256(data).hexdigest()
+
+    if cached and cached["hash"] == digest:
+        cached["stat"] = file_stat
+        return cached["content"]
+
+    content = json.loads(data.decode("utf-8-sig"))
+    # Unwrap ARM parameters files, as opposed to files holding only the parameter values
+    if (
+        parameters
+        and isinstance(content, dict)
+        and "parameters" in content
+        and ("$schema" in content or "contentVersion" in content)
+    ):
+        content = content["parameters"]
+
+    hub.exec.azurerm.DEPLOYMENT_FILES[path] = {
+        "stat": file_stat,
+        "hash": digest,
+        "content": content,
+    }
+
+    return content
+
+
+async def _load_files(
+    hub,
+    deploy_template=None,
+    deploy_params=None,
+    template_file=None,
+    parameters_file=None,
+):
+    """
+    Return the template and parameters of a deployment, loading them from local files where specified.
+
+    """
+    if template_file:
+        deploy_template = await _load_file(hub, template_file)
+    if parameters_file:
+        deploy_params = await _load_file(hub, parameters_file, parameters=True)
+
+    return deploy_template, deploy_params
+
+
+async def _validate_model(hub, resconn, name, resource_group, deploy_model):
+    """
+    Validate an already built DeploymentProperties object model, locally and then against Azure Resource Manager.
+
+    """
+    local_validation = deploy_model.validate()
+    if local_validation:
+        raise local_validation[0]
+
+    deploy = await hub.exec.azurerm.utils.run_in_executor(
+        resconn.deployments.validate,
+        deployment_name=name,
+        resource_group_name=resource_group,
+        properties=deploy_model,
+    )
+
+    return deploy.as_dict()
+
+
+def _dump_json(obj, path, pretty=False):
+    """
+    Write an object to a file as JSON in chunks, so the whole document is never held as a single string. The number
+    of bytes written is returned. The file is written to a temporary file first, which is removed if anything fails.
+
+    """
+    encoder = json.JSONEncoder(indent=2 if pretty else None, sort_keys=bool(pretty))
+    written = 0
+
+    tmp_file = "{0}.{1}.tmp".format(path, os.getpid())
+    try:
+        with open(tmp_file, "wb") as fhw:
+            for chunk in encoder.iterencode(obj):
+                written += fhw.write(chunk.encode("utf-8"))
+        os.replace(tmp_file, path)
+    finally:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+
+    return written
+
+
+def _write_template(template, output_file, pretty=False, split=False):
+    """
+    Write an exported template to a file, or split by resource type to a directory. A dictionary of the files written
+    and their sizes in bytes is returned.
+
+    When splitting, the files written are recorded in a manifest in the directory, and the files of resource types
+    which are no longer in the template are removed on the next export.
+
+    """
+    output_file = os.path.expanduser(output_file)
+
+    if not split:
+        return {output_file: _dump_json(template, output_file, pretty)}
+
+    os.makedirs(output_file, exist_ok=True)
+    manifest = os.path.join(output_file, EXPORT_MANIFEST)
+
+    try:
+        with open(manifest, "r") as fhr:
+            previous = json.load(fhr)
+    except (IOError, OSError, ValueError):
+        previous = []
+
+    by_type = {}
+    for resource in template.get("resources", []):
+        by_type.setdefault(resource.get("type", "unknown"), []).append(resource)
+
+    files = {}
+    skeleton = dict(template)
+    skeleton["resources"] = []
+    path = os.path.join(output_file, "template.json")
+    files[path] = _dump_json(skeleton, path, pretty)
+
+    for resource_type, resources in by_type.items():
+        path = os.path.join(
+            output_file,
+            "{0}.json".format(re.sub(r"[^A-Za-z0-9_.-]+", "_", resource_type)),
+        )
+        files[path] = _dump_json(resources, path, pretty)
+
+    names = sorted(os.path.basename(path) for path in files)
+    _dump_json(names, manifest)
+
+    # Only files written by an earlier export are removed, anything else in the directory is left alone
+    for stale in set(previous) - set(names):
+        if isinstance(stale, str) and os.path.basename(stale) == stale:
+            try:
+                os.remove(os.path.join(output_file, stale))
+            except FileNotFoundError:
+                pass
+
+    return files
+
+
+def _operation_summary(operation):
+    """
+    Summarize a deployment operation as the progress of the resource it targets.
+
+    """
+    props = operation.get("properties", {})
+    target = props.get("target_resource", {})
+
+    summary = {
+        "resource_id": target.get("id"),
+        "resource_name": target.get("resource_name"),
+        "resource_type": target.get("resource_type"),
+        "provisioning_state": props.get("provisioning_state"),
+        "timestamp": props.get("timestamp"),
+        "duration": props.get("duration"),
+        "status_code": props.get("status_code"),
+    }
+
+    if props.get("provisioning_state") == "Failed":
+        summary["status_message"] = props.get("status_message")
+
+    return summary
+
+
+def _load_json(value):
+    """
+    Load a JSON string into an object, leaving anything else as it is.
+
+    """
+    if isinstance(value, str):
+        try:
+            return json.loads(value)
+        except ValueError:
+            pass
+    return value
+
+
+def _fingerprint(
+    deploy_mode=None,
+    deploy_params=None,
+    parameters_link=None,
+    deploy_template=None,
+    template_link=None,
+):
+    """
+    Hash the normalized template and parameters of a deployment. Key order and whitespace do not change the result.
+
+    None is returned for a deployment which uses a template or parameters link, since the content behind a link can
+    change without its URI changing. Such deployments are never skipped.
+
+    """
+    if (template_link and not deploy_template) or (
+        parameters_link and not deploy_params
+    ):
+        return None
+
+    content = {
+        "mode": str(deploy_mode or "").lower(),
+        "parameters": _load_json(deploy_params),
+        "template": _load_json(deploy_template),
+    }
+
+    return hashlib.sha256(
+        json.dumps(content, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    ).hexdigest()
+
+
+def _index_key(resconn, name, resource_group):
+    return "/subscriptions/{0}/resourceGroups/{1}/deployments/{2}".format(
+        resconn.config.subscription_id, resource_group, name
+    ).lower()
+
+
+def _read_index(index_file):
+    try:
+        with open(index_file or INDEX_FILE, "r") as fhr:
+            return json.load(fhr)
+    except (IOError, OSError, ValueError):
+        return {}
+
+
+def _write_index(index_file, key, fingerprint, deployment):
+    """
+    Record the fingerprint of a successful deployment in the local index.
+
+    """
+    index_file = index_file or INDEX_FILE
+    props = deployment.get("properties", {})
+
+    index = _read_index(index_file)
+    index[key] = {
+        "fingerprint": fingerprint,
+        "correlation_id": props.get("correlation_id"),
+        "recorded": datetime.datetime.utcnow().isoformat() + "Z",
+    }
+
+    try:
+        os.makedirs(os.path.dirname(index_file), exist_ok=True)
+        tmp_file = "{0}.{1}.tmp".format(index_file, os.getpid())
+        with open(tmp_file, "w") as fhw:
+            json.dump(index, fhw, indent=2, sort_keys=True)
+        os.replace(tmp_file, index_file)
+    except (IOError, OSError) as exc:
+        log.warning("Unable to update the deployment index %s: %s", index_file, exc)
+
+
+async def _get_unchanged(hub, resconn, name, resource_group, fingerprint, index_file):
+    """
+    Return the deployment if the local index shows it was last deployed successfully with the same fingerprint and it
+    has not been deployed again since. Otherwise, None is returned.
+
+    """
+    entry = _read_index(index_file).get(_index_key(resconn, name, resource_group))
+    if not entry or entry.get("fingerprint") != fingerprint:
+        return None
+
+    try:
+        deploy = await hub.exec.azurerm.utils.run_in_executor(
+            resconn.deployments.get,
+            deployment_name=name,
+            resource_group_name=resource_group,
+        )
+    except CloudError:
+        return None
+
+    deploy = deploy.as_dict()
+    props = deploy.get("properties", {})
+    if props.get("provisioning_state") != "Succeeded" or props.get(
+        "correlation_id"
+    ) != entry.get("correlation_id"):
+        return None
+
+    log.info(
+        "The template and parameters of deployment %s are unchanged, skipping it.",
+        name,
+    )
+    return deploy
+
 
 async def operation_get(hub, ctx, operation, deployment, resource_group, **kwargs):
     """
@@ -197,13 +554,25 @@ async def create_or_update(
     parameters_link=None,
     deploy_template=None,
     template_link=None,
+    template_file=None,
+    parameters_file=None,
+    force=False,
+    index_file=None,
     **kwargs,
 ):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 4.1.0
+
     Deploys resources to a resource group.
 
+    A fingerprint of the normalized template and parameters of every successful deployment is kept in a local index.
+    If the deployment was last deployed successfully with the same fingerprint, and has not been deployed again since,
+    the validation and deployment are skipped and the existing deployment is returned. Deployments which use the
+    template_link or parameters_link properties are always validated and deployed, since the content behind a link
+    can change without its URI changing.
+
     :param name: The name of the deployment to create or update.
 
     :param resource_group: The resource group name assigned to the deployment.
@@ -235,6 +604,18 @@ async def create_or_update(
     :param template_link: The URI of the template. Use either the template_link property or the
         deploy_template property, but not both.
 
+    :param template_file: The path of a local template file. The parsed file is cached, so it is only read again
+        once it changes. This takes precedence over the deploy_template property.
+
+    :param parameters_file: The path of a local parameters file. The parsed file is cached, so it is only read again
+        once it changes. This takes precedence over the deploy_params property.
+
+    :param force: Validate and deploy the template even if it is unchanged since the last successful deployment.
+        Defaults to False.
+
+    :param index_file: The path of the local index of deployment fingerprints. Defaults to
+        ``~/.cache/idem-azurerm/deployments.json``.
+
     CLI Example:
 
     .. code-block:: bash
@@ -245,43 +626,29 @@ async def create_or_update(
     result = {}
     resconn = await hub.exec.azurerm.utils.get_client(ctx, "resource", **kwargs)
 
-    prop_kwargs = {"mode": deploy_mode}
-    prop_kwargs["debug_setting"] = {"detail_level": debug_setting}
-
-    if deploy_params:
-        prop_kwargs["parameters"] = deploy_params
-    else:
-        if isinstance(parameters_link, dict):
-            prop_kwargs["parameters_link"] = parameters_link
-        else:
-            prop_kwargs["parameters_link"] = {"uri": parameters_link}
-
-    if deploy_template:
-        prop_kwargs["template"] = deploy_template
-    else:
-        if isinstance(template_link, dict):
-            prop_kwargs["template_link"] = template_link
-        else:
-            prop_kwargs["template_link"] = {"uri": template_link}
-
-    deploy_kwargs = kwargs.copy()
-    deploy_kwargs.update(prop_kwargs)
-
     try:
-        deploy_model = await hub.exec.azurerm.utils.create_object_model(
-            "resource.resources", "DeploymentProperties", **deploy_kwargs
+        deploy_template, deploy_params = await _load_files(
+            hub, deploy_template, deploy_params, template_file, parameters_file
         )
-    except TypeError as exc:
+    except (IOError, OSError, ValueError) as exc:
         result = {
-            "error": "The object model could not be built. ({0})".format(str(exc))
+            "error": "The deployment files could not be loaded. ({0})".format(str(exc))
         }
         return result
 
+    fingerprint = _fingerprint(
+        deploy_mode, deploy_params, parameters_link, deploy_template, template_link
+    )
+    if not force and fingerprint:
+        unchanged = await _get_unchanged(
+            hub, resconn, name, resource_group, fingerprint, index_file
+        )
+        if unchanged:
+            return unchanged
+
     try:
-        validate = await hub.exec.azurerm.resource.deployment.validate(
-            ctx=ctx,
-            name=name,
-            resource_group=resource_group,
+        deploy_model = await _deployment_properties(
+            hub,
             deploy_mode=deploy_mode,
             debug_setting=debug_setting,
             deploy_params=deploy_params,
@@ -290,6 +657,17 @@ async def create_or_update(
             template_link=template_link,
             **kwargs,
         )
+    except TypeError as exc:
+        result = {
+            "error": "The object model could not be built. ({0})".format(str(exc))
+        }
+        return result
+
+    try:
+        # The model built above is validated and then deployed as it is
+        validate = await _validate_model(
+            hub, resconn, name, resource_group, deploy_model
+        )
         if "error" in validate:
             result = validate
         else:
@@ -300,6 +678,240 @@ async def create_or_update(
             )
             deploy.wait()
             result = deploy.result().as_dict()
+
+            if (
+                fingerprint
+                and result.get("properties", {}).get("provisioning_state")
+                == "Succeeded"
+            ):
+                _write_index(
+                    index_file,
+                    _index_key(resconn, name, resource_group),
+                    fingerprint,
+                    result,
+                )
+    except CloudError as exc:
+        await hub.exec.azurerm.utils.log_cloud_error("resource", str(exc), **kwargs)
+        result = {"error": str(exc)}
+    except SerializationError as exc:
+        result = {
+            "error": "The object model could not be parsed. ({0})".format(str(exc))
+        }
+
+    return result
+
+
+async def run(
+    hub,
+    ctx,
+    name,
+    resource_group,
+    deploy_mode="incremental",
+    debug_setting="none",
+    deploy_params=None,
+    parameters_link=None,
+    deploy_template=None,
+    template_link=None,
+    template_file=None,
+    parameters_file=None,
+    timeout=None,
+    cancel_on_timeout=True,
+    interval=5,
+    max_interval=30,
+    force=False,
+    index_file=None,
+    **kwargs,
+):
+    """
+    .. versionadded:: 4.1.0
+
+    Deploys resources to a resource group and follows the deployment while it runs. Unlike ``create_or_update``, no
+    thread is held waiting on the long running operation. Instead, the deployment and its operations are polled with
+    an increasing interval and each change in the provisioning state of a target resource is logged as it is observed.
+    The function returns as soon as the deployment reaches a terminal state.
+
+    The returned deployment contains an ``operations`` dictionary, keyed by operation ID, holding the provisioning
+    state, timestamp and duration of every resource in the deployment, as well as the ``elapsed`` number of seconds.
+
+    :param name: The name of the deployment to create or update.
+
+    :param resource_group: The resource group name assigned to the deployment.
+
+    :param deploy_mode: The mode that is used to deploy resources. This value can be either
+        'incremental' or 'complete'. Defaults to 'incremental'.
+
+    :param debug_setting: The debug setting of the deployment. The permitted values are 'none',
+        'requestContent', 'responseContent', or 'requestContent,responseContent'. Defaults to 'none'.
+
+    :param deploy_params: JSON string containing name and value pairs that define the deployment
+        parameters for the template. Use either the parameters_link property or the deploy_params property,
+        but not both.
+
+    :param parameters_link: The URI of a parameters file. Use either the parameters_link property or the
+        deploy_params property, but not both.
+
+    :param deploy_template: JSON string of template content. Use either the template_link property or the
+        deploy_template property, but not both.
+
+    :param template_link: The URI of the template. Use either the template_link property or the
+        deploy_template property, but not both.
+
+    :param template_file: The path of a local template file. The parsed file is cached, so it is only read again
+        once it changes. This takes precedence over the deploy_template property.
+
+    :param parameters_file: The path of a local parameters file. The parsed file is cached, so it is only read again
+        once it changes. This takes precedence over the deploy_params property.
+
+    :param timeout: The maximum number of seconds to wait for the deployment to finish. Defaults to waiting
+        indefinitely.
+
+    :param cancel_on_timeout: Cancel the deployment if it is still running once the timeout has elapsed.
+        Defaults to True.
+
+    :param interval: The initial number of seconds between polls of the deployment. Defaults to 5.
+
+    :param max_interval: The maximum number of seconds between polls of the deployment. Defaults to 30.
+
+    :param force: Validate and deploy the template even if it is unchanged since the last successful deployment.
+        Defaults to False. See ``create_or_update`` for details.
+
+    :param index_file: The path of the local index of deployment fingerprints. Defaults to
+        ``~/.cache/idem-azurerm/deployments.json``.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        azurerm.resource.deployment.run testdeploy testgroup template_link=https://... timeout=1800
+
+    """
+    result = {}
+    resconn = await hub.exec.azurerm.utils.get_client(ctx, "resource", **kwargs)
+    loop = asyncio.get_event_loop()
+
+    try:
+        deploy_template, deploy_params = await _load_files(
+            hub, deploy_template, deploy_params, template_file, parameters_file
+        )
+    except (IOError, OSError, ValueError) as exc:
+        result = {
+            "error": "The deployment files could not be loaded. ({0})".format(str(exc))
+        }
+        return result
+
+    fingerprint = _fingerprint(
+        deploy_mode, deploy_params, parameters_link, deploy_template, template_link
+    )
+    if not force and fingerprint:
+        unchanged = await _get_unchanged(
+            hub, resconn, name, resource_group, fingerprint, index_file
+        )
+        if unchanged:
+            return unchanged
+
+    try:
+        deploy_model = await _deployment_properties(
+            hub,
+            deploy_mode=deploy_mode,
+            debug_setting=debug_setting,
+            deploy_params=deploy_params,
+            parameters_link=parameters_link,
+            deploy_template=deploy_template,
+            template_link=template_link,
+            **kwargs,
+        )
+    except TypeError as exc:
+        result = {
+            "error": "The object model could not be built. ({0})".format(str(exc))
+        }
+        return result
+
+    operations = {}
+
+    async def _poll():
+        deploy = await hub.exec.azurerm.utils.run_in_executor(
+            resconn.deployments.get,
+            deployment_name=name,
+            resource_group_name=resource_group,
+        )
+        # Paging is blocking as well, so all pages are fetched in the executor
+        opers = await hub.exec.azurerm.utils.run_in_executor(
+            lambda: [
+                oper.as_dict()
+                for oper in resconn.deployment_operations.list(
+                    resource_group_name=resource_group, deployment_name=name
+                )
+            ]
+        )
+
+        for oper in opers:
+            summary = _operation_summary(oper)
+            previous = operations.get(oper["operation_id"], {})
+            if previous.get("provisioning_state") != summary["provisioning_state"]:
+                log.info(
+                    "Deployment %s: %s %s is %s",
+                    name,
+                    summary["resource_type"],
+                    summary["resource_name"],
+                    summary["provisioning_state"],
+                )
+            operations[oper["operation_id"]] = summary
+
+        return deploy
+
+    try:
+        # The model built above is validated and then deployed as it is
+        validate = await _validate_model(
+            hub, resconn, name, resource_group, deploy_model
+        )
+        if "error" in validate:
+            return validate
+
+        start = loop.time()
+
+        # Only submit the deployment here, the progress is followed by polling below
+        await hub.exec.azurerm.utils.run_in_executor(
+            resconn.deployments.create_or_update,
+            deployment_name=name,
+            resource_group_name=resource_group,
+            properties=deploy_model,
+            polling=False,
+        )
+
+        try:
+            deploy = await hub.exec.azurerm.utils.poll_with_backoff(
+                _poll,
+                lambda deploy: deploy.properties.provisioning_state in TERMINAL_STATES,
+                interval=interval,
+                max_interval=max_interval,
+                timeout=timeout,
+            )
+            result = deploy.as_dict()
+
+            if fingerprint and deploy.properties.provisioning_state == "Succeeded":
+                _write_index(
+                    index_file,
+                    _index_key(resconn, name, resource_group),
+                    fingerprint,
+                    result,
+                )
+        except asyncio.TimeoutError:
+            result = {
+                "error": "The deployment {0} did not finish within {1} seconds.".format(
+                    name, timeout
+                )
+            }
+            if cancel_on_timeout:
+                log.warning("Cancelling deployment %s after %s seconds.", name, timeout)
+                await hub.exec.azurerm.utils.run_in_executor(
+                    resconn.deployments.cancel,
+                    deployment_name=name,
+                    resource_group_name=resource_group,
+                )
+                result["canceled"] = True
+
+        result["operations"] = operations
+        result["elapsed"] = round(loop.time() - start, 3)
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("resource", str(exc), **kwargs)
         result = {"error": str(exc)}
@@ -384,11 +996,15 @@ async def validate(
     parameters_link=None,
     deploy_template=None,
     template_link=None,
+    template_file=None,
+    parameters_file=None,
     **kwargs,
 ):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 4.1.0
+
     Validates whether the specified template is syntactically correct and will be accepted by Azure Resource Manager.
 
     :param name: The name of the deployment to validate.
@@ -422,6 +1038,12 @@ async def validate(
     :param template_link: The URI of the template. Use either the template_link property or the
         deploy_template property, but not both.
 
+    :param template_file: The path of a local template file. The parsed file is cached, so it is only read again
+        once it changes. This takes precedence over the deploy_template property.
+
+    :param parameters_file: The path of a local parameters file. The parsed file is cached, so it is only read again
+        once it changes. This takes precedence over the deploy_params property.
+
     CLI Example:
 
     .. code-block:: bash
@@ -432,31 +1054,26 @@ async def validate(
     result = {}
     resconn = await hub.exec.azurerm.utils.get_client(ctx, "resource", **kwargs)
 
-    prop_kwargs = {"mode": deploy_mode}
-    prop_kwargs["debug_setting"] = {"detail_level": debug_setting}
-
-    if deploy_params:
-        prop_kwargs["parameters"] = deploy_params
-    else:
-        if isinstance(parameters_link, dict):
-            prop_kwargs["parameters_link"] = parameters_link
-        else:
-            prop_kwargs["parameters_link"] = {"uri": parameters_link}
-
-    if deploy_template:
-        prop_kwargs["template"] = deploy_template
-    else:
-        if isinstance(template_link, dict):
-            prop_kwargs["template_link"] = template_link
-        else:
-            prop_kwargs["template_link"] = {"uri": template_link}
-
-    deploy_kwargs = kwargs.copy()
-    deploy_kwargs.update(prop_kwargs)
+    try:
+        deploy_template, deploy_params = await _load_files(
+            hub, deploy_template, deploy_params, template_file, parameters_file
+        )
+    except (IOError, OSError, ValueError) as exc:
+        result = {
+            "error": "The deployment files could not be loaded. ({0})".format(str(exc))
+        }
+        return result
 
     try:
-        deploy_model = await hub.exec.azurerm.utils.create_object_model(
-            "resource.resources", "DeploymentProperties", **deploy_kwargs
+        deploy_model = await _deployment_properties(
+            hub,
+            deploy_mode=deploy_mode,
+            debug_setting=debug_setting,
+            deploy_params=deploy_params,
+            parameters_link=parameters_link,
+            deploy_template=deploy_template,
+            template_link=template_link,
+            **kwargs,
         )
     except TypeError as exc:
         result = {
@@ -465,16 +1082,7 @@ async def validate(
         return result
 
     try:
-        local_validation = deploy_model.validate()
-        if local_validation:
-            raise local_validation[0]
-
-        deploy = resconn.deployments.validate(
-            deployment_name=name,
-            resource_group_name=resource_group,
-            properties=deploy_model,
-        )
-        result = deploy.as_dict()
+        result = await _validate_model(hub, resconn, name, resource_group, deploy_model)
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("resource", str(exc), **kwargs)
         result = {"error": str(exc)}
@@ -486,33 +1094,91 @@ async def validate(
     return result
 
 
-async def export_template(hub, ctx, name, resource_group, **kwargs):
+async def export_template(
+    hub,
+    ctx,
+    name,
+    resource_group,
+    output_file=None,
+    pretty=False,
+    split=False,
+    **kwargs,
+):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 4.1.0
+
     Exports the template used for the specified deployment.
 
+    When ``output_file`` is specified, the exported template is written to that file in chunks instead of being
+    returned, and a summary with the number of resources, the number of bytes written and the time spent exporting
+    and writing the template is returned instead.
+
     :param name: The name of the deployment to query.
 
     :param resource_group: The resource group name assigned to the deployment.
 
+    :param output_file: The path of the file to write the exported template to. When ``split`` is True, this is the
+        path of a directory instead.
+
+    :param pretty: Indent the JSON written to the output file. Defaults to False.
+
+    :param split: Write the resources of each resource type to a separate file in the ``output_file`` directory,
+        alongside a ``template.json`` file holding the rest of the template. The files of resource types written by an
+        earlier export which are no longer in the template are removed. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
 
         azurerm.resource.deployment.export_template testdeploy testgroup
 
+        azurerm.resource.deployment.export_template testdeploy testgroup output_file=/tmp/testdeploy split=True
+
     """
     result = {}
     resconn = await hub.exec.azurerm.utils.get_client(ctx, "resource", **kwargs)
+    loop = asyncio.get_event_loop()
+    start = loop.time()
+
     try:
-        deploy = resconn.deployments.export_template(
-            deployment_name=name, resource_group_name=resource_group
+        deploy = await hub.exec.azurerm.utils.run_in_executor(
+            resconn.deployments.export_template,
+            deployment_name=name,
+            resource_group_name=resource_group,
         )
-        result = deploy.as_dict()
+
+        if not output_file:
+            return deploy.as_dict()
+
+        exported = loop.time()
+        files = await hub.exec.azurerm.utils.run_in_executor(
+            _write_template, deploy.template or {}, output_file, pretty, split
+        )
+
+        result = {
+            "files": files,
+            "resources": len((deploy.template or {}).get("resources", [])),
+            "bytes": sum(files.values()),
+            "timings": {
+                "export": round(exported - start, 3),
+                "write": round(loop.time() - exported, 3),
+            },
+        }
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("resource", str(exc), **kwargs)
         result = {"error": str(exc)}
+    except (IOError, OSError) as exc:
+        result = {
+            "error": "The template could not be written to {0}. ({1})".format(
+                output_file, str(exc)
+            )
+        }
+    except (TypeError, ValueError) as exc:
+        result = {
+            "error": "The template could not be serialized. ({0})".format(str(exc))
+        }
 
     return result
 
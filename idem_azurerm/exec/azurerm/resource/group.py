@@ -4,6 +4,8 @@ Azure Resource Manager (ARM) Resource Group Execution Module
 
 .. versionadded:: 1.0.0
 
+.. versionchanged:: 4.1.0
+
 :maintainer: <devops@eitr.tech>
 :configuration: This module requires Azure Resource Manager credentials to be passed as keyword arguments
     to every function or via acct in order to work properly.
@@ -33,6 +35,8 @@ Azure Resource Manager (ARM) Resource Group Execution Module
 """
 # Python libs
 from __future__ import absolute_import
+import asyncio
+import datetime
 import logging
 
 # Azure libs
@@ -170,14 +174,19 @@ async def create_or_update(hub, ctx, name, location, **kwargs):
     return result
 
 
-async def delete(hub, ctx, name, **kwargs):
+async def delete(hub, ctx, name, no_wait=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 4.1.0
+
     Delete a resource group from the subscription.
 
     :param name: The resource group name to delete.
 
+    :param no_wait: Return as soon as the deletion has been accepted instead of waiting for it to finish. An operation
+        handle is returned, which can be passed to ``track_deletions`` to follow the deletion. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -188,11 +197,169 @@ async def delete(hub, ctx, name, **kwargs):
     result = False
     resconn = await hub.exec.azurerm.utils.get_client(ctx, "resource", **kwargs)
     try:
+        if no_wait:
+            await hub.exec.azurerm.utils.run_in_executor(
+                resconn.resource_groups.delete, resource_group_name=name, polling=False
+            )
+            return {
+                "name": name,
+                "subscription_id": resconn.config.subscription_id,
+                "status": "Deleting",
+                "started": datetime.datetime.utcnow().isoformat() + "Z",
+            }
+
         group = resconn.resource_groups.delete(resource_group_name=name)
 
         group.wait()
         result = True
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("resource", str(exc), **kwargs)
+        if no_wait:
+            result = {"name": name, "status": "Failed", "error": str(exc)}
+
+    return result
+
+
+async def delete_many(
+    hub,
+    ctx,
+    names,
+    wait=True,
+    timeout=None,
+    max_concurrency=8,
+    interval=10,
+    max_interval=60,
+    **kwargs,
+):
+    """
+    .. versionadded:: 4.1.0
+
+    Delete several resource groups from the subscription at once. All of the deletions are started without waiting
+    for any of them, and are then followed together by ``track_deletions``.
+
+    :param names: A list of the resource group names to delete.
+
+    :param wait: Wait for all of the deletions to finish. If False, the operation handles of the deletions are
+        returned as soon as they have been accepted. Defaults to True.
+
+    :param timeout: The maximum number of seconds to wait for the deletions to finish. Defaults to waiting
+        indefinitely.
+
+    :param max_concurrency: The maximum number of deletion requests to send at once. Defaults to 8.
+
+    :param interval: The initial number of seconds between polls of the deletions. Defaults to 10.
+
+    :param max_interval: The maximum number of seconds between polls of the deletions. Defaults to 60.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        azurerm.resource.group.delete_many '["testgroup1", "testgroup2"]' timeout=3600
+
+    """
+    handles = await hub.exec.azurerm.utils.gather_limited(
+        [
+            hub.exec.azurerm.resource.group.delete(ctx, name, no_wait=True, **kwargs)
+            for name in names
+        ],
+        max_concurrency=max_concurrency,
+    )
+
+    if not wait:
+        return {handle["name"]: handle for handle in handles}
+
+    return await hub.exec.azurerm.resource.group.track_deletions(
+        ctx,
+        handles,
+        timeout=timeout,
+        interval=interval,
+        max_interval=max_interval,
+        **kwargs,
+    )
+
+
+async def track_deletions(
+    hub, ctx, handles, timeout=None, interval=10, max_interval=60, **kwargs
+):
+    """
+    .. versionadded:: 4.1.0
+
+    Follow resource group deletions until all of them have finished. Every pending deletion is checked on each poll,
+    and the interval between polls grows until ``max_interval`` is reached. The outcome of each deletion is returned,
+    keyed by resource group name, with a status of "Deleted", "Failed", or "Deleting" if the timeout elapsed first.
+
+    :param handles: A list of operation handles returned by ``delete`` with ``no_wait`` or by ``delete_many``. Resource
+        group names are accepted as well.
+
+    :param timeout: The maximum number of seconds to wait for the deletions to finish. Defaults to waiting
+        indefinitely.
+
+    :param interval: The initial number of seconds between polls of the deletions. Defaults to 10.
+
+    :param max_interval: The maximum number of seconds between polls of the deletions. Defaults to 60.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        azurerm.resource.group.track_deletions '["testgroup1", "testgroup2"]'
+
+    """
+    resconn = await hub.exec.azurerm.utils.get_client(ctx, "resource", **kwargs)
+    loop = asyncio.get_event_loop()
+    start = loop.time()
+
+    result = {}
+    for handle in handles:
+        if not isinstance(handle, dict):
+            handle = {"name": handle, "status": "Deleting"}
+        result[handle["name"]] = dict(handle)
+
+    async def _check(name):
+        outcome = result[name]
+        try:
+            group = await hub.exec.azurerm.utils.run_in_executor(
+                resconn.resource_groups.get, resource_group_name=name
+            )
+            # A group which is no longer deleting has had its deletion fail
+            if group.properties.provisioning_state != "Deleting":
+                outcome["status"] = "Failed"
+                outcome["error"] = "The resource group is in the {0} state.".format(
+                    group.properties.provisioning_state
+                )
+        except CloudError as exc:
+            if getattr(exc, "status_code", None) == 404:
+                outcome["status"] = "Deleted"
+            else:
+                outcome["status"] = "Failed"
+                outcome["error"] = str(exc)
+
+        if outcome["status"] != "Deleting":
+            outcome["elapsed"] = round(loop.time() - start, 3)
+            log.info("Deletion of resource group %s: %s", name, outcome["status"])
+
+    def _pending():
+        return [name for name in result if result[name]["status"] == "Deleting"]
+
+    async def _poll():
+        await hub.exec.azurerm.utils.gather_limited(
+            [_check(name) for name in _pending()]
+        )
+        return _pending()
+
+    try:
+        await hub.exec.azurerm.utils.poll_with_backoff(
+            _poll,
+            lambda pending: not pending,
+            interval=interval,
+            max_interval=max_interval,
+            timeout=timeout,
+        )
+    except asyncio.TimeoutError:
+        for name in _pending():
+            result[name][
+                "error"
+            ] = "The deletion did not finish within {0} seconds.".format(timeout)
 
     return result
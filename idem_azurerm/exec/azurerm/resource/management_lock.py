@@ -4,6 +4,8 @@ Azure Resource Manager (ARM) Management Lock Execution Module
 
 .. versionadded:: 1.0.0
 
+.. versionchanged:: 4.1.0
+
 :maintainer: <devops@eitr.tech>
 :configuration: This module requires Azure Resource Manager credentials to be passed as keyword arguments
     to every function or via acct in order to work properly.
@@ -33,6 +35,7 @@ Azure Resource Manager (ARM) Management Lock Execution Module
 """
 # Python libs
 from __future__ import absolute_import
+import asyncio
 import logging
 
 # Azure libs
@@ -48,6 +51,124 @@ except ImportError:
 
 log = logging.getLogger(__name__)
 
+# The number of seconds a lock index is used for before it is built again
+LOCK_INDEX_MAX_AGE = 60
+
+LOCK_ID_SEPARATOR = "/providers/microsoft.authorization/locks/"
+
+
+def _normalize_scope(scope):
+    """
+    Normalize a scope so that it can be compared as a prefix of other scopes.
+
+    """
+    return "/" + "/".join(part for part in scope.lower().split("/") if part)
+
+
+def _lock_scope(lock_id):
+    """
+    Return the normalized scope of a lock from its ID.
+
+    """
+    lock_id = _normalize_scope(lock_id)
+    return lock_id[: lock_id.rfind(LOCK_ID_SEPARATOR)]
+
+
+def _in_subscription(lckconn, scope):
+    """
+    Return True if a scope is the subscription of the client or within it, so that its locks are in the lock index.
+
+    """
+    subscription = _normalize_scope(
+        "/subscriptions/{0}".format(lckconn.config.subscription_id)
+    )
+    scope = _normalize_scope(scope)
+    return scope == subscription or scope.startswith(subscription + "/")
+
+
+def _resource_scope(
+    subscription_id,
+    resource_group,
+    resource=None,
+    resource_type=None,
+    resource_provider_namespace=None,
+    parent_resource_path=None,
+):
+    """
+    Build the normalized scope of a subscription, resource group or resource.
+
+    """
+    parts = ["subscriptions", subscription_id]
+    if resource_group:
+        parts.extend(["resourcegroups", resource_group])
+    if resource:
+        parts.extend(
+            [
+                "providers",
+                resource_provider_namespace,
+                parent_resource_path or "",
+                resource_type,
+                resource,
+            ]
+        )
+
+    return _normalize_scope("/".join(parts))
+
+
+def _invalidate_index(hub, lckconn):
+    hub.exec.azurerm.LOCK_INDEX.pop(lckconn.config.subscription_id.lower(), None)
+
+
+async def _get_index(hub, lckconn, refresh=False):
+    """
+    Return the lock index of the subscription of the client, building it from a single listing of every lock in the
+    subscription if it is missing or stale. The index maps each normalized scope to the locks at that scope, keyed by
+    lower case lock name.
+
+    """
+    loop = asyncio.get_event_loop()
+    subscription_id = lckconn.config.subscription_id.lower()
+    index = hub.exec.azurerm.LOCK_INDEX.get(subscription_id)
+
+    if refresh or not index or loop.time() - index["built"] > LOCK_INDEX_MAX_AGE:
+        locks = await hub.exec.azurerm.utils.run_in_executor(
+            lambda: [
+                lock.as_dict()
+                for lock in lckconn.management_locks.list_at_subscription_level()
+            ]
+        )
+
+        scopes = {}
+        for lock in locks:
+            scopes.setdefault(_lock_scope(lock["id"]), {})[lock["name"].lower()] = lock
+
+        index = {"built": loop.time(), "scopes": scopes}
+        hub.exec.azurerm.LOCK_INDEX[subscription_id] = index
+
+    return index["scopes"]
+
+
+async def _get_indexed(hub, lckconn, name, scope, **kwargs):
+    """
+    Get a management lock at a scope from the lock index. The result has the same form as the get functions.
+
+    """
+    try:
+        scopes = await _get_index(hub, lckconn)
+    except CloudError as exc:
+        await hub.exec.azurerm.utils.log_cloud_error("resource", str(exc), **kwargs)
+        return {"error": str(exc)}
+
+    lock = scopes.get(_normalize_scope(scope), {}).get(name.lower())
+    if not lock:
+        return {
+            "error": "The management lock {0} was not found at the scope {1}.".format(
+                name, scope
+            )
+        }
+
+    return lock
+
 
 async def create_or_update_at_resource_group_level(
     hub, ctx, name, resource_group, lock_level, notes=None, owners=None, **kwargs
@@ -109,6 +230,7 @@ async def create_or_update_at_resource_group_level(
             resource_group_name=resource_group, lock_name=name, parameters=lockmodel
         )
 
+        _invalidate_index(hub, lckconn)
         result = lock.as_dict()
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("resource", str(exc), **kwargs)
@@ -147,6 +269,7 @@ async def delete_at_resource_group_level(hub, ctx, name, resource_group, **kwarg
             resource_group_name=resource_group, lock_name=name, **kwargs
         )
 
+        _invalidate_index(hub, lckconn)
         result = True
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("resource", str(exc), **kwargs)
@@ -155,16 +278,23 @@ async def delete_at_resource_group_level(hub, ctx, name, resource_group, **kwarg
     return result
 
 
-async def get_at_resource_group_level(hub, ctx, name, resource_group, **kwargs):
+async def get_at_resource_group_level(
+    hub, ctx, name, resource_group, use_index=False, **kwargs
+):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 4.1.0
+
     Gets a management lock at the resource group level.
 
     :param name: The name of the lock to get.
 
     :param resource_group: The name of the resource group.
 
+    :param use_index: Look up the lock in an index of every lock in the subscription, which is built from a single
+        listing and reused for up to a minute, instead of requesting it. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -175,6 +305,15 @@ async def get_at_resource_group_level(hub, ctx, name, resource_group, **kwargs):
     result = {}
     lckconn = await hub.exec.azurerm.utils.get_client(ctx, "managementlock", **kwargs)
 
+    if use_index:
+        return await _get_indexed(
+            hub,
+            lckconn,
+            name,
+            _resource_scope(lckconn.config.subscription_id, resource_group),
+            **kwargs,
+        )
+
     try:
         lock = lckconn.management_locks.get_at_resource_group_level(
             resource_group_name=resource_group, lock_name=name, **kwargs
@@ -252,6 +391,7 @@ async def create_or_update_by_scope(
             scope=scope, lock_name=name, parameters=lockmodel
         )
 
+        _invalidate_index(hub, lckconn)
         result = lock.as_dict()
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("resource", str(exc), **kwargs)
@@ -294,6 +434,7 @@ async def delete_by_scope(hub, ctx, name, scope, **kwargs):
             scope=scope, lock_name=name, **kwargs
         )
 
+        _invalidate_index(hub, lckconn)
         result = True
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("resource", str(exc), **kwargs)
@@ -302,10 +443,12 @@ async def delete_by_scope(hub, ctx, name, scope, **kwargs):
     return result
 
 
-async def get_by_scope(hub, ctx, name, scope, **kwargs):
+async def get_by_scope(hub, ctx, name, scope, use_index=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 4.1.0
+
     Get a management lock by scope.
 
     :param name: The name of the lock to get.
@@ -316,6 +459,10 @@ async def get_by_scope(hub, ctx, name, scope, **kwargs):
         '/subscriptions/{subscriptionId}/resourcegroups/{resourceGroupName}/providers/{resourceProviderNamespace}/{parentResourcePathIfPresent}/{resourceType}/{resourceName}'
         for resources.
 
+    :param use_index: Look up the lock in an index of every lock in the subscription, which is built from a single
+        listing and reused for up to a minute, instead of requesting it. Scopes outside of the subscription of the
+        connection, such as management groups or other subscriptions, are always requested. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -326,6 +473,9 @@ async def get_by_scope(hub, ctx, name, scope, **kwargs):
     result = {}
     lckconn = await hub.exec.azurerm.utils.get_client(ctx, "managementlock", **kwargs)
 
+    if use_index and _in_subscription(lckconn, scope):
+        return await _get_indexed(hub, lckconn, name, scope, **kwargs)
+
     try:
         lock = lckconn.management_locks.get_by_scope(
             scope=scope, lock_name=name, **kwargs
@@ -428,6 +578,7 @@ async def create_or_update_at_resource_level(
             parameters=lockmodel,
         )
 
+        _invalidate_index(hub, lckconn)
         result = lock.as_dict()
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("resource", str(exc), **kwargs)
@@ -495,6 +646,7 @@ async def delete_at_resource_level(
             **kwargs,
         )
 
+        _invalidate_index(hub, lckconn)
         result = True
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("resource", str(exc), **kwargs)
@@ -512,11 +664,14 @@ async def get_at_resource_level(
     resource_type,
     resource_provider_namespace,
     parent_resource_path=None,
+    use_index=False,
     **kwargs,
 ):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 4.1.0
+
     Get the management lock of a resource or any level below resource.
 
     :param name: The name of the lock.
@@ -531,6 +686,9 @@ async def get_at_resource_level(
 
     :param parent_resource_path: The parent resource identity.
 
+    :param use_index: Look up the lock in an index of every lock in the subscription, which is built from a single
+        listing and reused for up to a minute, instead of requesting it. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -542,6 +700,22 @@ async def get_at_resource_level(
     result = {}
     lckconn = await hub.exec.azurerm.utils.get_client(ctx, "managementlock", **kwargs)
 
+    if use_index:
+        return await _get_indexed(
+            hub,
+            lckconn,
+            name,
+            _resource_scope(
+                lckconn.config.subscription_id,
+                resource_group,
+                resource,
+                resource_type,
+                resource_provider_namespace,
+                parent_resource_path,
+            ),
+            **kwargs,
+        )
+
     if parent_resource_path is None:
         parent_resource_path = ""
 
@@ -622,6 +796,7 @@ async def create_or_update_at_subscription_level(
             lock_name=name, parameters=lockmodel
         )
 
+        _invalidate_index(hub, lckconn)
         result = lock.as_dict()
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("resource", str(exc), **kwargs)
@@ -658,6 +833,7 @@ async def delete_at_subscription_level(hub, ctx, name, **kwargs):
             lock_name=name, **kwargs
         )
 
+        _invalidate_index(hub, lckconn)
         result = True
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("resource", str(exc), **kwargs)
@@ -666,14 +842,19 @@ async def delete_at_subscription_level(hub, ctx, name, **kwargs):
     return result
 
 
-async def get_at_subscription_level(hub, ctx, name, **kwargs):
+async def get_at_subscription_level(hub, ctx, name, use_index=False, **kwargs):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 4.1.0
+
     Gets a management lock at the subscription level.
 
     :param name: The name of the lock to get.
 
+    :param use_index: Look up the lock in an index of every lock in the subscription, which is built from a single
+        listing and reused for up to a minute, instead of requesting it. Defaults to False.
+
     CLI Example:
 
     .. code-block:: bash
@@ -684,6 +865,15 @@ async def get_at_subscription_level(hub, ctx, name, **kwargs):
     result = {}
     lckconn = await hub.exec.azurerm.utils.get_client(ctx, "managementlock", **kwargs)
 
+    if use_index:
+        return await _get_indexed(
+            hub,
+            lckconn,
+            name,
+            _resource_scope(lckconn.config.subscription_id, None),
+            **kwargs,
+        )
+
     try:
         lock = lckconn.management_locks.get_at_subscription_level(
             lock_name=name, **kwargs
@@ -850,3 +1040,53 @@ async def list_by_scope(hub, ctx, scope, **kwargs):
         result = {"error": str(exc)}
 
     return result
+
+
+async def list_effective(hub, ctx, scope, refresh=False, **kwargs):
+    """
+    .. versionadded:: 4.1.0
+
+    List the management locks which apply to a scope, including the locks inherited from its resource group,
+    subscription and any parent resources. The locks are looked up locally in an index of every lock in the
+    subscription, which is built from a single listing and reused for up to a minute. The scope must be within the
+    subscription of the connection.
+
+    :param scope: The scope to check. Use '/subscriptions/{subscriptionId}' for subscriptions,
+        '/subscriptions/{subscriptionId}/resourcegroups/{resourceGroupName}' for resource groups, and
+        '/subscriptions/{subscriptionId}/resourcegroups/{resourceGroupName}/providers/{resourceProviderNamespace}/{parentResourcePathIfPresent}/{resourceType}/{resourceName}'
+        for resources.
+
+    :param refresh: Build the lock index again, even if it is not stale. Defaults to False.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        azurerm.resource.management_lock.list_effective /subscriptions/xxx/resourcegroups/test_group
+
+    """
+    result = {}
+    lckconn = await hub.exec.azurerm.utils.get_client(ctx, "managementlock", **kwargs)
+
+    if not _in_subscription(lckconn, scope):
+        result = {
+            "error": "The scope {0} is not within the subscription {1}.".format(
+                scope, lckconn.config.subscription_id
+            )
+        }
+        return result
+
+    try:
+        scopes = await _get_index(hub, lckconn, refresh=refresh)
+    except CloudError as exc:
+        await hub.exec.azurerm.utils.log_cloud_error("resource", str(exc), **kwargs)
+        result = {"error": str(exc)}
+        return result
+
+    # Every ancestor of a scope is one of its path prefixes
+    parts = _normalize_scope(scope).split("/")
+    for idx in range(2, len(parts) + 1):
+        for lock in scopes.get("/".join(parts[:idx]), {}).values():
+            result[lock["id"]] = lock
+
+    return result
@@ -4,7 +4,7 @@ Azure Resource Manager (ARM) Resource Policy Execution Module
 
 .. versionadded:: 1.0.0
 
-.. versionchanged:: 2.3.2, 4.0.0
+.. versionchanged:: 2.3.2, 4.0.0, 4.1.0
 
 :maintainer: <devops@eitr.tech>
 :configuration: This module requires Azure Resource Manager credentials to be passed as keyword arguments
@@ -37,7 +37,11 @@ Azure Resource Manager (ARM) Resource Policy Execution Module
 from __future__ import absolute_import
 from json import loads, dumps
 from uuid import UUID
+import hashlib
+import json
 import logging
+import os
+import time
 
 # Azure libs
 HAS_LIBS = False
@@ -53,6 +57,99 @@ except ImportError:
 
 log = logging.getLogger(__name__)
 
+# The number of seconds the built-in policy definitions are cached for
+BUILTIN_CACHE_TTL = 86400
+
+
+def _builtin_cache_file(polconn, cache_dir=None):
+    """
+    Return the path of the on-disk cache of built-in policy definitions. Built-in definitions differ between clouds
+    and API versions, so both are part of the file name.
+
+    """
+    if not cache_dir:
+        cache_dir = os.path.join(os.path.expanduser("~"), ".cache", "idem-azurerm")
+
+    key = "{0}|{1}".format(
+        polconn.config.base_url, polconn.policy_definitions.api_version
+    )
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+
+    return os.path.join(cache_dir, "policy-builtin-{0}.json".format(digest))
+
+
+def _read_builtin_cache(cache_file, cache_ttl):
+    """
+    Return the cached built-in policy definitions, or None if the cache is missing or older than the TTL.
+
+    """
+    try:
+        if time.time() - os.path.getmtime(cache_file) > cache_ttl:
+            return None
+        with open(cache_file, "r") as fhr:
+            return json.load(fhr)
+    except (IOError, OSError, ValueError):
+        return None
+
+
+def _write_builtin_cache(cache_file, definitions):
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        tmp_file = "{0}.{1}.tmp".format(cache_file, os.getpid())
+        with open(tmp_file, "w") as fhw:
+            json.dump(definitions, fhw)
+        os.replace(tmp_file, cache_file)
+    except (IOError, OSError) as exc:
+        log.warning(
+            "Unable to write the built-in policy definition cache %s: %s",
+            cache_file,
+            exc,
+        )
+
+
+async def _get_builtin_definitions(
+    hub, polconn, cache_dir=None, cache_ttl=BUILTIN_CACHE_TTL
+):
+    """
+    Return the built-in policy definitions keyed by name, from memory or the on-disk cache if they are fresh enough.
+    Otherwise, None is returned.
+
+    """
+    cache_file = _builtin_cache_file(polconn, cache_dir)
+
+    cached = hub.exec.azurerm.POLICY_BUILTINS.get(cache_file)
+    if cached and time.time() - cached["loaded"] <= cache_ttl:
+        return cached["definitions"]
+
+    definitions = await hub.exec.azurerm.utils.run_in_executor(
+        _read_builtin_cache, cache_file, cache_ttl
+    )
+
+    if definitions is not None:
+        hub.exec.azurerm.POLICY_BUILTINS[cache_file] = {
+            "loaded": time.time(),
+            "definitions": definitions,
+        }
+
+    return definitions
+
+
+async def _set_builtin_definitions(hub, polconn, definitions, cache_dir=None):
+    """
+    Store the built-in policy definitions, keyed by name, in memory and in the on-disk cache.
+
+    """
+    cache_file = _builtin_cache_file(polconn, cache_dir)
+
+    hub.exec.azurerm.POLICY_BUILTINS[cache_file] = {
+        "loaded": time.time(),
+        "definitions": definitions,
+    }
+
+    await hub.exec.azurerm.utils.run_in_executor(
+        _write_builtin_cache, cache_file, definitions
+    )
+
 
 async def assignment_delete(hub, ctx, name, scope, **kwargs):
     """
@@ -85,11 +182,13 @@ async def assignment_delete(hub, ctx, name, scope, **kwargs):
     return result
 
 
-async def assignment_create(hub, ctx, name, scope, definition_name, **kwargs):
+async def assignment_create(
+    hub, ctx, name, scope, definition_name, definition_id=None, **kwargs
+):
     """
     .. versionadded:: 1.0.0
 
-    .. versionchanged:: 2.3.2
+    .. versionchanged:: 2.3.2, 4.1.0
 
     Create a policy assignment.
 
@@ -99,6 +198,9 @@ async def assignment_create(hub, ctx, name, scope, definition_name, **kwargs):
 
     :param definition_name: The name of the policy definition to assign.
 
+    :param definition_id: The ID of the policy definition to assign. If specified, the policy definition is not looked
+        up by name.
+
     CLI Example:
 
     .. code-block:: bash
@@ -110,9 +212,12 @@ async def assignment_create(hub, ctx, name, scope, definition_name, **kwargs):
     result = {}
     polconn = await hub.exec.azurerm.utils.get_client(ctx, "policy", **kwargs)
 
-    definition = await hub.exec.azurerm.resource.policy.definition_get(
-        ctx=ctx, name=definition_name, **kwargs
-    )
+    if definition_id:
+        definition = {"id": definition_id}
+    else:
+        definition = await hub.exec.azurerm.resource.policy.definition_get(
+            ctx=ctx, name=definition_name, **kwargs
+        )
 
     if "error" not in definition:
         definition_id = str(definition["id"])
@@ -316,18 +421,34 @@ async def definition_delete(hub, ctx, name, **kwargs):
     return result
 
 
-async def definition_get(hub, ctx, name, policy_type=None, **kwargs):
+async def definition_get(
+    hub,
+    ctx,
+    name,
+    policy_type=None,
+    cache_dir=None,
+    cache_ttl=BUILTIN_CACHE_TTL,
+    **kwargs,
+):
     """
     .. versionadded:: 1.0.0
 
-    .. versionchanged:: 2.3.2
+    .. versionchanged:: 2.3.2, 4.1.0
 
     Get details about a specific policy definition.
 
+    Built-in policy definitions are looked up in the on-disk cache of built-in definitions when it is fresh, and are
+    only requested otherwise.
+
     :param name: The name of the policy definition to query.
 
     :param policy_type: Set to "BuiltIn" to get a built-in policy definition.
 
+    :param cache_dir: The directory holding the cache of built-in policy definitions. Defaults to
+        ``~/.cache/idem-azurerm``.
+
+    :param cache_ttl: The number of seconds the cache of built-in policy definitions is used for. Defaults to 86400.
+
     CLI Example:
 
     .. code-block:: bash
@@ -347,6 +468,12 @@ async def definition_get(hub, ctx, name, policy_type=None, **kwargs):
 
     try:
         if policy_type and policy_type.lower() == "builtin":
+            builtins = await _get_builtin_definitions(
+                hub, polconn, cache_dir, cache_ttl
+            )
+            if builtins and name in builtins:
+                return builtins[name]
+
             policy_def = polconn.policy_definitions.get_built_in(
                 policy_definition_name=name
             )
@@ -363,14 +490,22 @@ async def definition_get(hub, ctx, name, policy_type=None, **kwargs):
     return result
 
 
-async def definitions_list(hub, ctx, hide_builtin=False, **kwargs):
+async def definitions_list(hub, ctx, hide_builtin=False, cache_dir=None, **kwargs):
     """
     .. versionadded:: 1.0.0
 
+    .. versionchanged:: 4.1.0
+
     List all policy definitions for a subscription.
 
+    The built-in policy definitions returned by the listing are stored in the on-disk cache used by
+    ``definition_get``.
+
     :param hide_builtin: Boolean which will filter out BuiltIn policy definitions from the result.
 
+    :param cache_dir: The directory holding the cache of built-in policy definitions. Defaults to
+        ``~/.cache/idem-azurerm``.
+
     CLI Example:
 
     .. code-block:: bash
@@ -385,9 +520,15 @@ async def definitions_list(hub, ctx, hide_builtin=False, **kwargs):
             polconn.policy_definitions.list()
         )
 
+        builtins = {}
         for policy in policy_defs:
-            if not (hide_builtin and policy["policy_type"] == "BuiltIn"):
-                result[policy["name"]] = policy
+            if policy["policy_type"] == "BuiltIn":
+                builtins[policy["name"]] = policy
+                if hide_builtin:
+                    continue
+            result[policy["name"]] = policy
+
+        await _set_builtin_definitions(hub, polconn, builtins, cache_dir)
     except (CloudError, ErrorResponseException) as exc:
         await hub.exec.azurerm.utils.log_cloud_error("resource", str(exc), **kwargs)
         result = {"error": str(exc)}
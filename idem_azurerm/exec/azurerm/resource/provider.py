@@ -4,7 +4,7 @@ Azure Resource Manager (ARM) Resource Provider Execution Module
 
 .. versionadded:: 1.0.0
 
-.. versionchanged:: 4.0.0
+.. versionchanged:: 4.0.0, 4.1.0
 
 :maintainer: <devops@eitr.tech>
 :configuration: This module requires Azure Resource Manager credentials to be passed as keyword arguments
@@ -35,7 +35,9 @@ Azure Resource Manager (ARM) Resource Provider Execution Module
 """
 # Python libs
 from __future__ import absolute_import
+import asyncio
 import logging
+import time
 
 # Azure libs
 HAS_LIBS = False
@@ -52,11 +54,16 @@ __func_alias__ = {"list_": "list"}
 
 log = logging.getLogger(__name__)
 
+# Number of seconds a snapshot of the registration states of the providers of a subscription is reused
+SNAPSHOT_MAX_AGE = 300
 
-async def get(hub, ctx, name, resource_group, **kwargs):
+
+async def get(hub, ctx, name, resource_group=None, **kwargs):
     """
     .. versionadded:: 4.0.0
 
+    .. versionchanged:: 4.1.0
+
     Gets the specified resource provider.
 
     :param name: The namespace of the resource provider.
@@ -74,7 +81,7 @@ async def get(hub, ctx, name, resource_group, **kwargs):
     try:
         provider = resconn.providers.get(resource_provider_namespace=name)
 
-        result = ret.as_dict()
+        result = provider.as_dict()
     except CloudError as exc:
         await hub.exec.azurerm.utils.log_cloud_error("resource", str(exc), **kwargs)
         result = {"error": str(exc)}
@@ -118,3 +125,201 @@ async def list_(hub, ctx, top=None, expand=None, **kwargs):
         result = {"error": str(exc)}
 
     return result
+
+
+async def _get_snapshot(hub, ctx, refresh=False, **kwargs):
+    """
+    Return the registration states of the resource providers of the subscription, keyed by lowercase namespace. The
+    snapshot is taken with a single listing of the providers and is reused for ``SNAPSHOT_MAX_AGE`` seconds.
+    """
+    resconn = await hub.exec.azurerm.utils.get_client(ctx, "resource", **kwargs)
+    subscription_id = resconn.config.subscription_id
+
+    cached = hub.exec.azurerm.PROVIDER_STATES.get(subscription_id)
+    if not refresh and cached and time.time() - cached["taken"] <= SNAPSHOT_MAX_AGE:
+        return cached["states"]
+
+    # The resource type aliases are not needed for the registration states, so the providers are listed unexpanded
+    providers = await hub.exec.azurerm.utils.paged_object_to_list(
+        resconn.providers.list()
+    )
+
+    states = {}
+    for provider in providers:
+        states[provider["namespace"].lower()] = {
+            "namespace": provider["namespace"],
+            "registration_state": provider.get("registration_state"),
+        }
+
+    hub.exec.azurerm.PROVIDER_STATES[subscription_id] = {
+        "taken": time.time(),
+        "states": states,
+    }
+
+    return states
+
+
+async def registration_states(hub, ctx, namespaces=None, refresh=False, **kwargs):
+    """
+    .. versionadded:: 4.1.0
+
+    Get the registration states of resource providers from a cached snapshot of the providers of the subscription.
+    The snapshot is taken again once it is older than five minutes.
+
+    :param namespaces: A list of the namespaces of the resource providers to return. Defaults to all providers.
+        Namespaces unknown to the subscription are returned with a state of None.
+
+    :param refresh: Take a new snapshot instead of using the cached one. Defaults to False.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        azurerm.resource.provider.registration_states '["Microsoft.Compute", "Microsoft.Network"]'
+
+    """
+    try:
+        states = await _get_snapshot(hub, ctx, refresh=refresh, **kwargs)
+    except CloudError as exc:
+        await hub.exec.azurerm.utils.log_cloud_error("resource", str(exc), **kwargs)
+        return {"error": str(exc)}
+
+    if namespaces is None:
+        return {
+            state["namespace"]: state["registration_state"] for state in states.values()
+        }
+
+    result = {}
+    for namespace in namespaces:
+        result[namespace] = states.get(namespace.lower(), {}).get("registration_state")
+
+    return result
+
+
+async def register_many(
+    hub,
+    ctx,
+    namespaces,
+    wait=True,
+    timeout=None,
+    max_concurrency=8,
+    interval=5,
+    max_interval=60,
+    refresh=False,
+    **kwargs,
+):
+    """
+    .. versionadded:: 4.1.0
+
+    Register several resource providers with the subscription at once. Providers which are already registered
+    according to the cached snapshot of ``registration_states`` are skipped. The remaining registrations are
+    requested concurrently, and are then followed together in a single polling loop until every provider is
+    "Registered". The outcome of each provider is returned, keyed by namespace, with a status of "Registered",
+    "Skipped", "Failed", or "Registering" if the registration has not finished.
+
+    :param namespaces: A list of the namespaces of the resource providers to register.
+
+    :param wait: Wait for all of the providers to be registered. If False, the registrations are only requested.
+        Defaults to True.
+
+    :param timeout: The maximum number of seconds to wait for the registrations to finish. Defaults to waiting
+        indefinitely.
+
+    :param max_concurrency: The maximum number of registration requests to send at once. Defaults to 8.
+
+    :param interval: The initial number of seconds between polls of the registrations. Defaults to 5.
+
+    :param max_interval: The maximum number of seconds between polls of the registrations. Defaults to 60.
+
+    :param refresh: Take a new snapshot of the registration states instead of using the cached one. Defaults to
+        False.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        azurerm.resource.provider.register_many '["Microsoft.Compute", "Microsoft.Network"]' timeout=900
+
+    """
+    resconn = await hub.exec.azurerm.utils.get_client(ctx, "resource", **kwargs)
+    loop = asyncio.get_event_loop()
+    start = loop.time()
+
+    try:
+        states = await _get_snapshot(hub, ctx, refresh=refresh, **kwargs)
+    except CloudError as exc:
+        await hub.exec.azurerm.utils.log_cloud_error("resource", str(exc), **kwargs)
+        return {"error": str(exc)}
+
+    result = {}
+    for namespace in namespaces:
+        if namespace in result:
+            continue
+        state = states.get(namespace.lower(), {}).get("registration_state")
+        if state == "Registered":
+            result[namespace] = {"status": "Skipped", "registration_state": state}
+        else:
+            result[namespace] = {"status": "Registering", "registration_state": state}
+
+    async def _register(namespace):
+        outcome = result[namespace]
+        try:
+            provider = await hub.exec.azurerm.utils.run_in_executor(
+                resconn.providers.register, resource_provider_namespace=namespace
+            )
+            outcome["registration_state"] = provider.registration_state
+            if provider.registration_state == "Registered":
+                outcome["status"] = "Registered"
+        except CloudError as exc:
+            await hub.exec.azurerm.utils.log_cloud_error("resource", str(exc), **kwargs)
+            outcome["status"] = "Failed"
+            outcome["error"] = str(exc)
+
+    def _pending():
+        return [ns for ns in result if result[ns]["status"] == "Registering"]
+
+    await hub.exec.azurerm.utils.gather_limited(
+        [_register(namespace) for namespace in _pending()],
+        max_concurrency=max_concurrency,
+    )
+
+    # The snapshot no longer reflects the providers which were just registered
+    hub.exec.azurerm.PROVIDER_STATES.pop(resconn.config.subscription_id, None)
+
+    if not wait or not _pending():
+        return result
+
+    async def _poll():
+        # A single listing returns the state of every pending provider, and refreshes the snapshot along the way
+        current = await _get_snapshot(hub, ctx, refresh=True, **kwargs)
+        for namespace in _pending():
+            outcome = result[namespace]
+            outcome["registration_state"] = current.get(namespace.lower(), {}).get(
+                "registration_state"
+            )
+            if outcome["registration_state"] == "Registered":
+                outcome["status"] = "Registered"
+                outcome["elapsed"] = round(loop.time() - start, 3)
+                log.info("Resource provider %s has been registered.", namespace)
+        return _pending()
+
+    try:
+        await hub.exec.azurerm.utils.poll_with_backoff(
+            _poll,
+            lambda pending: not pending,
+            interval=interval,
+            max_interval=max_interval,
+            timeout=timeout,
+        )
+    except asyncio.TimeoutError:
+        for namespace in _pending():
+            result[namespace][
+                "error"
+            ] = "The registration did not finish within {0} seconds.".format(timeout)
+    except CloudError as exc:
+        await hub.exec.azurerm.utils.log_cloud_error("resource", str(exc), **kwargs)
+        for namespace in _pending():
+            result[namespace]["status"] = "Failed"
+            result[namespace]["error"] = str(exc)
+
+    return result
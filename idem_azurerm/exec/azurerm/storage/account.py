@@ -4,7 +4,7 @@ Azure Resource Manager (ARM) Storage Account Operations Execution Module
 
 .. versionadded:: 2.0.0
 
-.. versionchanged:: 4.0.0
+.. versionchanged:: 4.0.0, 4.1.0
 
 :maintainer: <devops@eitr.tech>
 :configuration: This module requires Azure Resource Manager credentials to be passed as keyword arguments
@@ -315,24 +315,45 @@ async def get_properties(hub, ctx, name, resource_group, **kwargs):
     return result
 
 
-async def list_(hub, ctx, resource_group=None, **kwargs):
+async def list_(
+    hub, ctx, resource_group=None, subscriptions=None, max_concurrency=8, **kwargs
+):
     """
     .. versionadded:: 2.0.0
 
-    .. versionchanged:: 4.0.0
+    .. versionchanged:: 4.0.0, 4.1.0
 
     Lists all the storage accounts available under the subscription. Note that storage keys are not returned; use the
     ListKeys operation for this.
 
     :param resource_group: The name of the resource group to limit the results.
 
+    :param subscriptions: A list of subscription IDs to query concurrently, or "all" to query every enabled
+        subscription visible to the provided credentials. When specified, the results from all subscriptions are
+        merged and keyed by resource ID instead of by name.
+
+    :param max_concurrency: The maximum number of subscriptions to query at once when ``subscriptions`` is specified.
+        Defaults to 8.
+
     CLI Example:
 
     .. code-block:: bash
 
         azurerm.storage.account.list
 
+        azurerm.storage.account.list subscriptions=all
+
     """
+    if subscriptions:
+        return await hub.exec.azurerm.utils.fan_out(
+            ctx,
+            hub.exec.azurerm.storage.account.list,
+            subscriptions,
+            max_concurrency=max_concurrency,
+            resource_group=resource_group,
+            **kwargs,
+        )
+
     result = {}
     storconn = await hub.exec.azurerm.utils.get_client(ctx, "storage", **kwargs)
 
@@ -474,11 +495,14 @@ async def list_service_sas(
     canonicalized_resource,
     permissions,
     shared_access_expiry_time,
+    resource=None,
     **kwargs,
 ):
     """
     .. versionadded:: 2.0.0
 
+    .. versionchanged:: 4.1.0
+
     List service SAS credentials of a specific resource.
 
     :param name: The name of the storage account.
@@ -494,6 +518,9 @@ async def list_service_sas(
     :param shared_access_expiry_time: The time at which the shared access signature becomes invalid. This parameter
         must be a string representation of a Datetime object in ISO-8601 format.
 
+    :param resource: The signed services accessible with the service SAS. Possible values include: Blob (b),
+        Container (c), File (f) and Share (s).
+
     CLI Example:
 
     .. code-block:: bash
@@ -511,6 +538,7 @@ async def list_service_sas(
             permissions=permissions,
             canonicalized_resource=canonicalized_resource,
             shared_access_expiry_time=shared_access_expiry_time,
+            resource=resource,
             **kwargs,
         )
     except TypeError as exc:
@@ -4,7 +4,7 @@ Azure Resource Manager (ARM) Blob Container Operations Execution Module
 
 .. versionadded:: 2.0.0
 
-.. versionchanged:: 3.0.0, 4.0.0
+.. versionchanged:: 3.0.0, 4.0.0, 4.1.0
 
 :maintainer: <devops@eitr.tech>
 :configuration: This module requires Azure Resource Manager credentials to be passed as keyword arguments
@@ -35,15 +35,24 @@ Azure Resource Manager (ARM) Blob Container Operations Execution Module
 """
 # Python libs
 from __future__ import absolute_import
+import asyncio
 import logging
 import datetime
+import functools
+import itertools
 import sys
+from urllib.parse import quote
 
 # Azure libs
 HAS_LIBS = False
 try:
     import azure.mgmt.storage  # pylint: disable=unused-import
-    from azure.storage.blob import BlobClient, BlobServiceClient, ContainerClient
+    from azure.storage.blob import (
+        BlobClient,
+        BlobProperties,
+        BlobServiceClient,
+        ContainerClient,
+    )
     from msrestazure.azure_exceptions import CloudError
     from msrest.exceptions import SerializationError
     from azure.core.exceptions import HttpResponseError, ResourceExistsError
@@ -56,6 +65,12 @@ __func_alias__ = {"list_": "list"}
 
 log = logging.getLogger(__name__)
 
+# The Blob Batch API accepts at most 256 sub-requests per batch request
+BATCH_SIZE = 256
+
+# Access tiers ordered from hottest to coldest
+BLOB_TIERS = ["Hot", "Cool", "Archive"]
+
 
 def _blob_properties_as_dict(blob_properties):
     result = {}
@@ -93,6 +108,193 @@ def _blob_properties_as_dict(blob_properties):
     return result
 
 
+def _select_blobs(containerconn, prefix=None, older_than_days=None, skip_tiers=None):
+    """
+    Lazily yield the names of blobs in a container which match the given filters. The container listing is consumed
+    page by page, so the full listing is never held in memory.
+    """
+    cutoff = None
+    if older_than_days is not None:
+        cutoff = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(
+            days=float(older_than_days)
+        )
+
+    for blob in containerconn.list_blobs(name_starts_with=prefix):
+        if cutoff and blob.last_modified and blob.last_modified > cutoff:
+            continue
+        if skip_tiers and blob.blob_tier in skip_tiers:
+            continue
+        yield blob.name
+
+
+def _batch_response_as_dict(response):
+    """
+    Helper function to turn a sub-response of a blob batch request into a dictionary.
+    """
+    result = {"status_code": response.status_code}
+    if response.status_code >= 300:
+        result["error"] = response.headers.get("x-ms-error-code") or response.reason
+    return result
+
+
+def _copy_properties_as_dict(copy_properties):
+    """
+    Helper function to turn the CopyProperties of a blob into a dictionary.
+    """
+    result = {}
+    props = ["id", "status", "status_description", "progress", "completion_time"]
+    for prop in props:
+        val = getattr(copy_properties, prop, None)
+        if isinstance(val, datetime.datetime):
+            val = val.isoformat()
+        result[prop] = val
+    return result
+
+
+def _age_bucket_labels(age_buckets):
+    """
+    Build the labels of the last-modified age buckets used by the usage summary.
+    """
+    labels = []
+    lower = 0
+    for upper in age_buckets:
+        labels.append(f"{lower:g}-{upper:g}d")
+        lower = upper
+    labels.append(f"{lower:g}d+")
+    return labels
+
+
+def _new_usage_summary(labels):
+    """
+    Create an empty set of running counters for a blob usage summary, with one age counter per bucket label.
+    """
+    return {
+        "total": {"count": 0, "bytes": 0},
+        "by_prefix": {},
+        "by_tier": {},
+        "by_age": {label: {"count": 0, "bytes": 0} for label in labels},
+    }
+
+
+def _add_usage(counters, key, size):
+    """
+    Increment the count and byte counters stored under a key.
+    """
+    usage = counters.setdefault(key, {"count": 0, "bytes": 0})
+    usage["count"] += 1
+    usage["bytes"] += size
+
+
+def _aggregate_blob(summary, blob, prefix_depth, delimiter, age_buckets, labels, now):
+    """
+    Add a single blob to the running counters of a usage summary.
+    """
+    size = blob.size or 0
+    summary["total"]["count"] += 1
+    summary["total"]["bytes"] += size
+
+    segments = blob.name.split(delimiter)[:-1][:prefix_depth]
+    prefix = delimiter.join(segments) + delimiter if segments else delimiter
+    _add_usage(summary["by_prefix"], prefix, size)
+
+    _add_usage(summary["by_tier"], blob.blob_tier or "Unknown", size)
+
+    label = labels[-1]
+    if blob.last_modified:
+        age = (now - blob.last_modified).total_seconds() / 86400
+        for idx, upper in enumerate(age_buckets):
+            if age < upper:
+                label = labels[idx]
+                break
+    _add_usage(summary["by_age"], label, size)
+
+
+def _merge_usage_summary(summary, other):
+    """
+    Merge the counters of one usage summary into another.
+    """
+    for key in ["count", "bytes"]:
+        summary["total"][key] += other["total"][key]
+    for group in ["by_prefix", "by_tier", "by_age"]:
+        for name, usage in other[group].items():
+            counters = summary[group].setdefault(name, {"count": 0, "bytes": 0})
+            counters["count"] += usage["count"]
+            counters["bytes"] += usage["bytes"]
+    return summary
+
+
+def _summarize_blobs(
+    containerconn, prefix, prefix_depth, delimiter, age_buckets, labels, now
+):
+    """
+    Stream the listing of blobs under a prefix into a new usage summary. Only the running counters are kept in memory.
+    """
+    summary = _new_usage_summary(labels)
+    for blob in containerconn.list_blobs(name_starts_with=prefix):
+        _aggregate_blob(
+            summary, blob, prefix_depth, delimiter, age_buckets, labels, now
+        )
+    return summary
+
+
+async def _run_blob_batches(hub, blobs, operation, max_concurrency, dry_run=False):
+    """
+    Submit the blob names from an iterable in batches of up to ``BATCH_SIZE`` sub-requests, keeping up to
+    ``max_concurrency`` batch requests in flight at once, and collect the result of every sub-request.
+    """
+    result = {"total": 0, "succeeded": 0, "failed": 0, "blobs": {}}
+    blobs = iter(blobs)
+    pending = set()
+    max_concurrency = max(int(max_concurrency or 1), 1)
+
+    async def _submit(batch):
+        try:
+            responses = await hub.exec.azurerm.utils.run_in_executor(
+                lambda: list(operation(*batch))
+            )
+        except HttpResponseError as exc:
+            return {blob: {"error": str(exc)} for blob in batch}
+        return {
+            blob: _batch_response_as_dict(response)
+            for blob, response in zip(batch, responses)
+        }
+
+    def _record(batch_result):
+        for blob, blob_result in batch_result.items():
+            result["total"] += 1
+            if "error" in blob_result:
+                result["failed"] += 1
+            elif not dry_run:
+                result["succeeded"] += 1
+            result["blobs"][blob] = blob_result
+
+    while True:
+        # Pulling the next batch of names may have to fetch another page of the container listing
+        batch = await hub.exec.azurerm.utils.run_in_executor(
+            lambda: list(itertools.islice(blobs, BATCH_SIZE))
+        )
+        if not batch:
+            break
+
+        if dry_run:
+            _record({blob: {} for blob in batch})
+            continue
+
+        pending.add(asyncio.ensure_future(_submit(batch)))
+        if len(pending) >= max_concurrency:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                _record(task.result())
+
+    if pending:
+        for batch_result in await asyncio.gather(*pending):
+            _record(batch_result)
+
+    return result
+
+
 async def get_client(
     hub, ctx, client_type, account, resource_group, container=None, blob=None, **kwargs
 ):
@@ -196,6 +398,245 @@ async def clear_legal_hold(hub, ctx, name, account, resource_group, tags, **kwar
     return result
 
 
+async def copy_blobs(
+    hub,
+    ctx,
+    name,
+    account,
+    resource_group,
+    dest_container,
+    dest_account=None,
+    dest_resource_group=None,
+    blobs=None,
+    prefix=None,
+    sas_expiry_hours=24,
+    max_concurrency=64,
+    poll_interval=2,
+    max_poll_interval=60,
+    timeout=None,
+    **kwargs,
+):
+    """
+    .. versionadded:: 4.1.0
+
+    Copy blobs from one blob container to another using server-side copy operations. A read-only service SAS for the
+    source container is generated with ``azurerm.storage.account.list_service_sas``, and each blob is then copied with
+    ``start_copy_from_url`` so that no blob data passes through the host running this function. Many copies are kept in
+    flight at once and the status of each pending copy is polled with an exponential backoff until it completes.
+
+    :param name: The name of the source blob container.
+
+    :param account: The name of the source storage account.
+
+    :param resource_group: The name of the resource group containing the source storage account.
+
+    :param dest_container: The name of the destination blob container. The container must already exist.
+
+    :param dest_account: The name of the destination storage account. Defaults to the source storage account.
+
+    :param dest_resource_group: The name of the resource group containing the destination storage account. Defaults to
+        the resource group of the source storage account.
+
+    :param blobs: A list of blob names to copy. If this parameter is not specified, all blobs matching ``prefix`` are
+        copied.
+
+    :param prefix: Only copy blobs whose names begin with this prefix.
+
+    :param sas_expiry_hours: The number of hours for which the generated source SAS token is valid. This must be long
+        enough for all of the copies to complete. Defaults to 24.
+
+    :param max_concurrency: The maximum number of copy operations to have in flight at once. Defaults to 64.
+
+    :param poll_interval: The initial number of seconds to wait between copy status checks. Defaults to 2.
+
+    :param max_poll_interval: The maximum number of seconds to wait between copy status checks. Defaults to 60.
+
+    :param timeout: The maximum number of seconds to wait for each copy to complete. Copies which are still pending when
+        the timeout expires are reported as such and are not aborted. Defaults to waiting indefinitely.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        azurerm.storage.container.copy_blobs test_name test_account test_group test_dest dest_account=test_dest_account
+
+    """
+    dest_account = dest_account or account
+    dest_resource_group = dest_resource_group or resource_group
+
+    srcconn = await hub.exec.azurerm.storage.container.get_client(
+        ctx,
+        client_type="Container",
+        account=account,
+        resource_group=resource_group,
+        container=name,
+        **kwargs,
+    )
+    destconn = await hub.exec.azurerm.storage.container.get_client(
+        ctx,
+        client_type="Container",
+        account=dest_account,
+        resource_group=dest_resource_group,
+        container=dest_container,
+        **kwargs,
+    )
+
+    expiry = datetime.datetime.utcnow() + datetime.timedelta(
+        hours=float(sas_expiry_hours)
+    )
+    sas = await hub.exec.azurerm.storage.account.list_service_sas(
+        ctx,
+        name=account,
+        resource_group=resource_group,
+        canonicalized_resource=f"/blob/{account}/{name}",
+        permissions="r",
+        shared_access_expiry_time=expiry.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        resource="c",
+        **kwargs,
+    )
+    if "error" in sas:
+        return {"error": sas["error"]}
+
+    async def _copy(blob):
+        blobconn = destconn.get_blob_client(blob)
+        source_url = "{0}/{1}?{2}".format(
+            srcconn.url, quote(blob), sas["service_sas_token"]
+        )
+
+        try:
+            copy = await hub.exec.azurerm.utils.run_in_executor(
+                blobconn.start_copy_from_url, source_url
+            )
+            status = {"id": copy.get("copy_id"), "status": copy.get("copy_status")}
+
+            if status["status"] == "pending":
+
+                async def _get_copy():
+                    props = await hub.exec.azurerm.utils.run_in_executor(
+                        blobconn.get_blob_properties
+                    )
+                    return _copy_properties_as_dict(props.copy)
+
+                status = await hub.exec.azurerm.utils.poll_with_backoff(
+                    _get_copy,
+                    lambda copy_status: copy_status["status"] != "pending",
+                    interval=poll_interval,
+                    max_interval=max_poll_interval,
+                    timeout=timeout,
+                )
+        except asyncio.TimeoutError:
+            return {
+                "status": "pending",
+                "error": "Timed out waiting for the copy operation to complete.",
+            }
+        except HttpResponseError as exc:
+            return {"error": str(exc)}
+
+        if status["status"] != "success":
+            status["error"] = status.get("status_description") or status["status"]
+        return status
+
+    try:
+        if blobs is None:
+            blobs = await hub.exec.azurerm.utils.run_in_executor(
+                lambda: list(_select_blobs(srcconn, prefix=prefix))
+            )
+
+        copies = await hub.exec.azurerm.utils.gather_limited(
+            [_copy(blob) for blob in blobs], max_concurrency=max_concurrency
+        )
+    except (CloudError, AttributeError) as exc:
+        await hub.exec.azurerm.utils.log_cloud_error("storage", str(exc), **kwargs)
+        return {"error": str(exc)}
+    except HttpResponseError as exc:
+        return {"error": str(exc)}
+
+    result = {"total": 0, "succeeded": 0, "failed": 0, "blobs": {}}
+    for blob, status in zip(blobs, copies):
+        result["total"] += 1
+        if "error" in status:
+            result["failed"] += 1
+        else:
+            result["succeeded"] += 1
+        result["blobs"][blob] = status
+
+    return result
+
+
+async def copy_container(
+    hub,
+    ctx,
+    name,
+    account,
+    resource_group,
+    dest_container,
+    dest_account=None,
+    dest_resource_group=None,
+    max_concurrency=64,
+    timeout=None,
+    **kwargs,
+):
+    """
+    .. versionadded:: 4.1.0
+
+    Copy every blob within a blob container to another blob container, which may be in a different storage account or
+    region, using server-side copy operations. The destination container is created if it does not already exist. See
+    ``azurerm.storage.container.copy_blobs`` for more details and additional parameters.
+
+    :param name: The name of the source blob container.
+
+    :param account: The name of the source storage account.
+
+    :param resource_group: The name of the resource group containing the source storage account.
+
+    :param dest_container: The name of the destination blob container.
+
+    :param dest_account: The name of the destination storage account. Defaults to the source storage account.
+
+    :param dest_resource_group: The name of the resource group containing the destination storage account. Defaults to
+        the resource group of the source storage account.
+
+    :param max_concurrency: The maximum number of copy operations to have in flight at once. Defaults to 64.
+
+    :param timeout: The maximum number of seconds to wait for each copy to complete. Defaults to waiting indefinitely.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        azurerm.storage.container.copy_container test_name test_account test_group test_dest dest_account=test_dest_account
+
+    """
+    destconn = await hub.exec.azurerm.storage.container.get_client(
+        ctx,
+        client_type="Container",
+        account=dest_account or account,
+        resource_group=dest_resource_group or resource_group,
+        container=dest_container,
+        **kwargs,
+    )
+
+    try:
+        destconn.create_container()
+    except ResourceExistsError:
+        pass
+    except HttpResponseError as exc:
+        return {"error": str(exc)}
+
+    return await hub.exec.azurerm.storage.container.copy_blobs(
+        ctx,
+        name=name,
+        account=account,
+        resource_group=resource_group,
+        dest_container=dest_container,
+        dest_account=dest_account,
+        dest_resource_group=dest_resource_group,
+        max_concurrency=max_concurrency,
+        timeout=timeout,
+        **kwargs,
+    )
+
+
 async def create(
     hub,
     ctx,
@@ -467,6 +908,92 @@ async def delete(hub, ctx, name, account, resource_group, **kwargs):
     return result
 
 
+async def delete_blobs(
+    hub,
+    ctx,
+    name,
+    account,
+    resource_group,
+    blobs=None,
+    prefix=None,
+    older_than_days=None,
+    delete_snapshots=None,
+    max_concurrency=8,
+    dry_run=False,
+    **kwargs,
+):
+    """
+    .. versionadded:: 4.1.0
+
+    Delete multiple blobs from a container using the Blob Batch API. Up to 256 deletions are packed into each batch
+    request and several batch requests are kept in flight at once. The blobs to delete can either be passed explicitly
+    or selected from a streamed listing of the container.
+
+    :param name: The name of the blob container.
+
+    :param account: The name of the storage account.
+
+    :param resource_group: The name of the resource group.
+
+    :param blobs: A list of blob names to delete. If this parameter is not specified, the blobs are selected with the
+        ``prefix`` and ``older_than_days`` parameters, at least one of which must then be provided.
+
+    :param prefix: Only delete blobs whose names begin with this prefix.
+
+    :param older_than_days: Only delete blobs which were last modified more than this many days ago.
+
+    :param delete_snapshots: Required if a blob has associated snapshots. Possible values include: "only" (deletes only
+        the blob's snapshots) and "include" (deletes the blob along with all snapshots).
+
+    :param max_concurrency: The maximum number of batch requests to have in flight at once. Defaults to 8.
+
+    :param dry_run: If True, only return the blobs which would be deleted. Defaults to False.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        azurerm.storage.container.delete_blobs test_name test_account test_group prefix="logs/" older_than_days=90
+
+    """
+    if blobs is None and prefix is None and older_than_days is None:
+        return {
+            "error": "One of the blobs, prefix, or older_than_days parameters must be specified."
+        }
+
+    containerconn = await hub.exec.azurerm.storage.container.get_client(
+        ctx,
+        client_type="Container",
+        account=account,
+        resource_group=resource_group,
+        container=name,
+        **kwargs,
+    )
+
+    if blobs is None:
+        blobs = _select_blobs(
+            containerconn, prefix=prefix, older_than_days=older_than_days
+        )
+
+    operation = functools.partial(
+        containerconn.delete_blobs,
+        delete_snapshots=delete_snapshots,
+        raise_on_any_failure=False,
+    )
+
+    try:
+        result = await _run_blob_batches(
+            hub, blobs, operation, max_concurrency, dry_run=dry_run
+        )
+    except (CloudError, AttributeError) as exc:
+        await hub.exec.azurerm.utils.log_cloud_error("storage", str(exc), **kwargs)
+        result = {"error": str(exc)}
+    except HttpResponseError as exc:
+        result = {"error": str(exc)}
+
+    return result
+
+
 async def delete_immutability_policy(
     hub, ctx, name, account, resource_group, if_match, **kwargs
 ):
@@ -607,6 +1134,115 @@ async def get(hub, ctx, name, account, resource_group, **kwargs):
     return result
 
 
+async def get_usage_summary(
+    hub,
+    ctx,
+    name,
+    account,
+    resource_group,
+    prefix=None,
+    prefix_depth=1,
+    delimiter="/",
+    age_buckets=None,
+    max_concurrency=8,
+    **kwargs,
+):
+    """
+    .. versionadded:: 4.1.0
+
+    Summarize the blobs within a blob container. The container listing is streamed and aggregated into running counters
+    of the number of blobs and total bytes, grouped by name prefix, access tier, and last modified age. Unlike
+    ``list_blobs``, the individual blobs are never held in memory, so this can be used against very large containers.
+
+    The listing is split at the first ``delimiter`` below ``prefix`` and the resulting virtual directories are listed
+    in parallel.
+
+    :param name: The name of the blob container.
+
+    :param account: The name of the storage account.
+
+    :param resource_group: The name of the resource group.
+
+    :param prefix: Only summarize blobs whose names begin with this prefix.
+
+    :param prefix_depth: The number of virtual directory levels, counted from the root of the container, by which the
+        blobs are grouped. Defaults to 1.
+
+    :param delimiter: The character used to separate virtual directories in blob names. Defaults to "/".
+
+    :param age_buckets: A list of ascending day counts used to group the blobs by the age of their last modification.
+        Defaults to ``[30, 90, 365]``.
+
+    :param max_concurrency: The maximum number of virtual directories to list at once. Defaults to 8.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        azurerm.storage.container.get_usage_summary test_name test_account test_group prefix_depth=2
+
+    """
+    if age_buckets is None:
+        age_buckets = [30, 90, 365]
+    age_buckets = sorted(float(days) for days in age_buckets)
+    labels = _age_bucket_labels(age_buckets)
+    prefix_depth = int(prefix_depth)
+    now = datetime.datetime.now(datetime.timezone.utc)
+
+    containerconn = await hub.exec.azurerm.storage.container.get_client(
+        ctx,
+        client_type="Container",
+        account=account,
+        resource_group=resource_group,
+        container=name,
+        **kwargs,
+    )
+
+    def _walk_top_level():
+        summary = _new_usage_summary(labels)
+        prefixes = []
+        for item in containerconn.walk_blobs(
+            name_starts_with=prefix, delimiter=delimiter
+        ):
+            if isinstance(item, BlobProperties):
+                _aggregate_blob(
+                    summary, item, prefix_depth, delimiter, age_buckets, labels, now
+                )
+            else:
+                prefixes.append(item.name)
+        return summary, prefixes
+
+    async def _summarize(sub_prefix):
+        return await hub.exec.azurerm.utils.run_in_executor(
+            _summarize_blobs,
+            containerconn,
+            sub_prefix,
+            prefix_depth,
+            delimiter,
+            age_buckets,
+            labels,
+            now,
+        )
+
+    try:
+        summary, prefixes = await hub.exec.azurerm.utils.run_in_executor(
+            _walk_top_level
+        )
+        summaries = await hub.exec.azurerm.utils.gather_limited(
+            [_summarize(sub_prefix) for sub_prefix in prefixes],
+            max_concurrency=max_concurrency,
+        )
+        for sub_summary in summaries:
+            _merge_usage_summary(summary, sub_summary)
+    except (CloudError, AttributeError) as exc:
+        await hub.exec.azurerm.utils.log_cloud_error("storage", str(exc), **kwargs)
+        return {"error": str(exc)}
+    except HttpResponseError as exc:
+        return {"error": str(exc)}
+
+    return summary
+
+
 async def get_immutability_policy(
     hub, ctx, name, account, resource_group, if_match=None, **kwargs
 ):
@@ -937,6 +1573,104 @@ async def set_legal_hold(hub, ctx, name, account, resource_group, tags, **kwargs
     return result
 
 
+async def set_blob_tier(
+    hub,
+    ctx,
+    name,
+    account,
+    resource_group,
+    tier,
+    blobs=None,
+    prefix=None,
+    older_than_days=None,
+    max_concurrency=8,
+    dry_run=False,
+    **kwargs,
+):
+    """
+    .. versionadded:: 4.1.0
+
+    Set the access tier of multiple block blobs in a container using the Blob Batch API. Up to 256 tier changes are
+    packed into each batch request and several batch requests are kept in flight at once. The blobs to re-tier can
+    either be passed explicitly or selected from a streamed listing of the container.
+
+    When blobs are selected from the container listing, blobs which are already in the requested tier or in a colder
+    tier are skipped, so that archived blobs are never rehydrated unintentionally.
+
+    :param name: The name of the blob container.
+
+    :param account: The name of the storage account.
+
+    :param resource_group: The name of the resource group.
+
+    :param tier: The access tier to set on the blobs. Possible values include: "Hot", "Cool", and "Archive".
+
+    :param blobs: A list of blob names to re-tier. If this parameter is not specified, the blobs are selected with the
+        ``prefix`` and ``older_than_days`` parameters, at least one of which must then be provided.
+
+    :param prefix: Only re-tier blobs whose names begin with this prefix.
+
+    :param older_than_days: Only re-tier blobs which were last modified more than this many days ago.
+
+    :param max_concurrency: The maximum number of batch requests to have in flight at once. Defaults to 8.
+
+    :param dry_run: If True, only return the blobs which would be re-tiered. Defaults to False.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        azurerm.storage.container.set_blob_tier test_name test_account test_group Archive older_than_days=30
+
+    """
+    tier_map = {t.lower(): t for t in BLOB_TIERS}
+    if str(tier).lower() not in tier_map:
+        return {
+            "error": "The tier parameter must be one of: {0}.".format(
+                ", ".join(BLOB_TIERS)
+            )
+        }
+    tier = tier_map[str(tier).lower()]
+
+    if blobs is None and prefix is None and older_than_days is None:
+        return {
+            "error": "One of the blobs, prefix, or older_than_days parameters must be specified."
+        }
+
+    containerconn = await hub.exec.azurerm.storage.container.get_client(
+        ctx,
+        client_type="Container",
+        account=account,
+        resource_group=resource_group,
+        container=name,
+        **kwargs,
+    )
+
+    if blobs is None:
+        blobs = _select_blobs(
+            containerconn,
+            prefix=prefix,
+            older_than_days=older_than_days,
+            skip_tiers=BLOB_TIERS[BLOB_TIERS.index(tier) :],
+        )
+
+    operation = functools.partial(
+        containerconn.set_standard_blob_tier_blobs, tier, raise_on_any_failure=False
+    )
+
+    try:
+        result = await _run_blob_batches(
+            hub, blobs, operation, max_concurrency, dry_run=dry_run
+        )
+    except (CloudError, AttributeError) as exc:
+        await hub.exec.azurerm.utils.log_cloud_error("storage", str(exc), **kwargs)
+        result = {"error": str(exc)}
+    except HttpResponseError as exc:
+        result = {"error": str(exc)}
+
+    return result
+
+
 async def update(
     hub,
     ctx,
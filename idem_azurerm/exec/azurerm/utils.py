@@ -4,7 +4,7 @@ Azure Resource Manager (ARM) Utilities
 
 .. versionadded:: 1.0.0
 
-.. versionchanged:: 2.4.0, 2.0.0, 4.0.0, 4.0.1
+.. versionchanged:: 2.4.0, 2.0.0, 4.0.0, 4.0.1, 4.1.0
 
 :maintainer: <devops@eitr.tech>
 
@@ -12,11 +12,16 @@ Azure Resource Manager (ARM) Utilities
 # Import Python libs
 from __future__ import absolute_import, print_function, unicode_literals
 from operator import itemgetter
+import asyncio
+import collections
+import datetime
+import functools
+import hashlib
+import heapq
 import importlib
 import logging
 import six
 import sys
-import os
 
 # Import third party libs
 try:
@@ -32,6 +37,7 @@ try:
     from msrestazure.azure_exceptions import CloudError, MSIAuthenticationTimeoutError
     from msrest.exceptions import AuthenticationError, TokenExpiredError
     from requests.exceptions import HTTPError
+    import isodate
 
     HAS_AZURE = True
 except ImportError:
@@ -39,16 +45,60 @@ except ImportError:
 
 try:
     from azure.identity import (
+        AzureCliCredential,
+        CertificateCredential,
+        ChainedTokenCredential,
+        ClientSecretCredential,
         DefaultAzureCredential,
         KnownAuthorities,
+        ManagedIdentityCredential,
+        UsernamePasswordCredential,
     )
 
     HAS_AZURE_ID = True
 except ImportError:
     HAS_AZURE_ID = False
 
+try:
+    from azure.core.pipeline.transport import RequestsTransport
+    from azure.keyvault.keys import KeyClient
+    from azure.keyvault.keys.crypto import CryptographyClient
+    from azure.keyvault.secrets import SecretClient
+    import requests
+
+    HAS_AZURE_KV = True
+except ImportError:
+    HAS_AZURE_KV = False
+
 log = logging.getLogger(__name__)
 
+# Default number of Azure API calls that the bulk helpers will keep in flight at once
+DEFAULT_CONCURRENCY = 8
+
+# Keyword arguments which configure the connection to Azure rather than a particular operation
+CONNECTION_KWARGS = (
+    "subscription_id",
+    "tenant",
+    "client_id",
+    "secret",
+    "username",
+    "password",
+    "cloud_environment",
+    "azurerm_log_level",
+)
+
+# Public client ID of the Azure CLI, used for username/password authentication when no client_id is provided
+AZURE_CLI_CLIENT_ID = "04b07795-8ddb-461a-bbee-02f9e1bf7b46"
+
+
+def _managed_identity_or_cli_credential(client_id):
+    """
+    Return a credential for a user assigned managed identity, with the Azure CLI login as a fallback.
+    """
+    return ChainedTokenCredential(
+        ManagedIdentityCredential(client_id=client_id), AzureCliCredential()
+    )
+
 
 async def determine_auth(hub, ctx, resource=None, **kwargs):
     """
@@ -234,18 +284,26 @@ async def log_cloud_error(hub, client, message, **kwargs):
 async def paged_object_to_list(hub, paged_object):
     """
     Extract all pages within a paged object as a list of dictionaries
+
+    .. versionchanged:: 4.1.0
+
+    The pages are fetched in the default executor, so several listings can be retrieved at the same time.
     """
-    paged_return = []
-    while True:
-        try:
-            page = next(paged_object)
-            paged_return.append(page.as_dict())
-        except CloudError:
-            raise
-        except StopIteration:
-            break
 
-    return paged_return
+    def _consume():
+        paged_return = []
+        while True:
+            try:
+                page = next(paged_object)
+                paged_return.append(page.as_dict())
+            except CloudError:
+                raise
+            except StopIteration:
+                break
+
+        return paged_return
+
+    return await hub.exec.azurerm.utils.run_in_executor(_consume)
 
 
 async def create_object_model(hub, module_name, object_name, **kwargs):
@@ -362,34 +420,33 @@ async def compare_list_of_dicts(
 
 async def get_identity_credentials(hub, ctx, **kwargs):
     """
+    .. versionchanged:: 4.1.0
+
     Acquire Azure RM Credentials from the identity provider (not for mgmt)
 
     This is accessible on the hub so clients out in the code can use it. Non-management clients
     can't be consolidated neatly here.
 
-    We basically set environment variables based upon incoming parameters and then pass off to
-    the DefaultAzureCredential object to correctly parse those environment variables. See the
-    `Microsoft Docs on EnvironmentCredential <https://aka.ms/azsdk-python-identity-default-cred-ref>`_
-    for more information.
+    The credential type is chosen from the incoming parameters and constructed directly, in the
+    same order of precedence as the `EnvironmentCredential
+    <https://aka.ms/azsdk-python-identity-default-cred-ref>`_:
+
+      * ``tenant``, ``client_id`` and ``secret``: ``ClientSecretCredential``
+      * ``tenant``, ``client_id`` and ``client_certificate_path``: ``CertificateCredential``
+      * ``username`` and ``password``: ``UsernamePasswordCredential``
+      * ``client_id`` only: the user assigned ``ManagedIdentityCredential``, then ``AzureCliCredential``
+      * otherwise: ``DefaultAzureCredential``, which includes managed identity, the shared token cache and the
+        Azure CLI
+
+    Credentials are cached per identity on the hub, so repeated calls reuse the same credential
+    and its token cache. No process environment variables are modified, so different identities
+    can be used concurrently.
     """
     if ctx["acct"]:
         for key, val in ctx["acct"].items():
             # explicit kwargs override acct
             kwargs.setdefault(key, val)
 
-    kwarg_map = {
-        "tenant": "AZURE_TENANT_ID",
-        "client_id": "AZURE_CLIENT_ID",
-        "secret": "AZURE_CLIENT_SECRET",
-        "client_certificate_path": "AZURE_CLIENT_CERTIFICATE_PATH",
-        "username": "AZURE_USERNAME",
-        "password": "AZURE_PASSWORD",
-    }
-
-    for kw in kwarg_map:
-        if kwargs.get(kw):
-            os.environ[kwarg_map[kw]] = kwargs[kw]
-
     try:
         if kwargs.get("cloud_environment") and kwargs.get(
             "cloud_environment"
@@ -404,6 +461,383 @@ async def get_identity_credentials(hub, ctx, **kwargs):
         log.error('Unknown authority presented for "cloud_environment": %s', exc)
         authority = KnownAuthorities.AZURE_PUBLIC_CLOUD
 
-    credential = DefaultAzureCredential(authority=authority)
+    if kwargs.get("tenant") and kwargs.get("client_id") and kwargs.get("secret"):
+        credential_class = ClientSecretCredential
+        credential_args = [kwargs["tenant"], kwargs["client_id"], kwargs["secret"]]
+        credential_kwargs = {"authority": authority}
+    elif (
+        kwargs.get("tenant")
+        and kwargs.get("client_id")
+        and kwargs.get("client_certificate_path")
+    ):
+        credential_class = CertificateCredential
+        credential_args = [
+            kwargs["tenant"],
+            kwargs["client_id"],
+            kwargs["client_certificate_path"],
+        ]
+        credential_kwargs = {"authority": authority}
+    elif kwargs.get("username") and kwargs.get("password"):
+        credential_class = UsernamePasswordCredential
+        credential_args = [
+            kwargs.get("client_id") or AZURE_CLI_CLIENT_ID,
+            kwargs["username"],
+            kwargs["password"],
+        ]
+        credential_kwargs = {"authority": authority}
+        if kwargs.get("tenant"):
+            credential_kwargs["tenant_id"] = kwargs["tenant"]
+    elif kwargs.get("client_id"):
+        # A user assigned managed identity, falling back to the Azure CLI login of a workstation
+        credential_class = _managed_identity_or_cli_credential
+        credential_args = []
+        credential_kwargs = {"client_id": kwargs["client_id"]}
+    else:
+        credential_class = DefaultAzureCredential
+        credential_args = []
+        credential_kwargs = {"authority": authority}
+
+    # Secrets are hashed so that they are not kept in the cache keys
+    identity = (
+        credential_class.__name__,
+        authority,
+        kwargs.get("tenant"),
+        hashlib.sha256(
+            "|".join(str(arg) for arg in credential_args).encode("utf-8")
+        ).hexdigest(),
+        credential_kwargs.get("client_id"),
+    )
+
+    credential = hub.exec.azurerm.CREDENTIALS.get(identity)
+    if credential is None:
+        log.debug("Creating a new %s credential", credential_class.__name__)
+        credential = credential_class(*credential_args, **credential_kwargs)
+        hub.exec.azurerm.CREDENTIALS[identity] = credential
 
     return credential
+
+
+async def get_keyvault_client(hub, ctx, client_type, vault_url, key_id=None, **kwargs):
+    """
+    .. versionadded:: 4.1.0
+
+    Return a Key Vault data plane client from a pool of clients keyed by client type, vault URL and identity. Clients
+    are created on first use and then reused by later calls, and all of them share a single HTTP transport, so that
+    connections to the vaults are kept open and reused instead of re-authenticating and reconnecting on every call.
+
+    :param client_type: The type of client to return. Possible values are "secret", "key", and "crypto".
+
+    :param vault_url: The URL of the vault that the client will access.
+
+    :param key_id: The full identifier of the key used by a "crypto" client. Required when ``client_type`` is "crypto".
+
+    """
+    if not HAS_AZURE_KV:
+        raise sys.exit(
+            "The azure Key Vault {0} client is not available.".format(client_type)
+        )
+
+    client_map = {
+        "secret": SecretClient,
+        "key": KeyClient,
+        "crypto": CryptographyClient,
+    }
+
+    if client_type not in client_map:
+        raise Exception(
+            "The Key Vault client_type {0} specified can not be found.".format(
+                client_type
+            )
+        )
+
+    credential = await hub.exec.azurerm.utils.get_identity_credentials(ctx, **kwargs)
+
+    if client_type == "crypto":
+        if not key_id:
+            raise Exception("A key_id must be specified for a crypto client.")
+        pool_key = (client_type, key_id.rstrip("/").lower(), id(credential))
+    else:
+        pool_key = (client_type, vault_url.rstrip("/").lower(), id(credential))
+    client = hub.exec.azurerm.KEYVAULT_CLIENTS.get(pool_key)
+
+    if client is not None:
+        hub.exec.azurerm.KEYVAULT_CLIENT_STATS["hits"] += 1
+        return client
+
+    hub.exec.azurerm.KEYVAULT_CLIENT_STATS["misses"] += 1
+
+    if hub.exec.azurerm.KEYVAULT_TRANSPORT is None:
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=DEFAULT_CONCURRENCY, pool_maxsize=DEFAULT_CONCURRENCY * 4
+        )
+        session.mount("https://", adapter)
+        hub.exec.azurerm.KEYVAULT_TRANSPORT = RequestsTransport(
+            session=session, session_owner=False
+        )
+
+    if client_type == "crypto":
+        client = CryptographyClient(
+            key_id, credential, transport=hub.exec.azurerm.KEYVAULT_TRANSPORT
+        )
+    else:
+        client = client_map[client_type](
+            vault_url=vault_url,
+            credential=credential,
+            transport=hub.exec.azurerm.KEYVAULT_TRANSPORT,
+        )
+    hub.exec.azurerm.KEYVAULT_CLIENTS[pool_key] = client
+
+    return client
+
+
+async def get_keyvault_client_stats(hub):
+    """
+    .. versionadded:: 4.1.0
+
+    Return usage metrics for the pool of Key Vault data plane clients and their shared HTTP transport. The number of
+    requests sent compared to the number of connections opened shows how well connections are being reused.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        azurerm.utils.get_keyvault_client_stats
+
+    """
+    result = {
+        "clients": len(hub.exec.azurerm.KEYVAULT_CLIENTS),
+        "client_hits": hub.exec.azurerm.KEYVAULT_CLIENT_STATS["hits"],
+        "client_misses": hub.exec.azurerm.KEYVAULT_CLIENT_STATS["misses"],
+        "connections": 0,
+        "requests": 0,
+    }
+
+    transport = hub.exec.azurerm.KEYVAULT_TRANSPORT
+    if transport is not None:
+        for adapter in transport.session.adapters.values():
+            for key in adapter.poolmanager.pools.keys():
+                pool = adapter.poolmanager.pools[key]
+                result["connections"] += pool.num_connections
+                result["requests"] += pool.num_requests
+
+    return result
+
+
+async def run_in_executor(hub, func, *args, **kwargs):
+    """
+    .. versionadded:: 4.1.0
+
+    Run a blocking Azure SDK call in the default executor of the running event loop. The Azure SDK clients used by
+    this provider are synchronous, so this allows several of their calls to be in flight at the same time.
+
+    :param func: The callable to run.
+
+    """
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+
+async def gather_limited(hub, coros, max_concurrency=DEFAULT_CONCURRENCY):
+    """
+    .. versionadded:: 4.1.0
+
+    Await an iterable of coroutines, with at most ``max_concurrency`` of them running at any given time. The results
+    are returned as a list in the same order as the coroutines were provided.
+
+    :param coros: An iterable of coroutines to await.
+
+    :param max_concurrency: The maximum number of coroutines to run at once. Defaults to 8.
+
+    """
+    semaphore = asyncio.Semaphore(max(int(max_concurrency or 1), 1))
+
+    async def _bounded(coro):
+        async with semaphore:
+            return await coro
+
+    return await asyncio.gather(*[_bounded(coro) for coro in coros])
+
+
+async def poll_with_backoff(
+    hub, func, is_done, interval=2, max_interval=60, backoff=2, timeout=None
+):
+    """
+    .. versionadded:: 4.1.0
+
+    Repeatedly await ``func`` until ``is_done`` returns True for its result, sleeping between attempts with an
+    exponential backoff. The last result is returned. An ``asyncio.TimeoutError`` is raised if ``timeout`` seconds
+    elapse before the operation reaches a terminal state.
+
+    :param func: A coroutine function, taking no arguments, which fetches the current state of an operation.
+
+    :param is_done: A function which accepts the result of ``func`` and returns True once the operation has finished.
+
+    :param interval: The initial number of seconds to sleep between attempts. Defaults to 2.
+
+    :param max_interval: The maximum number of seconds to sleep between attempts. Defaults to 60.
+
+    :param backoff: The factor by which the sleep interval grows after every attempt. Defaults to 2.
+
+    :param timeout: The maximum number of seconds to wait. Defaults to waiting indefinitely.
+
+    """
+    loop = asyncio.get_event_loop()
+    deadline = loop.time() + timeout if timeout else None
+
+    while True:
+        result = await func()
+        if is_done(result):
+            return result
+
+        delay = interval
+        if deadline:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                raise asyncio.TimeoutError()
+            delay = min(delay, remaining)
+
+        await asyncio.sleep(delay)
+        interval = min(interval * backoff, max_interval)
+
+
+async def filter_newest(
+    hub,
+    items,
+    top=None,
+    updated_after=None,
+    enabled=None,
+    sort_attr="updated_on",
+    properties_attr=None,
+):
+    """
+    .. versionadded:: 4.1.0
+
+    Lazily consume an iterable of Key Vault items, such as the pages returned by a listing, filtering them on their
+    ``updated_on`` and ``enabled`` properties, and return a list of the matching items ordered newest first. When
+    ``top`` is specified, only the newest ``top`` items are kept in memory while the iterable is consumed.
+
+    :param items: An iterable of items, such as an ``ItemPaged`` object returned by a Key Vault client.
+
+    :param top: The maximum number of items to return.
+
+    :param updated_after: Only return items which were last updated after this time. This parameter should be a
+        string representation of a Datetime object in ISO-8601 format or a Datetime object. Times without a timezone
+        are treated as UTC.
+
+    :param enabled: If specified, only return items whose enabled property matches this value.
+
+    :param sort_attr: The Datetime attribute of the items used to order them. Defaults to "updated_on".
+
+    :param properties_attr: The name of the attribute of the items which holds their properties, if the properties
+        are not attributes of the items themselves.
+
+    """
+    if isinstance(updated_after, six.string_types):
+        updated_after = isodate.parse_datetime(updated_after)
+    if updated_after and updated_after.tzinfo is None:
+        updated_after = updated_after.replace(tzinfo=datetime.timezone.utc)
+
+    oldest = datetime.datetime.min.replace(tzinfo=datetime.timezone.utc)
+
+    def _properties(item):
+        return getattr(item, properties_attr) if properties_attr else item
+
+    def _sort_key(item):
+        val = getattr(item, sort_attr, None)
+        if val is None:
+            val = getattr(_properties(item), sort_attr, None)
+        return val or oldest
+
+    def _matches():
+        for item in items:
+            props = _properties(item)
+            if enabled is not None and props.enabled != enabled:
+                continue
+            if updated_after and (props.updated_on or oldest) <= updated_after:
+                continue
+            yield item
+
+    def _consume():
+        if top:
+            return heapq.nlargest(int(top), _matches(), key=_sort_key)
+        return sorted(_matches(), key=_sort_key, reverse=True)
+
+    return await hub.exec.azurerm.utils.run_in_executor(_consume)
+
+
+async def fan_out(
+    hub, ctx, func, subscriptions, max_concurrency=DEFAULT_CONCURRENCY, **kwargs
+):
+    """
+    .. versionadded:: 4.1.0
+
+    Run a listing function against several subscriptions concurrently and merge the results into a single dictionary
+    keyed by resource ID. The listing function is called once per subscription with the ``subscription_id`` keyword
+    argument overridden and must return a dictionary of resources, or a dictionary with an "error" key on failure.
+    Subscriptions which fail are logged and skipped; an error is only returned if every subscription failed.
+
+    :param func: The listing function to call for each subscription, such as
+        ``hub.exec.azurerm.compute.virtual_machine.list``.
+
+    :param subscriptions: A list of subscription IDs to query, or "all" to query every enabled subscription visible
+        to the provided credentials.
+
+    :param max_concurrency: The maximum number of subscriptions to query at once. Defaults to 8.
+
+    Any additional keyword arguments are passed to the listing function for every subscription.
+
+    """
+    if isinstance(subscriptions, six.string_types):
+        if subscriptions.lower() == "all":
+            subscriptions = True
+        else:
+            subscriptions = subscriptions.split(",")
+
+    if subscriptions is True:
+        # Only the connection parameters apply to the discovery of the subscriptions, not the listing options
+        conn_kwargs = {
+            key: val for key, val in kwargs.items() if key in CONNECTION_KWARGS
+        }
+        subs = await hub.exec.azurerm.resource.subscription.list(ctx, **conn_kwargs)
+        if "error" in subs:
+            return subs
+        subscriptions = [
+            sub_id for sub_id, sub in subs.items() if sub.get("state") == "Enabled"
+        ]
+
+    # preserve the requested order while skipping duplicates
+    subscriptions = list(
+        collections.OrderedDict.fromkeys(
+            sub.strip() for sub in subscriptions if sub and sub.strip()
+        )
+    )
+
+    kwargs.pop("subscription_id", None)
+
+    async def _list(sub_id):
+        return sub_id, await func(ctx, subscription_id=sub_id, **kwargs)
+
+    listings = await hub.exec.azurerm.utils.gather_limited(
+        [_list(sub_id) for sub_id in subscriptions], max_concurrency=max_concurrency
+    )
+
+    result = {}
+    errors = []
+    for sub_id, listing in listings:
+        if "error" in listing:
+            log.warning(
+                "Unable to list resources in subscription %s: %s",
+                sub_id,
+                listing["error"],
+            )
+            errors.append("{0}: {1}".format(sub_id, listing["error"]))
+            continue
+
+        for resource in listing.values():
+            result[resource["id"]] = resource
+
+    if errors and len(errors) == len(subscriptions):
+        result = {"error": "; ".join(errors)}
+
+    return result
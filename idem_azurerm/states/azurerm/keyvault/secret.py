@@ -4,7 +4,7 @@ Azure Resource Manager (ARM) Key Vault Secret State Module
 
 .. versionadded:: 2.4.0
 
-.. versionchanged:: 4.0.0
+.. versionchanged:: 4.0.0, 4.1.0
 
 :maintainer: <devops@eitr.tech>
 :configuration: This module requires Azure Resource Manager credentials to be passed via acct. Note that the
@@ -59,7 +59,10 @@ import logging
 
 log = logging.getLogger(__name__)
 
-TREQ = {"present": {"require": ["states.azurerm.keyvault.vault.present",]}}
+TREQ = {
+    "present": {"require": ["states.azurerm.keyvault.vault.present",]},
+    "secrets_present": {"require": ["states.azurerm.keyvault.vault.present",]},
+}
 
 
 async def present(
@@ -349,3 +352,209 @@ async def absent(
 
     ret["comment"] = f"Failed to {action} Secret {name}!"
     return ret
+
+
+def _secret_property_changes(secret, properties):
+    """
+    Compare the desired properties of a secret to the properties of the existing secret.
+    """
+    changes = {}
+
+    if secret.get("tags"):
+        tag_changes = differ.deep_diff(properties.get("tags") or {}, secret["tags"])
+        if tag_changes:
+            changes["tags"] = tag_changes
+
+    if secret.get("content_type"):
+        if (
+            secret["content_type"].lower()
+            != (properties.get("content_type") or "").lower()
+        ):
+            changes["content_type"] = {
+                "old": properties.get("content_type"),
+                "new": secret["content_type"],
+            }
+
+    if secret.get("enabled") is not None:
+        if secret["enabled"] != properties.get("enabled"):
+            changes["enabled"] = {
+                "old": properties.get("enabled"),
+                "new": secret["enabled"],
+            }
+
+    for prop in ["expires_on", "not_before"]:
+        if secret.get(prop):
+            if secret[prop] != properties.get(prop):
+                changes[prop] = {"old": properties.get(prop), "new": secret[prop]}
+
+    return changes
+
+
+async def secrets_present(
+    hub,
+    ctx,
+    name,
+    vault_url,
+    secrets,
+    max_concurrency=8,
+    connection_auth=None,
+    **kwargs,
+):
+    """
+    .. versionadded:: 4.1.0
+
+    Ensure that multiple secrets exist within the given key vault. Requires secrets/list, secrets/get, and secrets/set
+    permissions.
+
+    The properties of all of the secrets in the vault are listed once to find the secrets which need to be created and
+    the properties which need to be updated. Secret values are only fetched for the secrets which already exist, and
+    all of the changes are applied concurrently. The value of a disabled secret can't be read, so only the properties
+    of disabled secrets are compared.
+
+    :param name: The name of the state.
+
+    :param vault_url: The URL of the vault that the client will access.
+
+    :param secrets: A dictionary of secrets keyed by secret name. Each value can either be the string value of the
+        secret or a dictionary containing the ``value`` key along with any of the ``content_type``, ``enabled``,
+        ``expires_on``, ``not_before``, and ``tags`` properties accepted by the ``present`` state.
+
+    :param max_concurrency: The maximum number of secrets to fetch or set at the same time. Defaults to 8.
+
+    :param connection_auth: A dict with subscription and authentication parameters to be used in connecting to the
+        Azure Resource Manager API.
+
+    Example usage:
+
+    .. code-block:: yaml
+
+        Ensure application secrets exist:
+            azurerm.keyvault.secret.secrets_present:
+                - vault_url: "https://myvault.vault.azure.net/"
+                - secrets:
+                    db-password: supersecret
+                    api-key:
+                      value: anothersecret
+                      content_type: "text/plain"
+                      tags:
+                        contact_name: Elmer Fudd Gantry
+
+    """
+    ret = {"name": name, "result": False, "comment": "", "changes": {}}
+
+    if not isinstance(connection_auth, dict):
+        if ctx["acct"]:
+            connection_auth = ctx["acct"]
+        else:
+            ret[
+                "comment"
+            ] = "Connection information must be specified via acct or connection_auth dictionary!"
+            return ret
+
+    desired = {}
+    for secret_name, secret in secrets.items():
+        if not isinstance(secret, dict):
+            secret = {"value": secret}
+        if "value" not in secret:
+            ret["comment"] = f"A value must be specified for secret {secret_name}."
+            return ret
+        desired[secret_name] = secret
+
+    existing = await hub.exec.azurerm.keyvault.secret.list_properties_of_secrets(
+        ctx=ctx, vault_url=vault_url, **connection_auth
+    )
+
+    if "error" in existing:
+        ret["comment"] = "Failed to list the secrets in {0}! ({1})".format(
+            vault_url, existing.get("error")
+        )
+        return ret
+
+    candidates = [
+        secret_name
+        for secret_name in desired
+        if secret_name in existing and existing[secret_name].get("enabled") is not False
+    ]
+
+    current = {}
+    if candidates:
+        current = await hub.exec.azurerm.keyvault.secret.get_secrets(
+            ctx=ctx,
+            vault_url=vault_url,
+            names=candidates,
+            max_concurrency=max_concurrency,
+            azurerm_log_level="info",
+            **connection_auth,
+        )
+
+    updates = {}
+    for secret_name, secret in desired.items():
+        if secret_name not in existing:
+            ret["changes"][secret_name] = {
+                "old": {},
+                "new": {"name": secret_name, "value": "REDACTED"},
+            }
+            updates[secret_name] = secret
+            continue
+
+        changes = _secret_property_changes(secret, existing[secret_name])
+
+        if secret_name in current and secret["value"] != current[secret_name].get(
+            "value"
+        ):
+            changes["value"] = {
+                "old": "REDACTED_OLD_VALUE",
+                "new": "REDACTED_NEW_VALUE",
+            }
+
+        if changes:
+            ret["changes"][secret_name] = changes
+            if "value" in changes:
+                updates[secret_name] = secret
+            else:
+                updates[secret_name] = {
+                    key: val for key, val in secret.items() if key != "value"
+                }
+
+    if not updates:
+        ret["result"] = True
+        ret["comment"] = "All {0} secrets are already present.".format(len(desired))
+        return ret
+
+    if ctx["test"]:
+        ret["result"] = None
+        ret["comment"] = "{0} of {1} secrets would be created or updated.".format(
+            len(updates), len(desired)
+        )
+        return ret
+
+    secret_kwargs = kwargs.copy()
+    secret_kwargs.update(connection_auth)
+
+    results = await hub.exec.azurerm.keyvault.secret.set_secrets(
+        ctx=ctx,
+        vault_url=vault_url,
+        secrets=updates,
+        max_concurrency=max_concurrency,
+        **secret_kwargs,
+    )
+
+    errors = {
+        secret_name: result["error"]
+        for secret_name, result in results.items()
+        if "error" in result
+    }
+    for secret_name in errors:
+        ret["changes"].pop(secret_name, None)
+
+    if errors:
+        ret["comment"] = "Failed to create or update {0} of {1} secrets! ({2})".format(
+            len(errors), len(updates), errors
+        )
+        return ret
+
+    ret["result"] = True
+    ret["comment"] = "{0} of {1} secrets have been created or updated.".format(
+        len(updates), len(desired)
+    )
+    return ret
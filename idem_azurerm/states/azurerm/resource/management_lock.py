@@ -4,7 +4,7 @@ Azure Resource Manager (ARM) Management Lock State Module
 
 .. versionadded:: 2.0.0
 
-.. versionchanged:: 4.0.0
+.. versionchanged:: 4.0.0, 4.1.0
 
 :maintainer: <devops@eitr.tech>
 :configuration: This module requires Azure Resource Manager credentials to be passed via acct. Note that the
@@ -341,6 +341,7 @@ async def present_at_resource_level(
         resource_type,
         resource_provider_namespace,
         parent_resource_path,
+        use_index=True,
         azurerm_log_level="info",
         **connection_auth,
     )
@@ -479,6 +480,7 @@ async def absent_at_resource_level(
         resource_type,
         resource_provider_namespace,
         parent_resource_path=parent_resource_path,
+        use_index=True,
         azurerm_log_level="info",
         **connection_auth,
     )
@@ -579,11 +581,16 @@ async def present(
 
     if resource_group:
         lock = await hub.exec.azurerm.resource.management_lock.get_at_resource_group_level(
-            ctx, name, resource_group, azurerm_log_level="info", **connection_auth
+            ctx,
+            name,
+            resource_group,
+            use_index=True,
+            azurerm_log_level="info",
+            **connection_auth,
         )
     else:
         lock = await hub.exec.azurerm.resource.management_lock.get_at_subscription_level(
-            ctx, name, azurerm_log_level="info", **connection_auth
+            ctx, name, use_index=True, azurerm_log_level="info", **connection_auth
         )
 
     if "error" not in lock:
@@ -699,11 +706,16 @@ async def absent(hub, ctx, name, resource_group=None, connection_auth=None, **kw
 
     if resource_group:
         lock = await hub.exec.azurerm.resource.management_lock.get_at_resource_group_level(
-            ctx, name, resource_group, azurerm_log_level="info", **connection_auth
+            ctx,
+            name,
+            resource_group,
+            use_index=True,
+            azurerm_log_level="info",
+            **connection_auth,
         )
     else:
         lock = await hub.exec.azurerm.resource.management_lock.get_at_subscription_level(
-            ctx, name, azurerm_log_level="info", **connection_auth
+            ctx, name, use_index=True, azurerm_log_level="info", **connection_auth
         )
 
     if "error" in lock:
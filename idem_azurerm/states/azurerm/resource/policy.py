@@ -4,7 +4,7 @@ Azure Resource Manager (ARM) Resource Policy State Module
 
 .. versionadded:: 1.0.0
 
-.. versionchanged:: 2.0.0, 2.3.2, 4.0.0
+.. versionchanged:: 2.0.0, 2.3.2, 4.0.0, 4.1.0
 
 :maintainer: <devops@eitr.tech>
 :configuration: This module requires Azure Resource Manager credentials to be passed via acct. Note that the
@@ -57,6 +57,7 @@ from __future__ import absolute_import
 from dict_tools import differ
 import json
 import logging
+import re
 
 log = logging.getLogger(__name__)
 
@@ -64,9 +65,60 @@ TREQ = {
     "assignment_present": {
         "require": ["states.azurerm.resource.policy.definition_present",]
     },
+    "assignments_present": {
+        "require": ["states.azurerm.resource.policy.definition_present",]
+    },
 }
 
 
+def _assignment_changes(
+    policy,
+    scope,
+    definition_name,
+    display_name=None,
+    description=None,
+    parameters=None,
+    enforcement_mode=None,
+):
+    """
+    Compare an existing policy assignment with its desired configuration, returning the changes.
+
+    """
+    changes = {}
+
+    if scope.lower() != policy["scope"].lower():
+        changes["scope"] = {"old": policy["scope"], "new": scope}
+
+    pa_name = policy["policy_definition_id"].split("/")[-1]
+    if definition_name.lower() != pa_name.lower():
+        changes["definition_name"] = {"old": pa_name, "new": definition_name}
+
+    if (display_name or "").lower() != policy.get("display_name", "").lower():
+        changes["display_name"] = {
+            "old": policy.get("display_name"),
+            "new": display_name,
+        }
+
+    if (description or "").lower() != policy.get("description", "").lower():
+        changes["description"] = {
+            "old": policy.get("description"),
+            "new": description,
+        }
+
+    if enforcement_mode:
+        if enforcement_mode.lower() != policy.get("enforcement_mode", "").lower():
+            changes["enforcement_mode"] = {
+                "old": policy.get("enforcement_mode"),
+                "new": enforcement_mode,
+            }
+
+    param_changes = differ.deep_diff(policy.get("parameters", {}), parameters or {})
+    if param_changes:
+        changes["parameters"] = param_changes
+
+    return changes
+
+
 async def definition_present(
     hub,
     ctx,
@@ -479,35 +531,15 @@ async def assignment_present(
 
     if "error" not in policy:
         action = "update"
-        if scope.lower() != policy["scope"].lower():
-            ret["changes"]["scope"] = {"old": policy["scope"], "new": scope}
-
-        pa_name = policy["policy_definition_id"].split("/")[-1]
-        if definition_name.lower() != pa_name.lower():
-            ret["changes"]["definition_name"] = {"old": pa_name, "new": definition_name}
-
-        if (display_name or "").lower() != policy.get("display_name", "").lower():
-            ret["changes"]["display_name"] = {
-                "old": policy.get("display_name"),
-                "new": display_name,
-            }
-
-        if (description or "").lower() != policy.get("description", "").lower():
-            ret["changes"]["description"] = {
-                "old": policy.get("description"),
-                "new": description,
-            }
-
-        if enforcement_mode:
-            if enforcement_mode.lower() != policy.get("enforcement_mode", "").lower():
-                ret["changes"]["enforcement_mode"] = {
-                    "old": policy.get("enforcement_mode"),
-                    "new": enforcement_mode,
-                }
-
-        param_changes = differ.deep_diff(policy.get("parameters", {}), parameters or {})
-        if param_changes:
-            ret["changes"]["parameters"] = param_changes
+        ret["changes"] = _assignment_changes(
+            policy,
+            scope,
+            definition_name,
+            display_name,
+            description,
+            parameters,
+            enforcement_mode,
+        )
 
         if not ret["changes"]:
             ret["result"] = True
@@ -624,3 +656,277 @@ async def assignment_absent(hub, ctx, name, scope, connection_auth=None, **kwarg
 
     ret["comment"] = "Failed to delete policy assignment {0}!".format(name)
     return ret
+
+
+async def assignments_present(
+    hub,
+    ctx,
+    name,
+    assignments,
+    prune=False,
+    max_concurrency=8,
+    connection_auth=None,
+    **kwargs,
+):
+    """
+    .. versionadded:: 4.1.0
+
+    Ensure that multiple policy assignments exist, such as a policy baseline applied to many scopes.
+
+    The existing policy assignments are listed once per subscription and compared with the desired assignments
+    locally. Only the assignments which are missing or differ are created or updated, concurrently, and each policy
+    definition is only looked up once. Assignments at management group scopes are looked up individually.
+
+    :param name: The name of the state.
+
+    :param assignments: A list of dictionaries, each containing the ``name``, ``scope`` and ``definition_name`` of a
+        policy assignment along with any of the ``display_name``, ``description``, ``parameters``, and
+        ``enforcement_mode`` options accepted by the ``assignment_present`` state.
+
+    :param prune: Delete the policy assignments at the listed scopes which are not in the list. Assignments inherited
+        from parent scopes are never deleted. Defaults to False.
+
+    :param max_concurrency: The maximum number of policy assignments to create, update or delete at the same time.
+        Defaults to 8.
+
+    :param connection_auth: A dict with subscription and authentication parameters to be used in connecting to the
+        Azure Resource Manager API.
+
+    Example usage:
+
+    .. code-block:: yaml
+
+        Apply location baseline:
+            azurerm.resource.policy.assignments_present:
+                - assignments:
+                  - name: AllowedLocations
+                    scope: /subscriptions/bc75htn-a0fhsi-349b-56gh-4fghti-f84852
+                    definition_name: e56962a6-4747-49cd-b67b-bf8b01975c4c
+                    parameters:
+                      listOfAllowedLocations:
+                        value:
+                          - eastus
+                  - name: AllowedLocations
+                    scope: /subscriptions/bc75htn-a0fhsi-349b-56gh-4fghti-f84852/resourceGroups/rg1
+                    definition_name: e56962a6-4747-49cd-b67b-bf8b01975c4c
+                    parameters:
+                      listOfAllowedLocations:
+                        value:
+                          - westus
+
+    """
+    ret = {"name": name, "result": False, "comment": "", "changes": {}}
+
+    if not isinstance(connection_auth, dict):
+        if ctx["acct"]:
+            connection_auth = ctx["acct"]
+        else:
+            ret[
+                "comment"
+            ] = "Connection information must be specified via acct or connection_auth dictionary!"
+            return ret
+
+    desired = {}
+    for assignment in assignments:
+        missing = [
+            key
+            for key in ("name", "scope", "definition_name")
+            if not assignment.get(key)
+        ]
+        if missing:
+            ret["comment"] = "The policy assignment {0} is missing {1}.".format(
+                assignment, ", ".join(missing)
+            )
+            return ret
+        scope = "/" + assignment["scope"].strip("/")
+        desired[(scope.lower(), assignment["name"].lower())] = dict(
+            assignment, scope=scope
+        )
+
+    def _subscription(scope):
+        match = re.match(r"^/subscriptions/([^/]+)", scope, re.IGNORECASE)
+        return match.group(1) if match else None
+
+    def _auth(subscription_id):
+        auth = connection_auth.copy()
+        if subscription_id:
+            auth["subscription_id"] = subscription_id
+        return auth
+
+    # One listing per subscription, every other scope is looked up individually
+    subscriptions = sorted({_subscription(scope) for scope, _ in desired} - {None})
+    listings = await hub.exec.azurerm.utils.gather_limited(
+        [
+            hub.exec.azurerm.resource.policy.assignments_list(
+                ctx, azurerm_log_level="info", **_auth(subscription_id)
+            )
+            for subscription_id in subscriptions
+        ],
+        max_concurrency=max_concurrency,
+    )
+
+    existing = {}
+    for subscription_id, listing in zip(subscriptions, listings):
+        if "error" in listing:
+            ret[
+                "comment"
+            ] = "Failed to list the policy assignments in {0}! ({1})".format(
+                subscription_id, listing.get("error")
+            )
+            return ret
+        for policy in listing.values():
+            existing[(policy["scope"].lower(), policy["name"].lower())] = policy
+
+    other = [key for key in desired if not _subscription(desired[key]["scope"])]
+    policies = await hub.exec.azurerm.utils.gather_limited(
+        [
+            hub.exec.azurerm.resource.policy.assignment_get(
+                ctx,
+                desired[key]["name"],
+                desired[key]["scope"],
+                azurerm_log_level="info",
+                **connection_auth,
+            )
+            for key in other
+        ],
+        max_concurrency=max_concurrency,
+    )
+    for key, policy in zip(other, policies):
+        if "error" not in policy:
+            existing[key] = policy
+
+    updates = []
+    for key, assignment in desired.items():
+        if key not in existing:
+            ret["changes"][key[1] + "@" + assignment["scope"]] = {
+                "old": {},
+                "new": {
+                    "name": assignment["name"],
+                    "scope": assignment["scope"],
+                    "definition_name": assignment["definition_name"],
+                },
+            }
+            updates.append(assignment)
+            continue
+
+        changes = _assignment_changes(
+            existing[key],
+            assignment["scope"],
+            assignment["definition_name"],
+            assignment.get("display_name"),
+            assignment.get("description"),
+            assignment.get("parameters"),
+            assignment.get("enforcement_mode"),
+        )
+        if changes:
+            ret["changes"][key[1] + "@" + assignment["scope"]] = changes
+            updates.append(assignment)
+
+    deletes = []
+    if prune:
+        scopes = {scope for scope, _ in desired}
+        for key, policy in existing.items():
+            if key[0] in scopes and key not in desired:
+                ret["changes"][key[1] + "@" + policy["scope"]] = {
+                    "old": policy,
+                    "new": {},
+                }
+                deletes.append(policy)
+
+    if not updates and not deletes:
+        ret["result"] = True
+        ret["comment"] = "All {0} policy assignments are already present.".format(
+            len(desired)
+        )
+        return ret
+
+    if ctx["test"]:
+        ret["result"] = None
+        ret[
+            "comment"
+        ] = "{0} policy assignments would be created or updated and {1} would be deleted.".format(
+            len(updates), len(deletes)
+        )
+        return ret
+
+    # Each policy definition is only looked up once
+    definition_names = {assignment["definition_name"] for assignment in updates}
+    definitions = await hub.exec.azurerm.utils.gather_limited(
+        [
+            hub.exec.azurerm.resource.policy.definition_get(
+                ctx, definition_name, **connection_auth
+            )
+            for definition_name in definition_names
+        ],
+        max_concurrency=max_concurrency,
+    )
+    definition_ids = {}
+    for definition_name, definition in zip(definition_names, definitions):
+        if "error" not in definition:
+            definition_ids[definition_name] = definition["id"]
+
+    async def _create(assignment):
+        definition_id = definition_ids.get(assignment["definition_name"])
+        if not definition_id:
+            return {
+                "error": 'The policy definition named "{0}" could not be found.'.format(
+                    assignment["definition_name"]
+                )
+            }
+
+        parameters = assignment.get("parameters")
+        if isinstance(parameters, dict):
+            parameters = json.loads(json.dumps(parameters))
+
+        policy_kwargs = kwargs.copy()
+        policy_kwargs.update(_auth(_subscription(assignment["scope"])))
+        return await hub.exec.azurerm.resource.policy.assignment_create(
+            ctx=ctx,
+            name=assignment["name"],
+            scope=assignment["scope"],
+            definition_name=assignment["definition_name"],
+            definition_id=definition_id,
+            display_name=assignment.get("display_name"),
+            description=assignment.get("description"),
+            parameters=parameters,
+            enforcement_mode=assignment.get("enforcement_mode"),
+            **policy_kwargs,
+        )
+
+    async def _delete(policy):
+        deleted = await hub.exec.azurerm.resource.policy.assignment_delete(
+            ctx,
+            policy["name"],
+            policy["scope"],
+            **_auth(_subscription(policy["scope"])),
+        )
+        return {} if deleted else {"error": "The deletion failed."}
+
+    results = await hub.exec.azurerm.utils.gather_limited(
+        [_create(assignment) for assignment in updates]
+        + [_delete(policy) for policy in deletes],
+        max_concurrency=max_concurrency,
+    )
+
+    errors = {}
+    for item, result in zip(updates + deletes, results):
+        if "error" in result:
+            change_key = item["name"].lower() + "@" + item["scope"]
+            errors[change_key] = result["error"]
+            ret["changes"].pop(change_key, None)
+
+    if errors:
+        ret[
+            "comment"
+        ] = "Failed to apply {0} of {1} policy assignment changes! ({2})".format(
+            len(errors), len(results), errors
+        )
+        return ret
+
+    ret["result"] = True
+    ret[
+        "comment"
+    ] = "{0} policy assignments have been created or updated and {1} have been deleted.".format(
+        len(updates), len(deletes)
+    )
+    return ret
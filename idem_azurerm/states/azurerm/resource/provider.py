@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""
+Azure Resource Manager (ARM) Resource Provider State Module
+
+.. versionadded:: 4.1.0
+
+:maintainer: <devops@eitr.tech>
+:configuration: This module requires Azure Resource Manager credentials to be passed via acct. Note that the
+    authentication parameters are case sensitive.
+
+    Required provider parameters:
+
+    if using username and password:
+      * ``subscription_id``
+      * ``username``
+      * ``password``
+
+    if using a service principal:
+      * ``subscription_id``
+      * ``tenant``
+      * ``client_id``
+      * ``secret``
+
+    Optional provider parameters:
+
+    **cloud_environment**: Used to point the cloud driver to different API endpoints, such as Azure GovCloud.
+    Possible values:
+      * ``AZURE_PUBLIC_CLOUD`` (default)
+      * ``AZURE_CHINA_CLOUD``
+      * ``AZURE_US_GOV_CLOUD``
+      * ``AZURE_GERMAN_CLOUD``
+
+    Example configuration for Azure Resource Manager authentication:
+
+    .. code-block:: yaml
+
+        azurerm:
+            default:
+                subscription_id: 3287abc8-f98a-c678-3bde-326766fd3617
+                tenant: ABCDEFAB-1234-ABCD-1234-ABCDEFABCDEF
+                client_id: ABCDEFAB-1234-ABCD-1234-ABCDEFABCDEF
+                secret: XXXXXXXXXXXXXXXXXXXXXXXX
+                cloud_environment: AZURE_PUBLIC_CLOUD
+            user_pass_auth:
+                subscription_id: 3287abc8-f98a-c678-3bde-326766fd3617
+                username: fletch
+                password: 123pass
+
+    The authentication parameters can also be passed as a dictionary of keyword arguments to the ``connection_auth``
+    parameter of each state, but this is not preferred and could be deprecated in the future.
+
+"""
+# Import Python libs
+from __future__ import absolute_import
+import logging
+
+log = logging.getLogger(__name__)
+
+
+async def registered(
+    hub,
+    ctx,
+    name,
+    namespaces,
+    wait=True,
+    timeout=None,
+    max_concurrency=8,
+    connection_auth=None,
+    **kwargs,
+):
+    """
+    .. versionadded:: 4.1.0
+
+    Ensure that a set of resource providers are registered with the subscription.
+
+    The registration states are read from a cached snapshot of the providers of the subscription, and only the
+    providers which are not yet registered are registered. The registrations are requested concurrently and are then
+    polled together until all of them have finished.
+
+    :param name: The name of the state.
+
+    :param namespaces: A list of the namespaces of the resource providers to register.
+
+    :param wait: Wait for all of the providers to be registered. If False, the state succeeds as soon as the
+        registrations have been requested. Defaults to True.
+
+    :param timeout: The maximum number of seconds to wait for the registrations to finish. Defaults to waiting
+        indefinitely.
+
+    :param max_concurrency: The maximum number of registration requests to send at once. Defaults to 8.
+
+    :param connection_auth: A dict with subscription and authentication parameters to be used in connecting to the
+        Azure Resource Manager API.
+
+    Example usage:
+
+    .. code-block:: yaml
+
+        Ensure resource providers are registered:
+            azurerm.resource.provider.registered:
+                - namespaces:
+                  - Microsoft.Compute
+                  - Microsoft.Network
+                  - Microsoft.Storage
+                - timeout: 900
+
+    """
+    ret = {"name": name, "result": False, "comment": "", "changes": {}}
+
+    if not isinstance(connection_auth, dict):
+        if ctx["acct"]:
+            connection_auth = ctx["acct"]
+        else:
+            ret[
+                "comment"
+            ] = "Connection information must be specified via acct or connection_auth dictionary!"
+            return ret
+
+    states = await hub.exec.azurerm.resource.provider.registration_states(
+        ctx, namespaces, **connection_auth
+    )
+
+    if "error" in states:
+        ret[
+            "comment"
+        ] = "Failed to get the resource provider registration states! ({0})".format(
+            states.get("error")
+        )
+        return ret
+
+    unregistered = [ns for ns in namespaces if states.get(ns) != "Registered"]
+
+    if not unregistered:
+        ret["result"] = True
+        ret["comment"] = "All of the resource providers are already registered."
+        return ret
+
+    if ctx["test"]:
+        ret["comment"] = "Resource providers {0} would be registered.".format(
+            ", ".join(unregistered)
+        )
+        ret["result"] = None
+        ret["changes"] = {
+            ns: {"old": states.get(ns), "new": "Registered"} for ns in unregistered
+        }
+        return ret
+
+    register_kwargs = kwargs.copy()
+    register_kwargs.update(connection_auth)
+
+    outcomes = await hub.exec.azurerm.resource.provider.register_many(
+        ctx,
+        unregistered,
+        wait=wait,
+        timeout=timeout,
+        max_concurrency=max_concurrency,
+        **register_kwargs,
+    )
+
+    if "error" in outcomes:
+        ret["comment"] = "Failed to register the resource providers! ({0})".format(
+            outcomes.get("error")
+        )
+        return ret
+
+    failed = {}
+    for ns, outcome in outcomes.items():
+        if outcome["status"] != "Skipped" and "error" not in outcome:
+            ret["changes"][ns] = {
+                "old": states.get(ns),
+                "new": outcome.get("registration_state"),
+            }
+        if "error" in outcome:
+            failed[ns] = outcome["error"]
+        elif wait and outcome["status"] == "Registering":
+            failed[ns] = "The registration has not finished."
+
+    if failed:
+        ret["comment"] = "Failed to register resource providers! ({0})".format(
+            "; ".join("{0}: {1}".format(ns, error) for ns, error in failed.items())
+        )
+        return ret
+
+    ret["result"] = True
+    if wait:
+        ret["comment"] = "Resource providers {0} have been registered.".format(
+            ", ".join(unregistered)
+        )
+    else:
+        ret[
+            "comment"
+        ] = "Registration of resource providers {0} has been requested.".format(
+            ", ".join(unregistered)
+        )
+    return ret
@@ -4,7 +4,7 @@ Azure Resource Manager (ARM) Blob Container State Module
 
 .. versionadded:: 2.0.0
 
-.. versionchanged:: 4.0.0
+.. versionchanged:: 4.0.0, 4.1.0
 
 :maintainer: <devops@eitr.tech>
 :configuration: This module requires Azure Resource Manager credentials to be passed via acct. Note that the
@@ -73,6 +73,13 @@ TREQ = {
             "states.azurerm.storage.container.present",
         ]
     },
+    "blob_lifecycle": {
+        "require": [
+            "states.azurerm.resource.group.present",
+            "states.azurerm.storage.account.present",
+            "states.azurerm.storage.container.present",
+        ]
+    },
 }
 
 
@@ -565,3 +572,177 @@ async def immutability_policy_absent(
         name
     )
     return ret
+
+
+async def blob_lifecycle(
+    hub,
+    ctx,
+    name,
+    account,
+    resource_group,
+    prefix=None,
+    cool_after_days=None,
+    archive_after_days=None,
+    delete_after_days=None,
+    max_concurrency=8,
+    connection_auth=None,
+    **kwargs,
+):
+    """
+    .. versionadded:: 4.1.0
+
+    Ensures that the blobs within a blob container follow a simple age-based lifecycle. Blobs which were last modified
+    more than ``delete_after_days`` days ago are deleted, and the remaining blobs are moved to the Archive or Cool access
+    tiers once they are older than ``archive_after_days`` or ``cool_after_days`` days, respectively. Blobs are never
+    moved to a hotter tier. All of the changes are made with the Blob Batch API, so many blobs are handled per request.
+
+    :param name: The name of the blob container within the specified storage account.
+
+    :param account: The name of the storage account within the specified resource group.
+
+    :param resource_group: The name of the resource group within the user's subscription. The name is case insensitive.
+
+    :param prefix: Only apply the lifecycle to blobs whose names begin with this prefix.
+
+    :param cool_after_days: Move blobs to the Cool tier once they have not been modified for this many days.
+
+    :param archive_after_days: Move blobs to the Archive tier once they have not been modified for this many days.
+
+    :param delete_after_days: Delete blobs once they have not been modified for this many days.
+
+    :param max_concurrency: The maximum number of batch requests to have in flight at once. Defaults to 8.
+
+    :param connection_auth: A dict with subscription and authentication parameters to be used in connecting to the
+        Azure Resource Manager API.
+
+    Example usage:
+
+    .. code-block:: yaml
+
+        Ensure old build artifacts are archived and pruned:
+            azurerm.storage.container.blob_lifecycle:
+                - name: my_container
+                - account: my_account
+                - resource_group: my_rg
+                - prefix: artifacts/
+                - archive_after_days: 30
+                - delete_after_days: 365
+
+    """
+    ret = {"name": name, "result": False, "comment": "", "changes": {}}
+
+    if not isinstance(connection_auth, dict):
+        if ctx["acct"]:
+            connection_auth = ctx["acct"]
+        else:
+            ret[
+                "comment"
+            ] = "Connection information must be specified via acct or connection_auth dictionary!"
+            return ret
+
+    rules = [
+        ("delete", delete_after_days),
+        ("archive", archive_after_days),
+        ("cool", cool_after_days),
+    ]
+    if all(days is None for _, days in rules):
+        ret[
+            "comment"
+        ] = "One of the cool_after_days, archive_after_days, or delete_after_days parameters must be specified."
+        return ret
+
+    container = await hub.exec.azurerm.storage.container.get(
+        ctx, name, account, resource_group, **connection_auth
+    )
+
+    if "error" in container:
+        ret["comment"] = "Blob container {0} was not found.".format(name)
+        return ret
+
+    lifecycle_kwargs = kwargs.copy()
+    lifecycle_kwargs.update(connection_auth)
+
+    failed = 0
+    for action, days in rules:
+        if days is None:
+            continue
+
+        if action == "delete":
+            blobs = await hub.exec.azurerm.storage.container.delete_blobs(
+                ctx=ctx,
+                name=name,
+                account=account,
+                resource_group=resource_group,
+                prefix=prefix,
+                older_than_days=days,
+                max_concurrency=max_concurrency,
+                dry_run=ctx["test"],
+                **lifecycle_kwargs,
+            )
+        else:
+            blobs = await hub.exec.azurerm.storage.container.set_blob_tier(
+                ctx=ctx,
+                name=name,
+                account=account,
+                resource_group=resource_group,
+                tier=action.capitalize(),
+                prefix=prefix,
+                older_than_days=days,
+                max_concurrency=max_concurrency,
+                dry_run=ctx["test"],
+                **lifecycle_kwargs,
+            )
+
+        if "error" in blobs:
+            ret[
+                "comment"
+            ] = "Failed to apply the {0} rule to blob container {1}! ({2})".format(
+                action, name, blobs.get("error")
+            )
+            return ret
+
+        if not blobs["total"]:
+            continue
+
+        ret["changes"][action] = {
+            "total": blobs["total"],
+            "succeeded": blobs["succeeded"],
+            "failed": blobs["failed"],
+        }
+        if blobs["failed"]:
+            failed += blobs["failed"]
+            ret["changes"][action]["errors"] = {
+                blob: result["error"]
+                for blob, result in blobs["blobs"].items()
+                if "error" in result
+            }
+
+    if not ret["changes"]:
+        ret["result"] = True
+        ret[
+            "comment"
+        ] = "The blobs in blob container {0} are already in the desired lifecycle state.".format(
+            name
+        )
+        return ret
+
+    if ctx["test"]:
+        ret["result"] = None
+        ret[
+            "comment"
+        ] = "The blob lifecycle of blob container {0} would be applied.".format(name)
+        return ret
+
+    if failed:
+        ret[
+            "comment"
+        ] = "Failed to apply the blob lifecycle to {0} blobs in blob container {1}!".format(
+            failed, name
+        )
+        return ret
+
+    ret["result"] = True
+    ret[
+        "comment"
+    ] = "The blob lifecycle of blob container {0} has been applied.".format(name)
+    return ret
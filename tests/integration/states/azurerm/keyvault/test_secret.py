@@ -61,6 +61,46 @@ async def test_changes(hub, ctx, keyvault, tags):
     assert ret == expected
 
 
+@pytest.mark.run(order=4, after="test_changes", before="test_absent")
+@pytest.mark.asyncio
+async def test_secrets_present(hub, ctx, keyvault):
+    vault_url = f"https://{keyvault}.vault.azure.net/"
+    secrets = {
+        "bulksecret1": "supersecret1",
+        "bulksecret2": {"value": "supersecret2", "content_type": "text/plain"},
+    }
+    expected = {
+        "changes": {
+            "bulksecret1": {
+                "new": {"name": "bulksecret1", "value": "REDACTED"},
+                "old": {},
+            },
+            "bulksecret2": {
+                "new": {"name": "bulksecret2", "value": "REDACTED"},
+                "old": {},
+            },
+        },
+        "comment": "2 of 2 secrets have been created or updated.",
+        "name": "bulksecrets",
+        "result": True,
+    }
+    ret = await hub.states.azurerm.keyvault.secret.secrets_present(
+        ctx, "bulksecrets", vault_url, secrets
+    )
+    assert ret == expected
+
+    expected = {
+        "changes": {},
+        "comment": "All 2 secrets are already present.",
+        "name": "bulksecrets",
+        "result": True,
+    }
+    ret = await hub.states.azurerm.keyvault.secret.secrets_present(
+        ctx, "bulksecrets", vault_url, secrets
+    )
+    assert ret == expected
+
+
 @pytest.mark.run(order=-4)
 @pytest.mark.asyncio
 async def test_absent(hub, ctx, keyvault, tags):
@@ -160,7 +160,43 @@ async def test_assignment_absent(hub, ctx, assignment_name):
     assert ret["result"] == expected["result"]
 
 
-@pytest.mark.run(order=1, after="test_assignment_absent")
+@pytest.mark.run(
+    order=1, after="test_assignment_absent", before="test_definition_absent"
+)
+@pytest.mark.asyncio
+async def test_assignments_present(hub, ctx, assignment_name, def_name):
+    subscription_id = (
+        hub.acct.PROFILES["azurerm"].get("default", {}).get("subscription_id")
+    )
+    scope = f"/subscriptions/{subscription_id}"
+    assignments = [
+        {"name": assignment_name, "scope": scope, "definition_name": def_name},
+    ]
+    ret = await hub.states.azurerm.resource.policy.assignments_present(
+        ctx, name="policy-baseline", assignments=assignments
+    )
+    assert ret["result"] is True
+    assert ret["comment"] == (
+        "1 policy assignments have been created or updated and 0 have been deleted."
+    )
+
+    ret = await hub.states.azurerm.resource.policy.assignments_present(
+        ctx, name="policy-baseline", assignments=assignments
+    )
+    assert ret == {
+        "name": "policy-baseline",
+        "result": True,
+        "comment": "All 1 policy assignments are already present.",
+        "changes": {},
+    }
+
+    ret = await hub.states.azurerm.resource.policy.assignment_absent(
+        ctx, name=assignment_name, scope=scope
+    )
+    assert ret["result"] is True
+
+
+@pytest.mark.run(order=1, after="test_assignments_present")
 @pytest.mark.asyncio
 async def test_definition_absent(hub, ctx, def_name):
     expected = {
@@ -0,0 +1,23 @@
+import pytest
+
+
+@pytest.mark.run(order=1)
+@pytest.mark.asyncio
+async def test_registered(hub, ctx):
+    # The storage provider is registered by the storage account tests of this suite
+    namespaces = ["Microsoft.Storage"]
+    ret = await hub.states.azurerm.resource.provider.registered(
+        ctx, "test_registered", namespaces, timeout=900
+    )
+    assert ret["result"] is True
+
+    expected = {
+        "changes": {},
+        "comment": "All of the resource providers are already registered.",
+        "name": "test_registered",
+        "result": True,
+    }
+    ret = await hub.states.azurerm.resource.provider.registered(
+        ctx, "test_registered", namespaces
+    )
+    assert ret == expected
@@ -99,6 +99,28 @@ async def test_immutability_policy_present_and_changes(
     assert ret == expected
 
 
+@pytest.mark.run(order=4, after="test_changes", before="test_absent")
+@pytest.mark.asyncio
+async def test_blob_lifecycle(
+    hub, ctx, resource_group, storage_account, storage_container
+):
+    expected = {
+        "changes": {},
+        "comment": f"The blobs in blob container {storage_container} are already in the desired lifecycle state.",
+        "name": storage_container,
+        "result": True,
+    }
+    ret = await hub.states.azurerm.storage.container.blob_lifecycle(
+        ctx,
+        name=storage_container,
+        account=storage_account,
+        resource_group=resource_group,
+        archive_after_days=30,
+        delete_after_days=365,
+    )
+    assert ret == expected
+
+
 @pytest.mark.run(order=-4)
 @pytest.mark.asyncio
 async def test_absent(hub, ctx, resource_group, storage_account, storage_container):
@@ -0,0 +1,164 @@
+import idem_azurerm.exec.azurerm.resource.deployment as deployment
+import json
+import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+
+TEMPLATE = {
+    "$schema": "https://schema.management.azure.com/schemas/2019-04-01/deploymentTemplate.json#",
+    "contentVersion": "1.0.0.0",
+    "resources": [],
+}
+
+TEMPLATE_LINK = "https://example.blob.core.windows.net/templates/azuredeploy.json"
+
+
+@pytest.fixture
+def resconn():
+    resconn = MagicMock()
+    resconn.config.subscription_id = "00000000-0000-0000-0000-000000000000"
+    resconn.deployments.get.return_value.as_dict.return_value = {
+        "properties": {"provisioning_state": "Succeeded", "correlation_id": "first"}
+    }
+    resconn.deployments.validate.return_value.as_dict.return_value = {}
+    resconn.deployments.create_or_update.return_value.result.return_value.as_dict.return_value = {
+        "properties": {"provisioning_state": "Succeeded", "correlation_id": "second"}
+    }
+    return resconn
+
+
+@pytest.fixture
+def fake_hub(resconn):
+    async def get_client(ctx, client_type, **kwargs):
+        return resconn
+
+    async def run_in_executor(func, *args, **kwargs):
+        return func(*args, **kwargs)
+
+    async def create_object_model(module_name, object_name, **kwargs):
+        model = MagicMock()
+        model.validate.return_value = []
+        return model
+
+    utils = SimpleNamespace(
+        get_client=get_client,
+        run_in_executor=run_in_executor,
+        create_object_model=create_object_model,
+    )
+    return SimpleNamespace(
+        exec=SimpleNamespace(azurerm=SimpleNamespace(utils=utils, DEPLOYMENT_FILES={}))
+    )
+
+
+def _record(index_file, resconn, fingerprint):
+    key = deployment._index_key(resconn, "testdeploy", "testgroup")
+    index_file.write_text(
+        json.dumps({key: {"fingerprint": fingerprint, "correlation_id": "first"}})
+    )
+
+
+def test_fingerprint_template_changed():
+    reordered = dict(reversed(list(TEMPLATE.items())))
+    changed = dict(TEMPLATE, contentVersion="1.0.0.1")
+
+    assert deployment._fingerprint(
+        "incremental", None, None, TEMPLATE
+    ) == deployment._fingerprint("Incremental", None, None, json.dumps(reordered))
+    assert deployment._fingerprint(
+        "incremental", None, None, TEMPLATE
+    ) != deployment._fingerprint("incremental", None, None, changed)
+
+
+def test_fingerprint_linked():
+    assert deployment._fingerprint("incremental", template_link=TEMPLATE_LINK) is None
+    assert (
+        deployment._fingerprint(
+            "incremental", parameters_link=TEMPLATE_LINK, deploy_template=TEMPLATE,
+        )
+        is None
+    )
+
+
+@pytest.mark.asyncio
+async def test_create_or_update_unchanged(fake_hub, resconn, tmp_path):
+    index_file = tmp_path / "deployments.json"
+    _record(
+        index_file,
+        resconn,
+        deployment._fingerprint("incremental", None, None, TEMPLATE),
+    )
+
+    ret = await deployment.create_or_update(
+        fake_hub,
+        {},
+        "testdeploy",
+        "testgroup",
+        deploy_template=TEMPLATE,
+        index_file=str(index_file),
+    )
+    assert ret["properties"]["correlation_id"] == "first"
+    resconn.deployments.create_or_update.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_create_or_update_template_changed(fake_hub, resconn, tmp_path):
+    index_file = tmp_path / "deployments.json"
+    _record(
+        index_file,
+        resconn,
+        deployment._fingerprint("incremental", None, None, TEMPLATE),
+    )
+
+    ret = await deployment.create_or_update(
+        fake_hub,
+        {},
+        "testdeploy",
+        "testgroup",
+        deploy_template=dict(TEMPLATE, contentVersion="1.0.0.1"),
+        index_file=str(index_file),
+    )
+    assert ret["properties"]["correlation_id"] == "second"
+    resconn.deployments.create_or_update.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_create_or_update_same_template_link(fake_hub, resconn, tmp_path):
+    index_file = tmp_path / "deployments.json"
+
+    for _ in range(2):
+        ret = await deployment.create_or_update(
+            fake_hub,
+            {},
+            "testdeploy",
+            "testgroup",
+            template_link=TEMPLATE_LINK,
+            index_file=str(index_file),
+        )
+        assert ret["properties"]["correlation_id"] == "second"
+
+    # The content behind the link may have changed, so it is deployed every time
+    assert resconn.deployments.create_or_update.call_count == 2
+    assert not index_file.exists()
+
+
+@pytest.mark.asyncio
+async def test_create_or_update_force(fake_hub, resconn, tmp_path):
+    index_file = tmp_path / "deployments.json"
+    _record(
+        index_file,
+        resconn,
+        deployment._fingerprint("incremental", None, None, TEMPLATE),
+    )
+
+    ret = await deployment.create_or_update(
+        fake_hub,
+        {},
+        "testdeploy",
+        "testgroup",
+        deploy_template=TEMPLATE,
+        force=True,
+        index_file=str(index_file),
+    )
+    assert ret["properties"]["correlation_id"] == "second"
+    resconn.deployments.create_or_update.assert_called_once()